@@ -27,12 +27,17 @@ from config.settings import (
 
 # 导入数据库工具
 from models.database import get_db, close_db
+from utils.json_provider import ORJSON_AVAILABLE, OrjsonProvider
 
 # ==================== Flask 应用初始化 ====================
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = SECRET_KEY
 
+# 安装了 orjson 时用它序列化 JSON 响应（综合档案、人员列表等大响应）
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Security configurations
 app.config["WTF_CSRF_TIME_LIMIT"] = None
 app.config["WTF_CSRF_SSL_STRICT"] = False
@@ -340,17 +345,22 @@ def init_db():
 
     # Performance 表索引
     cur.execute("CREATE INDEX IF NOT EXISTS idx_performance_created_by ON performance_records(created_by)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_performance_year_month ON performance_records(year, month, emp_no)")
 
     # Training 表索引
     cur.execute("CREATE INDEX IF NOT EXISTS idx_training_projects_category_id ON training_projects(category_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_training_created_by ON training_records(created_by)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_training_records_project_id ON training_records(project_id)")
+    # 按人按月查询（WHERE 中的表达式需与索引表达式完全一致才能命中）
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_training_records_emp_month ON training_records(emp_no, strftime('%Y-%m', training_date))")
 
     # Safety 表索引
     cur.execute("CREATE INDEX IF NOT EXISTS idx_safety_inspection_created_by ON safety_inspection_records(created_by)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_safety_inspection_date ON safety_inspection_records(inspection_date)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_safety_inspection_category ON safety_inspection_records(category)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_safety_inspection_team ON safety_inspection_records(responsible_team)")
+    # 按人按月查询（WHERE 中的表达式需与索引表达式完全一致才能命中）
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_safety_inspection_person_month ON safety_inspection_records(inspected_person, strftime('%Y-%m', inspection_date))")
 
     # Import Logs 表索引
     cur.execute("CREATE INDEX IF NOT EXISTS idx_import_logs_module ON import_logs(module)")
@@ -8,6 +8,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 import sqlite3
 from models.database import get_db
 from .decorators import admin_required
+from .helpers import invalidate_department_name_map
 
 # 创建 Blueprint  
 departments_bp = Blueprint('departments', __name__, url_prefix='/departments')
@@ -66,6 +67,7 @@ def index():
 
                     cur.execute("UPDATE departments SET path=? WHERE id=?", (new_path, new_dept_id))
                     conn.commit()
+                    invalidate_department_name_map()
                     flash(f'部门创建成功 (层级: {level})', 'success')
                 except Exception as e:
                     flash(f'创建失败: {e}', 'danger')
@@ -150,6 +152,7 @@ def detail(dept_id):
                         )
 
                 conn.commit()
+                invalidate_department_name_map()
                 flash('部门信息更新成功', 'success')
                 
         elif action == 'assign_user':
@@ -182,6 +185,7 @@ def detail(dept_id):
             else:
                 cur.execute("DELETE FROM departments WHERE id=?", (dept_id,))
                 conn.commit()
+                invalidate_department_name_map()
                 flash('部门删除成功', 'success')
                 return redirect(url_for('departments.index'))
                 
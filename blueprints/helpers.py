@@ -4,10 +4,16 @@
 公共工具函数模块
 提供各 Blueprint 共用的辅助函数
 """
-from flask import session, request
+from flask import g, has_request_context, session, request
 from models.database import get_db
 from datetime import datetime
 import calendar
+import time
+
+
+# 部门名称 -> ID 映射缓存（导入时按名称匹配部门），部门增删改时主动失效
+DEPT_NAME_MAP_TTL_SECONDS = 60
+_dept_name_map_cache = {'ts': 0.0, 'map': None}
 
 
 def current_user_id():
@@ -326,6 +332,35 @@ def get_accessible_departments(user_dept_info=None):
     return [dict(row) for row in rows]
 
 
+def get_department_name_map():
+    """
+    获取部门名称到部门ID的映射（带缓存）
+
+    缓存 DEPT_NAME_MAP_TTL_SECONDS 秒；本进程内部门增删改后调用
+    invalidate_department_name_map() 立即失效
+
+    Returns:
+        dict: {部门名称: 部门ID}
+    """
+    cached = _dept_name_map_cache['map']
+    if cached is not None and time.monotonic() - _dept_name_map_cache['ts'] < DEPT_NAME_MAP_TTL_SECONDS:
+        return cached
+
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute("SELECT id, name FROM departments")
+    dept_name_map = {row['name']: row['id'] for row in cur.fetchall()}
+
+    _dept_name_map_cache['map'] = dept_name_map
+    _dept_name_map_cache['ts'] = time.monotonic()
+    return dept_name_map
+
+
+def invalidate_department_name_map():
+    """部门数据变更后清除部门名称映射缓存"""
+    _dept_name_map_cache['map'] = None
+
+
 def get_accessible_user_ids():
     """
     [已废弃] 获取当前用户可以访问的所有用户ID
@@ -367,14 +402,26 @@ def get_accessible_department_ids(user_dept_info=None):
     """
     获取当前用户可以访问的所有部门ID列表
 
+    未传入 user_dept_info 时，结果按当前用户缓存在 flask.g 上，同一请求内多次调用只查询一次
+
     Args:
         user_dept_info: 用户部门信息，默认自动获取
 
     Returns:
         list: 可访问的部门ID列表
     """
+    cacheable = user_dept_info is None and has_request_context()
+    if cacheable:
+        cached = g.get('_accessible_dept_ids')
+        if cached is not None and cached[0] == current_user_id():
+            return list(cached[1])
+
     accessible_depts = get_accessible_departments(user_dept_info)
-    return [dept['id'] for dept in accessible_depts] if accessible_depts else []
+    dept_ids = [dept['id'] for dept in accessible_depts] if accessible_depts else []
+
+    if cacheable:
+        g._accessible_dept_ids = (current_user_id(), tuple(dept_ids))
+    return dept_ids
 
 
 def validate_employee_access(emp_no):
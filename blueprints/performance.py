@@ -4,18 +4,31 @@
 绩效管理模块
 负责绩效数据上传、统计、导出等功能
 """
+import hashlib
 import os
 import re
 import sqlite3
+import sys
+import threading
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Tuple
-
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+from flask import (
+    Blueprint, Response, current_app, render_template, request, redirect, url_for, flash,
+    send_file, make_response, stream_with_context,
+)
 from openpyxl import Workbook
 from werkzeug.utils import secure_filename
 
 from config.settings import APP_TITLE, UPLOAD_DIR, EXPORT_DIR
 from models.database import get_db
+from utils.xlsx_writer import write_simple_xlsx
 from .decorators import login_required, role_required
 from .helpers import require_user_id, build_department_filter, log_import_operation
 
@@ -40,6 +53,18 @@ ROW_RE = re.compile(
 # 默认档位映射
 DEFAULT_GRADE_MAP = {"A": 5, "B+": 4, "B": 3, "C": 2, "D": 1, "不进行": 0}
 
+# 年度/计算器导出的月份表头（模块加载时驻留一次，避免每次导出重复构造字符串）
+MONTH_SCORE_LABELS = tuple(sys.intern(f"{m}月分数") for m in range(1, 13))
+MONTH_GRADE_LABELS = tuple(sys.intern(f"{m}月等级") for m in range(1, 13))
+MONTH_POINT_LABELS = tuple(sys.intern(f"{m}月积分") for m in range(1, 13))
+
+# 导出流式发送
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+# 带内容摘要的导出缓存文件（{下载文件名}_{摘要前16位}.xlsx），按 LRU 最多保留的份数
+EXPORT_CACHE_NAME_RE = re.compile(r"_[0-9a-f]{16}\.xlsx$")
+EXPORT_CACHE_MAX_FILES = 32
+
 # 默认季度等级
 DEFAULT_QUARTER_GRADES = ["优秀", "良好", "称职", "待改进", "不合格"]
 DEFAULT_QUARTER_DEFAULT = "称职"
@@ -114,6 +139,229 @@ def ym_to_int(y, m):
     return int(f"{int(y):04d}{int(m):02d}")
 
 
+@dataclass(frozen=True)
+class ExportArgs:
+    """导出/计算器的公共查询参数"""
+    year: Optional[int]
+    sort: str
+    grades: frozenset
+    min_score: Optional[float]
+
+
+def _parse_export_args(req, default_sort: str) -> ExportArgs:
+    """一次性解析 year/sort/grade/min_score 查询参数
+
+    year 缺失时为 None，由调用方决定默认值；min_score 非法时视为未设置。
+    """
+    args = req.args
+    min_score_raw = (args.get("min_score") or "").strip()
+    try:
+        min_score = float(min_score_raw) if min_score_raw else None
+    except ValueError:
+        min_score = None
+    return ExportArgs(
+        year=args.get("year", type=int),
+        sort=args.get("sort", default_sort),
+        grades=frozenset(g for g in args.getlist("grade") if g),
+        min_score=min_score,
+    )
+
+
+def _export_digest(*parts) -> str:
+    """根据导出内容计算摘要，用作 ETag 及导出缓存文件名"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _ExportTee:
+    """只写流：同时写入响应管道与缓存临时文件
+
+    客户端中途断开时丢弃管道一侧，继续把缓存文件写完。
+    """
+
+    def __init__(self, pipe, cache):
+        self._pipe = pipe
+        self._cache = cache
+
+    def write(self, data):
+        self._cache.write(data)
+        if self._pipe is not None:
+            try:
+                self._pipe.write(data)
+            except OSError:
+                self._pipe = None
+        return len(data)
+
+    def flush(self):
+        self._cache.flush()
+        if self._pipe is not None:
+            try:
+                self._pipe.flush()
+            except OSError:
+                self._pipe = None
+
+
+def _attachment_disposition(download_name: str) -> Dict[str, str]:
+    """构造 Content-Disposition 文件名参数（与 send_file 的处理一致）"""
+    try:
+        download_name.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", download_name).encode("ascii", "ignore").decode("ascii")
+        quoted = quote(download_name, safe="!#$&+-.^_`|~")
+        return {"filename": simple, "filename*": f"UTF-8''{quoted}"}
+    return {"filename": download_name}
+
+
+def _evict_stale_exports(keep_name: str):
+    """按最近使用时间淘汰导出缓存文件，最多保留 EXPORT_CACHE_MAX_FILES 份
+
+    缓存命中时会刷新文件修改时间，因此按修改时间排序即为 LRU；不同部门、不同筛选条件
+    的缓存互不挤占，正在发送的文件已打开，删除后不影响本次下载。
+    """
+    try:
+        names = [name for name in os.listdir(EXPORT_DIR) if EXPORT_CACHE_NAME_RE.search(name)]
+    except OSError:
+        return
+    if len(names) <= EXPORT_CACHE_MAX_FILES:
+        return
+
+    def last_used(name):
+        try:
+            return os.path.getmtime(os.path.join(EXPORT_DIR, name))
+        except OSError:
+            return 0.0
+
+    names.sort(key=last_used, reverse=True)
+    for name in names[EXPORT_CACHE_MAX_FILES:]:
+        if name == keep_name:
+            continue
+        try:
+            os.remove(os.path.join(EXPORT_DIR, name))
+        except OSError:
+            pass
+
+
+def _send_export(stem: str, digest: str, build):
+    """发送导出文件
+
+    客户端 If-None-Match 命中时直接返回 304，不再生成工作簿；同一内容的文件已存在时
+    直接复用。缓存未命中时在后台线程生成工作簿，经管道边生成边发送，同时写入带内容
+    摘要的临时文件，完成后原子替换为缓存文件，避免不同部门的并发导出互相覆盖；
+    缓存文件按 LRU 淘汰。ETag 只附加在内容确知完整的响应上。
+
+    Args:
+        stem: 下载文件名（不含扩展名）
+        digest: 导出内容摘要
+        build: 回调，接收目标路径或可写二进制流并写出 xlsx 内容
+    """
+    if digest in request.if_none_match:
+        response = make_response("", 304)
+        response.set_etag(digest)
+        return response
+
+    download_name = f"{stem}.xlsx"
+    cache_name = f"{stem}_{digest[:16]}.xlsx"
+    xlsx_path = os.path.join(EXPORT_DIR, cache_name)
+    # 直接打开缓存文件而非先判断是否存在：其它请求的淘汰可能在两步之间删除该文件
+    try:
+        cached = open(xlsx_path, "rb")
+    except FileNotFoundError:
+        cached = None
+    if cached is not None:
+        try:
+            os.utime(xlsx_path)  # 刷新最近使用时间（LRU）
+        except OSError:
+            pass
+        try:
+            return send_file(cached, as_attachment=True, download_name=download_name, etag=digest)
+        except BaseException:
+            cached.close()
+            raise
+
+    logger = current_app.logger
+    tmp_path = f"{xlsx_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    read_fd, write_fd = os.pipe()
+    pipe_in = os.fdopen(read_fd, "rb")
+    pipe_out = os.fdopen(write_fd, "wb")
+    # 后台生成失败时记录异常，读到管道 EOF 后由请求侧抛出
+    build_errors = []
+
+    def worker():
+        try:
+            with open(tmp_path, "wb") as cache_out:
+                build(_ExportTee(pipe_out, cache_out))
+            os.replace(tmp_path, xlsx_path)
+            _evict_stale_exports(cache_name)
+        except Exception as exc:
+            build_errors.append(exc)
+            logger.error(f"Export build failed: {download_name}", exc_info=True)
+        finally:
+            try:
+                pipe_out.close()
+            except OSError:
+                pass
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    threading.Thread(target=worker, name=f"export-{digest[:8]}", daemon=True).start()
+
+    # 返回响应前先取到第一块：在写出任何字节前失败（如导出目录不存在）时仍可返回 500；
+    # 不足一块说明已读到 EOF，工作簿已生成完毕
+    try:
+        first_chunk = pipe_in.read(EXPORT_STREAM_CHUNK_SIZE)
+    except BaseException:
+        pipe_in.close()
+        raise
+    complete = len(first_chunk) < EXPORT_STREAM_CHUNK_SIZE
+    if complete:
+        pipe_in.close()
+        if build_errors:
+            raise build_errors[0]
+
+    def generate():
+        try:
+            yield first_chunk
+            if complete:
+                return
+            while True:
+                chunk = pipe_in.read(EXPORT_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+            # 生成中途失败：抛出异常让服务器中止分块响应，而不是正常结束一个截断的文件
+            if build_errors:
+                raise RuntimeError(f"Export build failed: {download_name}") from build_errors[0]
+        finally:
+            pipe_in.close()
+
+    response = Response(stream_with_context(generate()), mimetype=XLSX_MIMETYPE, direct_passthrough=True)
+    response.headers.set("Content-Disposition", "attachment", **_attachment_disposition(download_name))
+    if complete:
+        # 仍在生成的流式响应不带 ETag：生成失败时截断的内容不能被 304 固定在浏览器缓存里
+        response.set_etag(digest)
+    response.cache_control.no_cache = True
+    response.call_on_close(pipe_in.close)
+    return response
+
+
+@lru_cache(maxsize=16)
+def _range_sql(where_clause: str, join_clause: str) -> str:
+    """区间查询SQL（按部门过滤子句缓存，避免每次请求重新拼接）
+
+    使用 (year, month) 行值比较而非 year*100+month 表达式，使 SQLite 能走
+    idx_performance_year_month 索引做范围扫描。参数顺序: 起始年, 起始月, 结束年, 结束月
+    """
+    return f"""
+        SELECT pr.emp_no, pr.name, pr.year, pr.month, pr.score, pr.grade
+        FROM performance_records pr
+        {join_clause}
+        WHERE {where_clause} AND (pr.year, pr.month) BETWEEN (?, ?) AND (?, ?)
+        ORDER BY CAST(pr.emp_no as INTEGER), pr.year, pr.month
+        """
+
+
 def build_yearly_matrix(uid: int, year: int, accessible_user_ids=None):
     """构建年度绩效矩阵
 
@@ -139,10 +387,13 @@ def build_yearly_matrix(uid: int, year: int, accessible_user_ids=None):
     rows = cur.fetchall()
 
     grade_choices = sorted({row["grade"] for row in rows if row["grade"]})
-    by_emp: Dict[str, Dict[str, object]] = {}
+    # defaultdict 避免 setdefault 每行都构造一个用完即弃的默认字典
+    by_emp: Dict[str, Dict[str, object]] = defaultdict(lambda: {"emp_no": None, "name": None, "items": {}})
     for r in rows:
-        key = r["emp_no"]
-        bucket = by_emp.setdefault(key, {"emp_no": r["emp_no"], "name": r["name"], "items": {}})
+        bucket = by_emp[r["emp_no"]]
+        if bucket["emp_no"] is None:
+            bucket["emp_no"] = r["emp_no"]
+            bucket["name"] = r["name"]
         bucket["items"][(r["year"], r["month"])] = {"score": r["score"], "grade": r["grade"]}
 
     data = []
@@ -215,20 +466,24 @@ def build_calculator_dataset(uid: int, year: int, mapping: Dict[str, float]):
         )
     rows = cur.fetchall()
 
-    by_emp: Dict[str, Dict[str, object]] = {}
+    by_emp: Dict[str, Dict[str, object]] = defaultdict(lambda: {"emp_no": None, "name": None, "items": {}})
     for r in rows:
-        bucket = by_emp.setdefault(r["emp_no"], {"emp_no": r["emp_no"], "name": r["name"], "items": {}})
-        bucket["items"][(r["year"], r["month"])] = {"grade": r["grade"]}
+        bucket = by_emp[r["emp_no"]]
+        if bucket["emp_no"] is None:
+            bucket["emp_no"] = r["emp_no"]
+            bucket["name"] = r["name"]
+        bucket["items"][(r["year"], r["month"])] = r["grade"]
 
+    mapping_get = mapping.get
     data = []
     for bucket in by_emp.values():
+        items_get = bucket["items"].get
         detail = []
         total = 0.0
-        for (y, m) in months:
-            item = bucket["items"].get((y, m))
-            if item and item.get("grade"):
-                grade = item["grade"]
-                value = mapping.get(grade, 0.0)
+        for ym in months:
+            grade = items_get(ym)
+            if grade:
+                value = mapping_get(grade, 0.0)
                 detail.append({"grade": grade, "value": value})
                 total += value
             else:
@@ -356,9 +611,9 @@ def build_quarter_dataset(uid: int, year: int, options=None):
     overrides = {(row["emp_no"], row["quarter"]): row["grade"] for row in cur.fetchall()}
 
     month_groups = {1: (1, 2, 3), 2: (4, 5, 6), 3: (7, 8, 9), 4: (10, 11, 12)}
-    perf = {}
+    perf = defaultdict(dict)
     for row in perf_rows:
-        perf.setdefault(row["emp_no"], {})[row["month"]] = {"score": row["score"], "grade": row["grade"], "name": row["name"]}
+        perf[row["emp_no"]][row["month"]] = {"score": row["score"], "grade": row["grade"], "name": row["name"]}
 
     if not emps:
         seen = set()
@@ -794,39 +1049,32 @@ def range_view():
 
             # 使用部门过滤机制
             where_clause, join_clause, dept_params = build_department_filter('pr')
-            cur.execute(
-                f"""
-                SELECT pr.emp_no, pr.name, pr.year, pr.month, pr.score, pr.grade
-                FROM performance_records pr
-                {join_clause}
-                WHERE {where_clause} AND (pr.year*100 + pr.month) BETWEEN ? AND ?
-                ORDER BY CAST(pr.emp_no as INTEGER), pr.year, pr.month
-                """,
-                dept_params + [start, end],
-            )
+            cur.execute(_range_sql(where_clause, join_clause), dept_params + [sy, sm, ey, em])
             rows = cur.fetchall()
 
-            by_emp = {}
+            # 聚合阶段以 (score, grade) 元组存储，输出时再组装模板所需的字典
+            by_emp = defaultdict(lambda: {"emp_no": None, "name": None, "items": {}})
             for r in rows:
-                key = r["emp_no"]
-                by_emp.setdefault(key, {"emp_no": r["emp_no"], "name": r["name"], "items": {}})
-                by_emp[key]["items"][(r["year"], r["month"])] = {
-                    "score": r["score"],
-                    "grade": r["grade"],
-                }
+                bucket = by_emp[r["emp_no"]]
+                if bucket["emp_no"] is None:
+                    bucket["emp_no"] = r["emp_no"]
+                    bucket["name"] = r["name"]
+                bucket["items"][(r["year"], r["month"])] = (r["score"], r["grade"])
 
             data = []
             for emp in by_emp.values():
-                row = {"emp_no": emp["emp_no"], "name": emp["name"], "detail": []}
+                items_get = emp["items"].get
+                detail = []
+                row = {"emp_no": emp["emp_no"], "name": emp["name"], "detail": detail}
                 scores = []
-                for (y, m) in months:
-                    item = emp["items"].get((y, m))
+                for ym in months:
+                    item = items_get(ym)
                     if item:
-                        row["detail"].append(item)
-                        if item["score"] is not None:
-                            scores.append(item["score"])
+                        detail.append({"score": item[0], "grade": item[1]})
+                        if item[0] is not None:
+                            scores.append(item[0])
                     else:
-                        row["detail"].append(None)
+                        detail.append(None)
                 row["avg_score"] = round(sum(scores) / len(scores), 2) if scores else None
                 data.append(row)
             data.sort(key=lambda r: emp_sort_key(r["emp_no"]))
@@ -937,62 +1185,68 @@ def export_range():
 
     # 使用部门过滤机制
     where_clause, join_clause, dept_params = build_department_filter('pr')
-    cur.execute(
-        f"""
-        SELECT pr.emp_no, pr.name, pr.year, pr.month, pr.score, pr.grade
-        FROM performance_records pr
-        {join_clause}
-        WHERE {where_clause} AND (pr.year*100 + pr.month) BETWEEN ? AND ?
-        ORDER BY CAST(pr.emp_no as INTEGER), pr.year, pr.month
-        """,
-        dept_params + [start, end],
-    )
+    cur.execute(_range_sql(where_clause, join_clause), dept_params + [sy, sm, ey, em])
     rows = cur.fetchall()
 
-    by_emp = {}
+    # 扁平存储：cells[emp_idx * n_months + month_idx] = (score, grade)，
+    # score_cells 同布局保存数值分数（缺失为 NaN），省去按员工的嵌套字典
+    n_months = len(months)
+    month_idx = {ym: j for j, ym in enumerate(months)}
+    emp_index = {}
+    emps = []
+    cells = []
+    score_cells = []
     for r in rows:
-        key = r["emp_no"]
-        by_emp.setdefault(key, {"emp_no": r["emp_no"], "name": r["name"], "items": {}})
-        by_emp[key]["items"][(r["year"], r["month"])] = {
-            "score": r["score"],
-            "grade": r["grade"],
-        }
-
-    xlsx_path = os.path.join(
-        EXPORT_DIR,
-        f"绩效_区间_{sy}-{str(sm).zfill(2)}_到_{ey}-{str(em).zfill(2)}.xlsx",
-    )
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "区间统计"
+        e = emp_index.get(r["emp_no"])
+        if e is None:
+            e = emp_index[r["emp_no"]] = len(emps)
+            emps.append((r["emp_no"], r["name"]))
+            cells.extend([None] * n_months)
+            score_cells.extend([np.nan] * n_months)
+        pos = e * n_months + month_idx[(r["year"], r["month"])]
+        cells[pos] = (r["score"], r["grade"])
+        if r["score"] is not None:
+            score_cells[pos] = r["score"]
 
     headers = ["工号", "姓名"]
     for (y, m) in months:
         ym = f"{y}-{str(m).zfill(2)}"
         headers.extend([f"{ym}分数", f"{ym}等级"])
     headers.append("区间平均分")
-    ws.append(headers)
 
-    def avg_score(vals):
-        vals = [float(x) for x in vals if x is not None]
-        return round(sum(vals) / len(vals), 2) if vals else ""
-
-    for emp in sorted(by_emp.values(), key=lambda e: emp_sort_key(e["emp_no"])):
-        line = [emp["emp_no"], emp["name"]]
-        scores_acc = []
-        for (y, m) in months:
-            item = emp["items"].get((y, m))
-            score = item["score"] if item else None
-            grade = item["grade"] if item else ""
-            line.append(score if score is not None else "")
-            line.append(grade)
-            if score is not None:
-                scores_acc.append(score)
-        line.append(avg_score(scores_acc))
-        ws.append(line)
-
-    wb.save(xlsx_path)
-    return send_file(xlsx_path, as_attachment=True, download_name=os.path.basename(xlsx_path))
+    # 员工×月份分数矩阵，一次性计算所有人的区间平均分
+    scores = np.array(score_cells, dtype=np.float64).reshape(len(emps), n_months)
+    counts = (~np.isnan(scores)).sum(axis=1)
+    # nancumsum 按月份顺序累加，与逐项求和结果逐位一致（np.sum 的成对求和会改变舍入）
+    sums = np.nancumsum(scores, axis=1)[:, -1]
+    avgs = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0).tolist()
+    order = sorted(range(len(emps)), key=lambda i: emp_sort_key(emps[i][0]))
+
+    row_len = 2 + 2 * n_months + 1
+
+    def iter_lines():
+        for i in order:
+            # 预分配整行并按下标写入，缺失月份保持空串
+            line = [""] * row_len
+            line[0], line[1] = emps[i]
+            base = i * n_months
+            for j, item in enumerate(cells[base:base + n_months]):
+                if item:
+                    col = 2 + 2 * j
+                    if item[0] is not None:
+                        line[col] = item[0]
+                    line[col + 1] = item[1]
+            # 保持 Python round 的舍入语义（np.round 在 .xx5 边界上结果不同）
+            if counts[i]:
+                line[-1] = round(avgs[i], 2)
+            yield line
+
+    # 区间导出可能覆盖多年×数百人，纯表格无样式，直接生成 sheet XML 比 openpyxl 快数倍
+    return _send_export(
+        f"绩效_区间_{sy}-{str(sm).zfill(2)}_到_{ey}-{str(em).zfill(2)}",
+        _export_digest(months, [tuple(r) for r in rows]),
+        lambda target: write_simple_xlsx(target, "区间统计", headers, iter_lines()),
+    )
 
 
 @performance_bp.route('/export_yearly')
@@ -1000,54 +1254,44 @@ def export_range():
 def export_yearly():
     """导出年度绩效数据"""
     uid = require_user_id()
-    year = request.args.get("year", type=int)
+    export_args = _parse_export_args(request, "avg_desc")
+    year = export_args.year
     if not year:
         flash("请先选择年份", "warning")
         return redirect(url_for("performance.records"))
-
-    sort = request.args.get("sort", "avg_desc")
-    selected_grades = [g for g in request.args.getlist("grade") if g]
-    grade_filter_set = set(selected_grades)
-    min_score_raw = (request.args.get("min_score") or "").strip()
-    try:
-        min_score_filter = float(min_score_raw) if min_score_raw else None
-    except ValueError:
-        min_score_filter = None
+    sort = export_args.sort
 
     data, months, _ = build_yearly_matrix(uid, year)
-    data = filter_sort_yearly_data(data, grade_filter_set, min_score_filter, sort)
+    data = filter_sort_yearly_data(data, export_args.grades, export_args.min_score, sort)
     if not data:
         flash("无数据可导出", "warning")
         return redirect(url_for("performance.records", year=year, sort=sort))
 
-    xlsx_path = os.path.join(EXPORT_DIR, f"绩效年度_{year}.xlsx")
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"年度{year}"
+    def build(target):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = f"年度{year}"
 
-    headers = ["工号", "姓名"]
-    for _y, m in months:
-        headers.extend([f"{m}月分数", f"{m}月等级"])
-    headers.append("平均分")
-    ws.append(headers)
+        headers = ["工号", "姓名"]
+        for _y, m in months:
+            headers.extend((MONTH_SCORE_LABELS[m - 1], MONTH_GRADE_LABELS[m - 1]))
+        headers.append("平均分")
+        ws.append(headers)
 
-    for row in data:
-        line = [row["emp_no"], row["name"]]
-        for cell in row["detail"]:
-            if cell:
-                line.append(cell.get("score") if cell.get("score") is not None else "")
-                line.append(cell.get("grade", ""))
-            else:
-                line.extend(["", ""])
-        line.append(row["avg_score"] if row["avg_score"] is not None else "")
-        ws.append(line)
+        for row in data:
+            line = [row["emp_no"], row["name"]]
+            for cell in row["detail"]:
+                if cell:
+                    line.append(cell.get("score") if cell.get("score") is not None else "")
+                    line.append(cell.get("grade", ""))
+                else:
+                    line.extend(["", ""])
+            line.append(row["avg_score"] if row["avg_score"] is not None else "")
+            ws.append(line)
 
-    wb.save(xlsx_path)
-    return send_file(
-        xlsx_path,
-        as_attachment=True,
-        download_name=os.path.basename(xlsx_path),
-    )
+        wb.save(target)
+
+    return _send_export(f"绩效年度_{year}", _export_digest(year, data), build)
 
 
 @performance_bp.route('/export_quarters')
@@ -1055,55 +1299,46 @@ def export_yearly():
 def export_quarters():
     """导出季度绩效数据"""
     uid = require_user_id()
-    year = request.args.get("year", type=int) or datetime.now().year
-    selected_grades = [g for g in request.args.getlist("grade") if g]
-    grade_filter_set = set(selected_grades)
-    min_score_raw = (request.args.get("min_score") or "").strip()
-    try:
-        min_score_filter = float(min_score_raw) if min_score_raw else None
-    except ValueError:
-        min_score_filter = None
+    export_args = _parse_export_args(request, "")
+    year = export_args.year or datetime.now().year
 
     options, default_grade, data = build_quarter_dataset(uid, year)
-    data = filter_quarter_data(data, grade_filter_set, min_score_filter)
+    data = filter_quarter_data(data, export_args.grades, export_args.min_score)
     if not data:
         flash("无数据可导出", "warning")
         return redirect(url_for("performance.quarters", year=year))
 
-    xlsx_path = os.path.join(EXPORT_DIR, f"季度绩效_{year}.xlsx")
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"季度{year}"
-
-    headers = [
-        "工号",
-        "姓名",
-        "Q1平均分",
-        "Q1等级",
-        "Q2平均分",
-        "Q2等级",
-        "Q3平均分",
-        "Q3等级",
-        "Q4平均分",
-        "Q4等级",
-    ]
-    ws.append(headers)
-
-    for row in data:
-        line = [row["emp_no"], row["name"]]
-        for quarter in (1, 2, 3, 4):
-            cell = row["q"].get(quarter, {})
-            score = cell.get("score")
-            line.append(score if isinstance(score, (int, float)) else (score or ""))
-            line.append(cell.get("grade") or default_grade)
-        ws.append(line)
-
-    wb.save(xlsx_path)
-    return send_file(
-        xlsx_path,
-        as_attachment=True,
-        download_name=os.path.basename(xlsx_path),
-    )
+    def build(target):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = f"季度{year}"
+
+        headers = [
+            "工号",
+            "姓名",
+            "Q1平均分",
+            "Q1等级",
+            "Q2平均分",
+            "Q2等级",
+            "Q3平均分",
+            "Q3等级",
+            "Q4平均分",
+            "Q4等级",
+        ]
+        ws.append(headers)
+
+        for row in data:
+            line = [row["emp_no"], row["name"]]
+            for quarter in (1, 2, 3, 4):
+                cell = row["q"].get(quarter, {})
+                score = cell.get("score")
+                line.append(score if isinstance(score, (int, float)) else (score or ""))
+                line.append(cell.get("grade") or default_grade)
+            ws.append(line)
+
+        wb.save(target)
+
+    return _send_export(f"季度绩效_{year}", _export_digest(year, default_grade, data), build)
 
 
 @performance_bp.route('/export_calculator')
@@ -1111,8 +1346,9 @@ def export_quarters():
 def export_calculator():
     """导出绩效计算器结果"""
     uid = require_user_id()
-    sort = request.args.get("sort", "total_desc")
-    year = request.args.get("year", type=int) or datetime.now().year
+    export_args = _parse_export_args(request, "total_desc")
+    sort = export_args.sort
+    year = export_args.year or datetime.now().year
 
     mapping = get_or_init_grade_map(uid)
     data, months = build_calculator_dataset(uid, year, mapping)
@@ -1121,34 +1357,31 @@ def export_calculator():
         flash("无数据可导出", "warning")
         return redirect(url_for("performance.calculator", sort=sort, year=year))
 
-    xlsx_path = os.path.join(EXPORT_DIR, f"绩效计算器_{year}.xlsx")
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"积分{year}"
+    def build(target):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = f"积分{year}"
 
-    headers = ["工号", "姓名"]
-    for _y, m in months:
-        headers.extend([f"{m}月等级", f"{m}月积分"])
-    headers.append("总积分")
-    ws.append(headers)
+        headers = ["工号", "姓名"]
+        for _y, m in months:
+            headers.extend((MONTH_GRADE_LABELS[m - 1], MONTH_POINT_LABELS[m - 1]))
+        headers.append("总积分")
+        ws.append(headers)
 
-    for row in data:
-        line = [row["emp_no"], row["name"]]
-        for cell in row["detail"]:
-            if cell:
-                line.append(cell.get("grade", ""))
-                line.append(round(cell.get("value", 0.0), 2))
-            else:
-                line.extend(["", ""])
-        line.append(row["total"])
-        ws.append(line)
+        for row in data:
+            line = [row["emp_no"], row["name"]]
+            for cell in row["detail"]:
+                if cell:
+                    line.append(cell.get("grade", ""))
+                    line.append(round(cell.get("value", 0.0), 2))
+                else:
+                    line.extend(["", ""])
+            line.append(row["total"])
+            ws.append(line)
 
-    wb.save(xlsx_path)
-    return send_file(
-        xlsx_path,
-        as_attachment=True,
-        download_name=os.path.basename(xlsx_path),
-    )
+        wb.save(target)
+
+    return _send_export(f"绩效计算器_{year}", _export_digest(year, mapping, data), build)
 
 
 @performance_bp.route('/calculator', methods=['GET', 'POST'])
@@ -1156,10 +1389,10 @@ def export_calculator():
 def calculator():
     """绩效计算器（自定义档位映射）"""
     uid = require_user_id()
-    sort = request.args.get("sort", "total_desc")
-    year_param = request.args.get("year", type=int)
+    export_args = _parse_export_args(request, "total_desc")
+    sort = export_args.sort
     now = datetime.now()
-    year = year_param or now.year
+    year = export_args.year or now.year
     if not (2000 <= year <= 2100):
         year = now.year
     year_options = list(range(now.year - 5, now.year + 2))
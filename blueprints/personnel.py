@@ -4,27 +4,39 @@
 人员管理模块
 负责员工信息管理、导入导出等功能
 """
+import calendar
 import json
+import logging
+import math
+import re
 import sqlite3
+import unicodedata
+from bisect import bisect_right
 from collections import Counter
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, send_file
+import numpy as np
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, send_file, session, g
 from openpyxl import Workbook, load_workbook
 
 from config.settings import APP_TITLE
 from models.database import get_db
+from services.algorithm_config_service import AlgorithmConfigService
+from utils.scoring_kernels import aggregate_training, training_columns, volatility_batch, welford_std
 from .decorators import login_required, manager_required
+from .safety import extract_score_from_assessment
 from .helpers import (
     current_user_id, require_user_id, get_accessible_department_ids,
     get_accessible_departments, calculate_years_from_date, get_user_department,
-    validate_employee_access, log_import_operation
+    validate_employee_access, log_import_operation, get_department_name_map
 )
 
 # 创建 Blueprint
 personnel_bp = Blueprint('personnel', __name__, url_prefix='/personnel')
+logger = logging.getLogger(__name__)
 
 
 # ==================== 常量定义 ====================
@@ -54,6 +66,33 @@ PERSONNEL_DB_COLUMNS = [
 
 PERSONNEL_DATE_FIELDS = {"birth_date", "work_start_date", "entry_date", "certification_date", "solo_driving_date"}
 
+# 人员 upsert 语句：固定列之后依次为除 department_id 外的其余字段
+# 注意: UNIQUE约束是emp_no（全局唯一），数据以department_id为基准隔离
+PERSONNEL_UPSERT_EXTRA_COLUMNS = [col for col in PERSONNEL_DB_COLUMNS if col != "department_id"]
+PERSONNEL_UPSERT_COLUMNS = ["emp_no", "name", "created_by", "department_id"] + PERSONNEL_UPSERT_EXTRA_COLUMNS
+PERSONNEL_UPSERT_SQL = f"""
+    INSERT INTO employees ({", ".join(PERSONNEL_UPSERT_COLUMNS)})
+    VALUES ({", ".join("?" for _ in PERSONNEL_UPSERT_COLUMNS)})
+    ON CONFLICT(emp_no) DO UPDATE SET {", ".join(
+        f"{col}=excluded.{col}" for col in ["name", "department_id"] + PERSONNEL_UPSERT_EXTRA_COLUMNS
+    )}
+"""
+
+# 单字段更新语句（字段白名单即字典的键）；语句文本固定，可复用连接上的预编译语句缓存
+PERSONNEL_UPDATE_FIELD_SQL = {
+    field: f"UPDATE employees SET {field} = ? WHERE emp_no=?"
+    for field in ["name"] + PERSONNEL_DB_COLUMNS
+}
+
+# list_personnel 查询的列顺序（与其 SELECT 保持一致），按位置直接组装字典
+PERSONNEL_ROW_KEYS = (
+    "emp_no", "name", "department_id", "department_name",
+    "class_name", "position", "birth_date", "certification_date",
+    "solo_driving_date", "marital_status", "hometown",
+    "political_status", "education", "graduation_school",
+    "work_start_date", "entry_date", "specialty",
+)
+
 PERSONNEL_SELECT_OPTIONS = {
     "marital_status": ["未婚", "已婚", "离异", "其它"],
     "political_status": ["中共党员", "中共预备党员", "共青团员", "群众", "其它"],
@@ -84,6 +123,175 @@ PERSONNEL_IMPORT_HEADER_MAP = {
     "入司时间": "entry_date",
 }
 
+# 归一化后的导入表头映射（全角转半角、去除首尾空白）
+IMPORT_HEADER_FIELDS = {
+    unicodedata.normalize("NFKC", header).strip(): field
+    for header, field in PERSONNEL_IMPORT_HEADER_MAP.items()
+}
+
+# 月度绩效等级规则：等级 -> (状态颜色, 警示标签)
+PERFORMANCE_GRADE_RULES = {
+    'A': ('GREEN', '✅ 优秀'),
+    'B+': ('GREEN', '✅ 达标'),
+    'B': ('ORANGE', '⚠️ 未达基准'),
+    'C': ('ORANGE', '⚠️ 绩效预警'),
+    'D': ('RED', '⛔ 绩效不合格'),
+}
+
+# 安全评分状态档位：(状态颜色, 标签A, 标签B)
+#   红线熔断：存在高扣分用标签A，否则用标签B
+#   黄色预警：行为分低于严重性分用标签A，否则用标签B
+#   绿色安全：两者相同
+SAFETY_STATUS_BANDS = (
+    ("RED", "⛔ 重大红线（存在高扣分）", "⛔ 安全不合格"),
+    ("ORANGE", "⚠️ 高频违规风险", "⚠️ 扣分过多风险"),
+    ("GREEN", "✅ 安全", "✅ 安全"),
+)
+
+# 培训风险等级 -> 前端颜色
+TRAINING_LEVEL_COLORS = {
+    'CRITICAL': 'RED',
+    'HIGH_RISK': 'PURPLE',
+    'WARNING': 'ORANGE',
+    'NOTICE': 'YELLOW',
+}
+
+# 学习能力算法默认参数（配置缺失时使用）
+DEFAULT_LEARNING_CONFIG = {
+    'potential_threshold': 0.5,
+    'decline_threshold': -0.2,
+    'decline_penalty': 0.8,
+    'slope_amplifier': 10
+}
+
+# 人员统计图表分档边界：年龄 ≤25/26-35/36-45/≥46，工龄 <1/1-3/3-5/5-10/≥10 年
+AGE_BUCKET_BOUNDS = (25, 35, 45)
+TENURE_BUCKET_BOUNDS = (1, 3, 5, 10)
+
+# 司机安全风险等级（按单独驾驶年限分档）：<1/1-3/3-5/≥5 年
+RISK_LEVEL_LABELS = ("新手(<1年)", "成长(1-3年)", "熟练(3-5年)", "资深(≥5年)")
+RISK_LEVEL_BOUNDS = (1, 3, 5)
+
+# 政治面貌统计分类（其余取值均计入"其它"）
+POLITICAL_STATUS_LABELS = ("中共党员", "中共预备党员", "共青团员", "群众")
+
+# 籍贯地域识别：河南省内的地级市
+HENAN_CITIES = (
+    "郑州", "开封", "洛阳", "平顶山", "安阳", "鹤壁",
+    "新乡", "焦作", "濮阳", "许昌", "漯河", "三门峡",
+    "南阳", "商丘", "信阳", "周口", "驻马店", "济源"
+)
+
+# 常见县级市/县（可根据实际情况扩展）
+HENAN_COUNTIES = (
+    "巩义", "荥阳", "新密", "新郑", "登封", "中牟",
+    "兰考", "杞县", "通许", "尉氏", "偃师", "孟津",
+    "新安", "栾川", "嵩县", "汝阳", "宜阳", "洛宁",
+    "伊川", "汝州", "舞钢", "林州", "卫辉", "辉县",
+    "沁阳", "孟州", "禹州", "长葛", "义马", "灵宝",
+    "永城", "项城", "邓州", "固始", "鹿邑", "新蔡"
+)
+
+# 省外省份
+PROVINCES = (
+    "北京", "天津", "上海", "重庆",
+    "河北", "山西", "辽宁", "吉林", "黑龙江",
+    "江苏", "浙江", "安徽", "福建", "江西", "山东",
+    "湖北", "湖南", "广东", "海南",
+    "四川", "贵州", "云南", "陕西", "甘肃",
+    "青海", "台湾", "内蒙古", "广西", "西藏",
+    "宁夏", "新疆", "香港", "澳门"
+)
+
+
+def _compile_name_matcher(names):
+    """
+    预编译地名匹配：一次扫描找出字符串中出现的所有地名（含相互重叠的）
+
+    同一起始位置只能命中一个名称，因此同一列表中的地名不应互为前缀
+
+    Returns:
+        (pattern, rank)，rank 为地名在原列表中的位置
+    """
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, names)) + "))")
+    return pattern, {name: i for i, name in enumerate(names)}
+
+
+HENAN_CITY_MATCHER = _compile_name_matcher(HENAN_CITIES)
+HENAN_COUNTY_MATCHER = _compile_name_matcher(HENAN_COUNTIES)
+PROVINCE_MATCHER = _compile_name_matcher(PROVINCES)
+
+# 日期字符串兜底解析格式，按分隔符分组（年月格式解析结果默认即为当月1号）
+DATE_FORMATS_BY_SEPARATOR = {
+    "-": ("%Y-%m-%d", "%Y-%m"),
+    "/": ("%Y/%m/%d", "%Y/%m"),
+    ".": ("%Y.%m.%d", "%Y.%m"),
+    "": ("%Y%m%d", "%Y%m"),
+}
+
+# 稳定性算法默认参数（配置缺失时使用）
+DEFAULT_STABILITY_CONFIG = {
+    'seniority_weights': {
+        'age': 0.15,
+        'working_years': 0.20,
+        'company_years': 0.25,
+        'cert_years': 0.20,
+        'solo_years': 0.20
+    },
+    'seniority_thresholds': {
+        'age_cap': 30,  # 年龄满30年算满分
+        'working_cap': 20,  # 工龄满20年算满分
+        'company_cap': 10,  # 司龄满10年算满分
+        'cert_cap': 10,  # 取证满10年算满分
+        'solo_cap': 10  # 单独驾驶满10年算满分
+    },
+    'dimension_weights': {
+        'seniority': 0.60,  # 资历维度权重
+        'volatility': 0.40   # 稳定性维度权重
+    },
+    'volatility_penalty': {
+        'low_threshold': 5.0,     # 低波动阈值（标准差）
+        'high_threshold': 15.0,   # 高波动阈值（标准差）
+        'max_penalty': 0.5        # 最大惩罚系数
+    }
+}
+
+# 稳定性资历维度：(权重键, 满分年限键)，按出生、参加工作、入司、取证、单独驾驶日期顺序排列，
+# 也是加权求和的顺序
+STABILITY_SENIORITY_FIELDS = (
+    ('age', 'age_cap'),
+    ('working_years', 'working_cap'),
+    ('company_years', 'company_cap'),
+    ('cert_years', 'cert_cap'),
+    ('solo_years', 'solo_cap'),
+)
+
+# 学习能力历史数据不足（少于2个月）时的返回结果
+LEARNING_INSUFFICIENT_RESULT = {
+    'learning_score': 0,
+    'slope': 0,
+    'average_score': 0,
+    'status_color': 'GRAY',
+    'alert_tag': '⚪ 数据不足',
+    'tier': '数据不足'
+}
+
+# 月度绩效快照结果缓存上限（按 (等级, 原始分) 记忆）
+MONTHLY_PERFORMANCE_CACHE_SIZE = 8192
+
+# 月度绩效快照缓存：(配置对象, {(等级, 原始分): 结果元组})
+# 持有配置对象本身而不是 id，配置切换时整体替换，避免误用旧配置的结果
+_monthly_performance_cache = (None, {})
+
+# AFR 阈值分段表缓存：{id(阈值列表): (阈值列表, 分段表)}，保留列表引用防止 id 被复用
+_afr_table_cache = {}
+
+# 扣分范围分段表缓存，结构同 _afr_table_cache
+_score_range_table_cache = {}
+
+# 等级系数查找表缓存：{id(等级系数字典): (等级系数字典, 查找表)}
+_grade_coeff_table_cache = {}
+
 
 # ==================== 辅助函数 ====================
 
@@ -105,50 +313,27 @@ def calculate_performance_score_monthly(grade: str, raw_score: float, config: di
             'grade': 等级
         }
     """
+    global _monthly_performance_cache
+
     # 读取配置
     if config is None:
-        from services.algorithm_config_service import AlgorithmConfigService
         config = AlgorithmConfigService.get_active_config()
 
-    grade_coefficients = config['performance']['grade_coefficients']
-    grade_ranges = config['performance']['grade_ranges']
-
-    grade = grade.upper() if grade else 'B+'
+    cached_config, cached_results = _monthly_performance_cache
+    if cached_config is not config:
+        cached_results = {}
+        _monthly_performance_cache = (config, cached_results)
 
-    # 等级锁定规则（使用配置参数）
-    if grade == 'D':
-        radar_value = grade_ranges['D']['radar_override']  # 从配置读取
-        status_color = 'RED'
-        alert_tag = '⛔ 绩效不合格'
-        display_label = f'D级 (系数{grade_coefficients["D"]})'
-    elif grade == 'C':
-        radar_value = min(max(raw_score, grade_ranges['C']['min']), grade_ranges['C']['max'])
-        status_color = 'ORANGE'
-        alert_tag = '⚠️ 绩效预警'
-        display_label = f'C级 (系数{grade_coefficients["C"]})'
-    elif grade == 'B':
-        radar_value = min(max(raw_score, grade_ranges['B']['min']), grade_ranges['B']['max'])
-        status_color = 'ORANGE'
-        alert_tag = '⚠️ 未达基准'
-        display_label = f'B级 (系数{grade_coefficients["B"]})'
-    elif grade == 'B+':
-        radar_value = min(max(raw_score, grade_ranges['B+']['min']), grade_ranges['B+']['max'])
-        status_color = 'GREEN'
-        alert_tag = '✅ 达标'
-        display_label = f'B+级 (系数{grade_coefficients["B+"]})'
-    elif grade == 'A':
-        radar_value = min(max(raw_score, grade_ranges['A']['min']), grade_ranges['A']['max'])
-        status_color = 'GREEN'
-        alert_tag = '✅ 优秀'
-        display_label = f'A级 (系数{grade_coefficients["A"]})'
-    else:  # 默认B+
-        radar_value = min(max(raw_score, grade_ranges['B+']['min']), grade_ranges['B+']['max'])
-        status_color = 'GREEN'
-        alert_tag = '✅ 达标'
-        display_label = f'B+级 (系数{grade_coefficients["B+"]})'
+    key = (grade, raw_score)
+    result = cached_results.get(key)
+    if result is None:
+        result = _monthly_performance_core(grade, raw_score, config)
+        if len(cached_results) < MONTHLY_PERFORMANCE_CACHE_SIZE:
+            cached_results[key] = result
 
+    radar_value, display_label, status_color, alert_tag, grade = result
     return {
-        'radar_value': round(radar_value, 1),
+        'radar_value': radar_value,
         'display_label': display_label,
         'status_color': status_color,
         'alert_tag': alert_tag,
@@ -157,6 +342,101 @@ def calculate_performance_score_monthly(grade: str, raw_score: float, config: di
     }
 
 
+def _monthly_performance_core(grade: str, raw_score: float, config: dict) -> tuple:
+    """
+    月度快照计算本体（纯函数，结果可按输入缓存）
+
+    Returns:
+        (雷达图显示值, 显示标签, 状态颜色, 警示标签, 等级)
+    """
+    performance_config = config['performance']
+    grade_coefficients = performance_config['grade_coefficients']
+    grade_ranges = performance_config['grade_ranges']
+
+    grade = grade.upper() if grade else 'B+'
+
+    # 等级锁定规则（使用配置参数），未知等级按B+处理
+    rule_grade = grade if grade in PERFORMANCE_GRADE_RULES else 'B+'
+    status_color, alert_tag = PERFORMANCE_GRADE_RULES[rule_grade]
+    if rule_grade == 'D':
+        radar_value = grade_ranges['D']['radar_override']  # 从配置读取
+    else:
+        grade_range = grade_ranges[rule_grade]
+        radar_value = min(max(raw_score, grade_range['min']), grade_range['max'])
+    display_label = f'{rule_grade}级 (系数{grade_coefficients[rule_grade]})'
+
+    return round(radar_value, 1), display_label, status_color, alert_tag, grade
+
+
+def _grade_coefficient_table(grade_coefficients: Dict[str, float]):
+    """
+    按配置构造等级系数查找表
+
+    同一等级系数字典对象只构造一次，配置未变时后续调用直接复用
+
+    Returns:
+        (等级 -> 下标映射, 系数数组)，系数数组末位为未配置等级的默认系数1.0（只读）
+    """
+    cached = _grade_coeff_table_cache.get(id(grade_coefficients))
+    if cached is not None and cached[0] is grade_coefficients:
+        return cached[1]
+
+    grade_index = {grade: i for i, grade in enumerate(grade_coefficients)}
+    coeff_table = np.array([*grade_coefficients.values(), 1.0], dtype=float)
+    coeff_table.flags.writeable = False
+
+    if len(_grade_coeff_table_cache) >= 16:
+        _grade_coeff_table_cache.clear()
+    _grade_coeff_table_cache[id(grade_coefficients)] = (grade_coefficients, (grade_index, coeff_table))
+    return grade_index, coeff_table
+
+
+def _fast_date(value: str) -> Optional[date]:
+    """
+    快速解析 YYYY-MM-DD / YYYY-MM 格式日期（YYYY-MM 取当月1号）
+
+    分隔符位置符合时交给 C 实现的 date.fromisoformat，跳过 strptime 的格式解析；
+    fromisoformat 只接受 ASCII 数字，不是这两种格式或日期无效时返回 None，由调用方回退到 strptime
+    """
+    try:
+        if len(value) == 10 and value[4] == '-' and value[7] == '-':
+            return date.fromisoformat(value)
+        if len(value) == 7 and value[4] == '-':
+            return date.fromisoformat(value + '-01')
+    except ValueError:
+        pass
+    return None
+
+
+def _parse_month_index(date_strs: List[str]) -> np.ndarray:
+    """
+    将 YYYY-MM / YYYY-MM-DD 日期字符串批量解析为月序号（1970-01 为 0）
+
+    整批交给 datetime64 解析；有无法识别的格式时逐条回退到 strptime，解析失败的位置为 NaN
+    """
+    try:
+        months = np.array([date_str[:7] for date_str in date_strs], dtype='datetime64[M]')
+        index = months.astype(np.int64).astype(float)
+        index[np.isnat(months)] = np.nan
+        return index
+    except (TypeError, ValueError):
+        pass
+
+    index = np.empty(len(date_strs))
+    for i, date_str in enumerate(date_strs):
+        try:
+            grade_date = _fast_date(date_str[:7]) or datetime.strptime(date_str[:7], '%Y-%m')
+            index[i] = (grade_date.year - 1970) * 12 + (grade_date.month - 1)
+        except (TypeError, ValueError):
+            index[i] = np.nan
+    return index
+
+
+def _sequential_sum(values: np.ndarray) -> float:
+    """按顺序累加（与逐项 += 的结果一致，np.sum 的两两求和会有末位差异）"""
+    return float(np.cumsum(values)[-1]) if values.size else 0.0
+
+
 def calculate_performance_score_period(grade_list: List[str], grade_dates: Optional[List[str]] = None, config: dict = None) -> Dict:
     """
     绩效周期加权算法（跨月、季度、年度）（参数化版本）
@@ -188,98 +468,69 @@ def calculate_performance_score_period(grade_list: List[str], grade_dates: Optio
 
     # 读取配置
     if config is None:
-        from services.algorithm_config_service import AlgorithmConfigService
         config = AlgorithmConfigService.get_active_config()
 
-    grade_coefficients = config['performance']['grade_coefficients']
-    contamination_rules = config['performance']['contamination_rules']
-    time_decay = config['performance'].get('time_decay', {
+    performance_config = config['performance']
+    grade_coefficients = performance_config['grade_coefficients']
+    contamination_rules = performance_config['contamination_rules']
+    d_threshold = contamination_rules['d_count_threshold']
+    c_threshold = contamination_rules['c_count_threshold']
+    d_cap = contamination_rules['d_cap_score']
+    c_cap = contamination_rules['c_cap_score']
+    time_decay = performance_config.get('time_decay', {
         'enabled': True,
         'decay_months': 6,
         'decay_rate': 0.9
     })
 
-    # Step 1: 系数映射（使用配置）
-    coeff_map = grade_coefficients
+    # Step 1: 系数映射（使用配置）：等级编码为系数表下标后一次查表
+    grades = [grade.upper() if grade else 'B+' for grade in grade_list]
+    grade_index, coeff_table = _grade_coefficient_table(grade_coefficients)
+    default_index = len(coeff_table) - 1
+    grade_idxs = np.fromiter(
+        (grade_index.get(grade, default_index) for grade in grades), dtype=np.intp, count=len(grades)
+    )
+    coeffs = coeff_table[grade_idxs]
 
-    coeffs = []
-    d_count = 0
-    c_count = 0
-    d_count_effective = 0.0  # 带时间衰减的有效D级计数
-    c_count_effective = 0.0  # 带时间衰减的有效C级计数
+    grades_arr = np.array(grades)
+    d_mask = grades_arr == 'D'
+    c_mask = grades_arr == 'C'
+    d_count = int(d_mask.sum())
+    c_count = int(c_mask.sum())
 
     # 如果启用时间衰减且提供了日期信息
     use_time_decay = time_decay.get('enabled', True) and grade_dates and len(grade_dates) == len(grade_list)
 
     if use_time_decay:
-        from datetime import datetime
-
         now = datetime.now()
         decay_months_threshold = time_decay.get('decay_months', 6)
         decay_rate_per_month = time_decay.get('decay_rate', 0.9)
 
-        for i, (grade, date_str) in enumerate(zip(grade_list, grade_dates)):
-            grade = grade.upper() if grade else 'B+'
-            coeffs.append(coeff_map.get(grade, 1.0))
+        # 计算距今月数（日期解析失败的记录为 NaN）
+        months_ago = (now.year - 1970) * 12 + (now.month - 1) - _parse_month_index(grade_dates)
 
-            try:
-                # 解析日期（支持 YYYY-MM 或 YYYY-MM-DD 格式）
-                if len(date_str) == 7:  # YYYY-MM
-                    grade_date = datetime.strptime(date_str, '%Y-%m')
-                else:  # YYYY-MM-DD
-                    grade_date = datetime.strptime(date_str[:7], '%Y-%m')
-
-                # 计算距今月数
-                months_ago = (now.year - grade_date.year) * 12 + (now.month - grade_date.month)
-
-                if grade == 'D':
-                    d_count += 1
-                    # 时间衰减逻辑：
-                    # 1. 只计入最近 decay_months_threshold 个月内的D级
-                    # 2. 每个月衰减 (1 - decay_rate_per_month)
-                    if months_ago <= decay_months_threshold:
-                        # 计算衰减权重：decay_rate^months_ago
-                        decay_weight = (decay_rate_per_month ** months_ago)
-                        d_count_effective += decay_weight
-                elif grade == 'C':
-                    c_count += 1
-                    # C级同样应用时间衰减（但阈值和惩罚可能不同）
-                    if months_ago <= decay_months_threshold:
-                        decay_weight = (decay_rate_per_month ** months_ago)
-                        c_count_effective += decay_weight
+        # 时间衰减逻辑：
+        # 1. 只计入最近 decay_months_threshold 个月内的D/C级
+        # 2. 衰减权重 decay_rate^months_ago
+        # 3. 日期解析失败的记录按原逻辑计为1次
+        with np.errstate(over='ignore', invalid='ignore'):
+            weights = np.where(months_ago <= decay_months_threshold, float(decay_rate_per_month) ** months_ago, 0.0)
+        weights[np.isnan(months_ago)] = 1.0
 
-            except Exception:
-                # 日期解析失败，按原逻辑计数
-                if grade == 'D':
-                    d_count += 1
-                    d_count_effective += 1
-                elif grade == 'C':
-                    c_count += 1
-                    c_count_effective += 1
+        d_count_effective = _sequential_sum(weights[d_mask])  # 带时间衰减的有效D级计数
+        c_count_effective = _sequential_sum(weights[c_mask])  # 带时间衰减的有效C级计数
     else:
-        # 不使用时间衰减，按原逻辑
-        for grade in grade_list:
-            grade = grade.upper() if grade else 'B+'
-            coeffs.append(coeff_map.get(grade, 1.0))
-            if grade == 'D':
-                d_count += 1
-                d_count_effective = d_count
-            elif grade == 'C':
-                c_count += 1
-                c_count_effective = c_count
-
-    # Step 2: 计算平均系数
-    avg_coeff = sum(coeffs) / len(coeffs) if coeffs else 1.0
+        # 不使用时间衰减，有效计数即原始计数
+        d_count_effective = d_count if d_count else 0.0
+        c_count_effective = c_count if c_count else 0.0
+
+    # Step 2: 计算平均系数（math.fsum 精确求和，跨年汇总等长序列也不累积舍入误差）
+    avg_coeff = math.fsum(coeffs.tolist()) / len(coeffs)
 
     # Step 3: 还原基础分 (系数1.0对应95分)
     base_score = avg_coeff * 95
 
     # Step 4: 执行"污点熔断"规则（使用时间衰减后的计数）
-    d_threshold = contamination_rules['d_count_threshold']
-    c_threshold = contamination_rules['c_count_threshold']
-    d_cap = contamination_rules['d_cap_score']
-    c_cap = contamination_rules['c_cap_score']
-
     if d_count_effective >= d_threshold:
         # D级熔断规则（使用衰减后的计数）
         final_score = min(base_score, d_cap)
@@ -324,6 +575,55 @@ def calculate_performance_score_period(grade_list: List[str], grade_dates: Optio
     }
 
 
+def _match_score_range(score_ranges: List[Dict], score_value: float) -> float:
+    """按配置顺序匹配第一个命中的扣分范围，返回其系数（均未命中时为1.0）"""
+    for range_rule in score_ranges:
+        if 'max' in range_rule and 'min' not in range_rule:
+            # 只有max，表示 < max
+            if score_value < range_rule['max']:
+                return range_rule['multiplier']
+        elif 'min' in range_rule and 'max' in range_rule:
+            # 有min和max，表示范围
+            if range_rule['min'] <= score_value < range_rule['max']:
+                return range_rule['multiplier']
+        elif 'min' in range_rule and 'max' not in range_rule:
+            # 只有min，表示 >= min
+            if score_value >= range_rule['min']:
+                return range_rule['multiplier']
+    return 1.0
+
+
+def _compile_score_ranges(score_ranges: List[Dict]):
+    """
+    将 score_ranges 预编译为分段查找表
+
+    所有 min/max 边界排序后把数轴切成若干左闭右开区间，同一区间内的扣分值命中的规则
+    必然相同，因此每个区间只需按原规则匹配一次。之后每条违规记录用
+    bisect_right(bounds, score) 即可取得系数，无需逐条规则判断。
+    同一范围列表对象只编译一次，配置未变时后续员工直接复用
+
+    Returns:
+        (bounds, multipliers)，multipliers[i] 对应 bounds[i-1] <= score < bounds[i]
+    """
+    cached = _score_range_table_cache.get(id(score_ranges))
+    if cached is not None and cached[0] is score_ranges:
+        return cached[1]
+
+    bounds = sorted({
+        range_rule[key]
+        for range_rule in score_ranges
+        for key in ('min', 'max')
+        if key in range_rule
+    })
+    multipliers = [_match_score_range(score_ranges, float('-inf'))]
+    multipliers.extend(_match_score_range(score_ranges, bound) for bound in bounds)
+
+    if len(_score_range_table_cache) >= 16:
+        _score_range_table_cache.clear()
+    _score_range_table_cache[id(score_ranges)] = (score_ranges, (bounds, multipliers))
+    return bounds, multipliers
+
+
 def calculate_safety_score_dual_track(violations_list: List[float], months_active: int = 1, config: dict = None) -> Dict:
     """
     安全意识双轨评分模型（参数化版本）
@@ -342,25 +642,25 @@ def calculate_safety_score_dual_track(violations_list: List[float], months_activ
             'alert_tag': 警示标签
         }
     """
-    import math
-
     # 读取配置
     if config is None:
-        from services.algorithm_config_service import AlgorithmConfigService
         config = AlgorithmConfigService.get_active_config()
 
-    behavior_track = config['safety']['behavior_track']
-    severity_track = config['safety']['severity_track']
-    thresholds = config['safety']['thresholds']
+    safety_config = config['safety']
+    behavior_track = safety_config['behavior_track']
+    severity_track = safety_config['severity_track']
+    thresholds = safety_config['thresholds']
+    freq_thresholds = tuple(behavior_track['freq_thresholds'])  # (2, 5, 6)
+    freq_multipliers = tuple(behavior_track['freq_multipliers'])  # (2, 5, 10)
+    critical_threshold = severity_track['critical_threshold']
+    fail_score = thresholds['fail_score']
+    warning_score = thresholds['warning_score']
 
     # 维度A：行为习惯（捉拿惯犯）
     violation_count = len(violations_list)
     avg_freq = math.ceil(violation_count / months_active) if months_active > 0 else 0
 
     # 根据月均频次扣分（使用配置参数）
-    freq_thresholds = behavior_track['freq_thresholds']  # [2, 5, 6]
-    freq_multipliers = behavior_track['freq_multipliers']  # [2, 5, 10]
-
     if avg_freq <= freq_thresholds[0]:
         score_a_deduction = avg_freq * freq_multipliers[0]
     elif freq_thresholds[0] < avg_freq <= freq_thresholds[1]:
@@ -372,30 +672,13 @@ def calculate_safety_score_dual_track(violations_list: List[float], months_activ
 
     # 维度B：后果严重性（精准打击）（使用配置参数）
     score_b_deduction = 0
-    critical_threshold = severity_track['critical_threshold']
     has_critical_violation = False
 
+    range_bounds, range_multipliers = _compile_score_ranges(severity_track['score_ranges'])
+
     for score_value in violations_list:
         # 根据配置的score_ranges确定系数
-        multiplier = 1.0
-        for range_rule in severity_track['score_ranges']:
-            if 'max' in range_rule and 'min' not in range_rule:
-                # 只有max，表示 < max
-                if score_value < range_rule['max']:
-                    multiplier = range_rule['multiplier']
-                    break
-            elif 'min' in range_rule and 'max' in range_rule:
-                # 有min和max，表示范围
-                if range_rule['min'] <= score_value < range_rule['max']:
-                    multiplier = range_rule['multiplier']
-                    break
-            elif 'min' in range_rule and 'max' not in range_rule:
-                # 只有min，表示 >= min
-                if score_value >= range_rule['min']:
-                    multiplier = range_rule['multiplier']
-                    break
-
-        score_b_deduction += score_value * multiplier
+        score_b_deduction += score_value * range_multipliers[bisect_right(range_bounds, score_value)]
 
         if score_value >= critical_threshold:
             has_critical_violation = True
@@ -406,24 +689,14 @@ def calculate_safety_score_dual_track(violations_list: List[float], months_activ
     final_score = min(score_a, score_b)
 
     # 警示逻辑（使用配置阈值）
-    fail_score = thresholds['fail_score']
-    warning_score = thresholds['warning_score']
-
     if final_score < fail_score or has_critical_violation:
-        # 红线熔断
-        status_color = "RED"
-        alert_tag = "⛔ 重大红线（存在高扣分）" if has_critical_violation else "⛔ 安全不合格"
-    elif fail_score <= final_score < warning_score:
-        # 黄色预警
-        status_color = "ORANGE"
-        if score_a < score_b:
-            alert_tag = "⚠️ 高频违规风险"
-        else:
-            alert_tag = "⚠️ 扣分过多风险"
-    else:  # final_score >= warning_score
-        # 绿色安全
-        status_color = "GREEN"
-        alert_tag = "✅ 安全"
+        # 红线熔断：按是否存在高扣分区分标签
+        status_color, critical_tag, fail_tag = SAFETY_STATUS_BANDS[0]
+        alert_tag = critical_tag if has_critical_violation else fail_tag
+    else:
+        # 黄色预警按行为分/严重性分哪个更低区分标签；绿色安全两者相同
+        status_color, frequency_tag, deduction_tag = SAFETY_STATUS_BANDS[1 if final_score < warning_score else 2]
+        alert_tag = frequency_tag if score_a < score_b else deduction_tag
 
     return {
         'score_a': round(score_a, 1),
@@ -436,6 +709,134 @@ def calculate_safety_score_dual_track(violations_list: List[float], months_activ
     }
 
 
+def calculate_safety_scores_batch(violations_lists: List[List[float]], months_active=1, config: dict = None) -> Dict:
+    """
+    安全意识双轨评分（批量） - 一次为多名员工/多个月份评分
+
+    所有违规扣分展平成一个数组，按所属下标分组求和，整批只做一次 NumPy 运算；
+    结果与逐个调用 calculate_safety_score_dual_track 一致
+
+    Args:
+        violations_lists: 每个评分对象的违规扣分值列表，长度为 N
+        months_active: 统计周期月数，标量或长度为 N 的序列
+        config: 算法配置（可选，默认从数据库读取）
+
+    Returns:
+        {
+            'score_a': 行为分数组,
+            'score_b': 严重性分数组,
+            'final_score': 最终分数数组,
+            'status_color': 状态颜色列表,
+            'alert_tag': 警示标签列表,
+            'violation_count': 违规次数数组,
+            'avg_freq': 月均频次数组
+        }
+    """
+    if config is None:
+        config = AlgorithmConfigService.get_active_config()
+
+    safety_config = config['safety']
+    behavior_track = safety_config['behavior_track']
+    severity_track = safety_config['severity_track']
+    thresholds = safety_config['thresholds']
+    freq_thresholds = tuple(behavior_track['freq_thresholds'])  # (2, 5, 6)
+    freq_multipliers = tuple(behavior_track['freq_multipliers'])  # (2, 5, 10)
+    critical_threshold = severity_track['critical_threshold']
+    fail_score = thresholds['fail_score']
+    warning_score = thresholds['warning_score']
+
+    n = len(violations_lists)
+    counts = np.fromiter((len(violations) for violations in violations_lists), dtype=np.intp, count=n)
+    owners = np.repeat(np.arange(n), counts)
+    flat = np.fromiter(
+        (value for violations in violations_lists for value in violations), dtype=float, count=int(counts.sum())
+    )
+
+    # 维度A：行为习惯（月均频次分档扣分）
+    months = np.broadcast_to(np.asarray(months_active), (n,))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_freq = np.where(months > 0, np.ceil(counts / months), 0).astype(np.int64)
+    score_a_deduction = np.select(
+        [avg_freq <= freq_thresholds[0], avg_freq <= freq_thresholds[1]],
+        [avg_freq * freq_multipliers[0], avg_freq * freq_multipliers[1]],
+        avg_freq * freq_multipliers[2],
+    )
+    score_a = np.maximum(0, 100 - score_a_deduction)
+
+    # 维度B：后果严重性（分段系数查表，按员工顺序累加）
+    range_bounds, range_multipliers = _compile_score_ranges(severity_track['score_ranges'])
+    multipliers = np.asarray(range_multipliers, dtype=float)[np.searchsorted(range_bounds, flat, side='right')]
+    score_b_deduction = np.bincount(owners, weights=flat * multipliers, minlength=n)
+    has_critical = np.bincount(owners, weights=flat >= critical_threshold, minlength=n) > 0
+    score_b = np.maximum(0, 100 - score_b_deduction)
+
+    final_score = np.minimum(score_a, score_b)
+
+    # 警示逻辑（使用配置阈值）
+    status_colors = []
+    alert_tags = []
+    for a, b, final, critical in zip(score_a.tolist(), score_b.tolist(), final_score.tolist(), has_critical.tolist()):
+        if final < fail_score or critical:
+            status_color, critical_tag, fail_tag = SAFETY_STATUS_BANDS[0]
+            alert_tag = critical_tag if critical else fail_tag
+        else:
+            status_color, frequency_tag, deduction_tag = SAFETY_STATUS_BANDS[1 if final < warning_score else 2]
+            alert_tag = frequency_tag if a < b else deduction_tag
+        status_colors.append(status_color)
+        alert_tags.append(alert_tag)
+
+    return {
+        'score_a': np.array([round(value, 1) for value in score_a.tolist()], dtype=float),
+        'score_b': np.array([round(value, 1) for value in score_b.tolist()], dtype=float),
+        'final_score': np.array([round(value, 1) for value in final_score.tolist()], dtype=float),
+        'status_color': status_colors,
+        'alert_tag': alert_tags,
+        'violation_count': counts,
+        'avg_freq': avg_freq
+    }
+
+
+def _match_afr_rule(afr_thresholds: List[Dict], afr: float) -> Optional[Dict]:
+    """按配置顺序返回第一个命中的AFR阈值规则（均未命中时为None）"""
+    for rule in afr_thresholds:
+        if 'max' in rule:
+            # 有max的规则（中间范围）
+            if rule['min'] <= afr < rule['max']:
+                return rule
+        elif afr >= rule['min']:
+            # 只有min的规则（最高阈值）
+            return rule
+    return None
+
+
+def _compile_afr_thresholds(afr_thresholds: List[Dict]):
+    """
+    将AFR阈值规则预编译为分段查找表（与 _compile_score_ranges 相同的切分方式）
+
+    同一阈值列表对象只编译一次，配置未变时后续员工直接复用
+
+    Returns:
+        (bounds, rules)，rules[i] 对应 bounds[i-1] <= AFR < bounds[i] 命中的规则
+    """
+    cached = _afr_table_cache.get(id(afr_thresholds))
+    if cached is not None and cached[0] is afr_thresholds:
+        return cached[1]
+
+    bounds = sorted({
+        rule[key]
+        for rule in afr_thresholds
+        for key in ('min', 'max')
+        if key in rule
+    })
+    rules = [_match_afr_rule(afr_thresholds, float('-inf'))]
+    rules.extend(_match_afr_rule(afr_thresholds, bound) for bound in bounds)
+
+    if len(_afr_table_cache) >= 16:
+        _afr_table_cache.clear()
+    _afr_table_cache[id(afr_thresholds)] = (afr_thresholds, (bounds, rules))
+    return bounds, rules
+
+
 def calculate_training_score_with_penalty(
     training_records: List[tuple],
     duration_days: int = 30,
@@ -448,7 +849,8 @@ def calculate_training_score_with_penalty(
     新增动态AFR阈值：根据取证年限区分新老员工，使用不同的评判标准
 
     Args:
-        training_records: 培训记录列表，每条记录为 (score, is_qualified, is_disqualified, training_date)
+        training_records: 培训记录，TrainingColumns（按列存储，见 training_columns）或
+                          (score, is_qualified, is_disqualified, training_date) 元组列表
         duration_days: 统计周期天数（用于年化计算）
         cert_years: 取证年限（可选），用于判断新老员工。
                     None 或 <1年 为新员工，>=1年为老员工
@@ -464,11 +866,8 @@ def calculate_training_score_with_penalty(
             'status_color': 状态颜色（用于前端显示）
         }
     """
-    import math
-
     # 读取配置
     if config is None:
-        from services.algorithm_config_service import AlgorithmConfigService
         config = AlgorithmConfigService.get_active_config()
 
     penalty_rules = config['training']['penalty_rules']
@@ -545,17 +944,8 @@ def calculate_training_score_with_penalty(
             }
 
     # Step 1: 判定失格次数
-    fail_count = 0
-    total_score = 0
-
-    for record in training_records:
-        score, is_qualified, is_disqualified, training_date = record
-
-        # 失格判定：is_disqualified=1 OR score=0 OR is_qualified=0
-        if is_disqualified == 1 or score == 0 or is_qualified == 0:
-            fail_count += 1
-
-        total_score += (score if score else 0)
+    # 失格判定：is_disqualified=1 OR score=0 OR is_qualified=0
+    fail_count, total_score = aggregate_training(training_records)
 
     # Step 2: 计算基础分（简单平均）
     avg_score = total_score / total_ops if total_ops > 0 else 0
@@ -569,23 +959,25 @@ def calculate_training_score_with_penalty(
 
     # Priority A: 绝对熔断红线（使用配置参数）
     absolute_threshold = penalty_rules['absolute_threshold']
+    absolute_fail_count = absolute_threshold['fail_count']
     small_sample = penalty_rules['small_sample']
+    sample_size = small_sample['sample_size']
 
-    if fail_count >= absolute_threshold['fail_count']:
+    if fail_count >= absolute_fail_count:
         coeff = absolute_threshold['coefficient']
         tag_level = 'CRITICAL'
         alert_msg = '❌ 业务能力差 (高频失格)'
-        description = f'检测到绝对失格次数 ≥ {absolute_threshold["fail_count"]}次（实际{fail_count}次），系统判定为不合格。'
+        description = f'检测到绝对失格次数 ≥ {absolute_fail_count}次（实际{fail_count}次），系统判定为不合格。'
 
     # Priority B: 小样本保护 & 高危标记（使用配置参数）
-    elif total_ops < small_sample['sample_size'] and fail_count > 0:
+    elif total_ops < sample_size and fail_count > 0:
         coeff = small_sample['coefficient']
         tag_level = 'HIGH_RISK'
         alert_msg = '⚠️ 观察期失格 (高风险-需带教)'
         description = f'样本量不足（仅{total_ops}次操作），但已出现{fail_count}次失格。建议加强带教。'
 
     # Priority C: 大样本年化推演（使用动态AFR阈值）
-    elif total_ops >= small_sample['sample_size']:
+    elif total_ops >= sample_size:
         # 计算年化失格频率 (AFR - Annualized Failure Rate)
         duration_days = max(1, duration_days)  # 防止除零
         AFR = (fail_count / duration_days) * 365
@@ -602,29 +994,23 @@ def calculate_training_score_with_penalty(
             afr_thresholds = penalty_rules.get('afr_thresholds_experienced', penalty_rules.get('afr_thresholds', []))
             employee_type = "老员工"
 
-        # 从高到低检查AFR阈值
-        matched = False
-        for rule in afr_thresholds:
-            if 'max' in rule:
-                # 有max的规则（中间范围）
-                if rule['min'] <= AFR < rule['max']:
-                    coeff = rule['coefficient']
-                    tag_level = 'WARNING' if coeff <= 0.7 else 'NOTICE'
-                    alert_msg = f'⛔ {rule["label"]} (年化 {AFR:.1f} 次)'
-                    description = f'年化失格频率{AFR:.1f}次/年，{employee_type}阈值{rule["min"]}-{rule["max"]}，需要重点关注。'
-                    matched = True
-                    break
-            else:
-                # 只有min的规则（最高阈值）
-                if AFR >= rule['min']:
-                    coeff = rule['coefficient']
-                    tag_level = 'CRITICAL'
-                    alert_msg = f'❌ {rule["label"]} (年化 {AFR:.1f} 次)'
-                    description = f'当前周期{duration_days}天内失格{fail_count}次，年化等效{AFR:.1f}次/年，超过{employee_type}红线阈值{rule["min"]}次/年。'
-                    matched = True
-                    break
-
-        if not matched:
+        # 查分段表取命中的AFR阈值规则
+        afr_bounds, afr_rules = _compile_afr_thresholds(afr_thresholds)
+        rule = afr_rules[bisect_right(afr_bounds, AFR)]
+
+        if rule is not None and 'max' in rule:
+            # 有max的规则（中间范围）
+            coeff = rule['coefficient']
+            tag_level = 'WARNING' if coeff <= 0.7 else 'NOTICE'
+            alert_msg = f'⛔ {rule["label"]} (年化 {AFR:.1f} 次)'
+            description = f'年化失格频率{AFR:.1f}次/年，{employee_type}阈值{rule["min"]}-{rule["max"]}，需要重点关注。'
+        elif rule is not None:
+            # 只有min的规则（最高阈值）
+            coeff = rule['coefficient']
+            tag_level = 'CRITICAL'
+            alert_msg = f'❌ {rule["label"]} (年化 {AFR:.1f} 次)'
+            description = f'当前周期{duration_days}天内失格{fail_count}次，年化等效{AFR:.1f}次/年，超过{employee_type}红线阈值{rule["min"]}次/年。'
+        else:
             # AFR < 最低阈值
             coeff = 1.0
             tag_level = 'NORMAL'
@@ -642,16 +1028,7 @@ def calculate_training_score_with_penalty(
     final_score = base_score * coeff
 
     # 映射到前端颜色
-    if tag_level == 'CRITICAL':
-        status_color = 'RED'
-    elif tag_level == 'HIGH_RISK':
-        status_color = 'PURPLE'
-    elif tag_level == 'WARNING':
-        status_color = 'ORANGE'
-    elif tag_level == 'NOTICE':
-        status_color = 'YELLOW'
-    else:
-        status_color = 'GREEN'
+    status_color = TRAINING_LEVEL_COLORS.get(tag_level, 'GREEN')
 
     return {
         'radar_score': round(final_score, 1),
@@ -777,48 +1154,41 @@ def calculate_learning_ability_longterm(score_list: List[float], config: dict =
             'tier': 评级（上升/稳定/下降）
         }
     """
-    import numpy as np
-
     # 读取配置
     if config is None:
-        from services.algorithm_config_service import AlgorithmConfigService
         config = AlgorithmConfigService.get_active_config()
 
-    learning_config = config.get('learning', {
-        'potential_threshold': 0.5,
-        'decline_threshold': -0.2,
-        'decline_penalty': 0.8,
-        'slope_amplifier': 10
-    })
+    learning_config = config.get('learning', DEFAULT_LEARNING_CONFIG)
 
     # Step 1: 数据验证
     if not score_list or len(score_list) < 2:
-        return {
-            'learning_score': 0,
-            'slope': 0,
-            'average_score': 0,
-            'status_color': 'GRAY',
-            'alert_tag': '⚪ 数据不足',
-            'tier': '数据不足'
-        }
+        return dict(LEARNING_INSUFFICIENT_RESULT)
 
     # Step 2: 计算线性回归斜率（最小二乘法）
+    # 月份数很少（通常不超过12个），纯 Python 计算比构造 NumPy 数组更快；
+    # x = 0..n-1 为等差数列，Σx 与 Σx² 直接用求和公式
     n = len(score_list)
-    x = np.arange(n)
-    y = np.array(score_list)
+    sum_x = n * (n - 1) // 2
+    sum_x2 = (n - 1) * n * (2 * n - 1) // 6
+    sum_y = 0.0
+    sum_xy = 0.0
+    for i, value in enumerate(score_list):
+        sum_y += value
+        sum_xy += i * value
 
     # 计算斜率 k = (n*Σxy - Σx*Σy) / (n*Σx² - (Σx)²)
-    sum_x = np.sum(x)
-    sum_y = np.sum(y)
-    sum_xy = np.sum(x * y)
-    sum_x2 = np.sum(x * x)
-
-    k = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x) if (n * sum_x2 - sum_x * sum_x) != 0 else 0
+    denominator = n * sum_x2 - sum_x * sum_x
+    k = (n * sum_xy - sum_x * sum_y) / denominator if denominator != 0 else 0
 
     # Step 3: 计算平均分
-    average_score = float(np.mean(y))
+    average_score = sum_y / n
+
+    return _build_learning_result(k, average_score, learning_config)
 
-    # Step 4: 读取配置参数（含 None 检查）
+
+def _build_learning_result(k: float, average_score: float, learning_config: dict) -> Dict:
+    """根据趋势斜率和历史平均分生成学习能力评分结果"""
+    # 读取配置参数（含 None 检查）
     slope_amplifier = learning_config.get('slope_amplifier', 10)
     if slope_amplifier is None:
         slope_amplifier = 10
@@ -835,7 +1205,7 @@ def calculate_learning_ability_longterm(score_list: List[float], config: dict =
     if decline_penalty is None:
         decline_penalty = 0.8
 
-    # Step 5: 计算最终得分（简化版：历史平均分 + 趋势加成）
+    # 计算最终得分（简化版：历史平均分 + 趋势加成）
     base_score = average_score
     trend_bonus = k * slope_amplifier
     final_score = base_score + trend_bonus
@@ -843,7 +1213,7 @@ def calculate_learning_ability_longterm(score_list: List[float], config: dict =
     # 限制范围
     final_score = max(0, min(100, final_score))
 
-    # Step 6: 根据斜率判断趋势和状态
+    # 根据斜率判断趋势和状态
     if k > potential_threshold:
         tier = '📈 上升趋势'
         status_color = 'GREEN'
@@ -857,7 +1227,7 @@ def calculate_learning_ability_longterm(score_list: List[float], config: dict =
         status_color = 'ORANGE'
         alert_tag = f'表现下滑（平均分{average_score:.1f}，斜率{k:.2f}）'
 
-    # Step 7: 返回结果
+    # 返回结果
     return {
         'learning_score': round(final_score, 1),
         'slope': round(k, 3),
@@ -868,6 +1238,67 @@ def calculate_learning_ability_longterm(score_list: List[float], config: dict =
     }
 
 
+def calculate_learning_ability_longterm_batch(score_matrix, config: dict = None) -> List[Dict]:
+    """
+    学习能力评分（批量） - 对一批员工一次性做线性回归
+
+    与 calculate_learning_ability_longterm 结果一致，但整批员工只做一次 NumPy 运算，
+    避免逐人调用时数组分配和函数分派的开销
+
+    Args:
+        score_matrix: N×T 的三维综合分矩阵，每行为一名员工按月排列的分数；
+                      月份数不足 T 的行在末尾以 NaN 填充
+        config: 算法配置（可选，默认从数据库读取）
+
+    Returns:
+        与 score_matrix 各行一一对应的结果列表，字段同 calculate_learning_ability_longterm
+    """
+    if config is None:
+        config = AlgorithmConfigService.get_active_config()
+
+    learning_config = config.get('learning', DEFAULT_LEARNING_CONFIG)
+
+    y = np.atleast_2d(np.asarray(score_matrix, dtype=float))
+    if y.size == 0:
+        return [dict(LEARNING_INSUFFICIENT_RESULT) for _ in range(len(y))]
+
+    mask = ~np.isnan(y)
+    counts = mask.sum(axis=1)
+    x = np.where(mask, np.arange(y.shape[1], dtype=float), 0.0)
+    y = np.where(mask, y, 0.0)
+
+    # 逐行计算斜率 k = (n*Σxy - Σx*Σy) / (n*Σx² - (Σx)²)
+    sum_x = x.sum(axis=1)
+    sum_y = y.sum(axis=1)
+    sum_xy = (x * y).sum(axis=1)
+    sum_x2 = (x * x).sum(axis=1)
+    denominator = counts * sum_x2 - sum_x * sum_x
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.where(denominator != 0, (counts * sum_xy - sum_x * sum_y) / denominator, 0.0)
+        averages = sum_y / counts
+
+    results = []
+    for n, k, average_score in zip(counts.tolist(), slopes, averages.tolist()):
+        if n < 2:
+            results.append(dict(LEARNING_INSUFFICIENT_RESULT))
+        else:
+            results.append(_build_learning_result(k, average_score, learning_config))
+    return results
+
+
+def _days_since(value: Optional[str], today_ordinal: int) -> float:
+    """距今天数（YYYY-MM-DD），为空或无法解析时返回 NaN"""
+    if not value:
+        return math.nan
+    try:
+        # _fast_date 也接受 YYYY-MM，这里只走完整日期的快速路径
+        parsed = (_fast_date(value) if len(value) == 10 else None) or datetime.strptime(value, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return math.nan
+    return today_ordinal - parsed.toordinal()
+
+
 def calculate_stability_score(
     birth_date: Optional[str],
     work_start_date: Optional[str],
@@ -916,105 +1347,33 @@ def calculate_stability_score(
             'tier': 评级 (资深稳定/经验丰富/新手期/高波动风险)
         }
     """
-    from datetime import datetime
-    import numpy as np
-
     # 读取配置
     if config is None:
-        from services.algorithm_config_service import AlgorithmConfigService
         config = AlgorithmConfigService.get_active_config()
 
-    stability_config = config.get('stability', {
-        'seniority_weights': {
-            'age': 0.15,
-            'working_years': 0.20,
-            'company_years': 0.25,
-            'cert_years': 0.20,
-            'solo_years': 0.20
-        },
-        'seniority_thresholds': {
-            'age_cap': 30,  # 年龄满30年算满分
-            'working_cap': 20,  # 工龄满20年算满分
-            'company_cap': 10,  # 司龄满10年算满分
-            'cert_cap': 10,  # 取证满10年算满分
-            'solo_cap': 10  # 单独驾驶满10年算满分
-        },
-        'dimension_weights': {
-            'seniority': 0.60,  # 资历维度权重
-            'volatility': 0.40   # 稳定性维度权重
-        },
-        'volatility_penalty': {
-            'low_threshold': 5.0,     # 低波动阈值（标准差）
-            'high_threshold': 15.0,   # 高波动阈值（标准差）
-            'max_penalty': 0.5        # 最大惩罚系数
-        }
-    })
-
-    now = datetime.now()
+    stability_config = config.get('stability', DEFAULT_STABILITY_CONFIG)
 
     # ==================== 维度1：资历评分（60%） ====================
     seniority_weights = stability_config['seniority_weights']
     seniority_thresholds = stability_config['seniority_thresholds']
 
-    # 1.1 年龄计算
-    age_years = 0
-    if birth_date:
-        try:
-            birth = datetime.strptime(birth_date, '%Y-%m-%d')
-            age_years = (now - birth).days / 365.25
-        except:
-            pass
-    age_score = min(100, (age_years / seniority_thresholds['age_cap']) * 100)
-
-    # 1.2 工龄计算
-    working_years = 0
-    if work_start_date:
-        try:
-            work_start = datetime.strptime(work_start_date, '%Y-%m-%d')
-            working_years = (now - work_start).days / 365.25
-        except:
-            pass
-    working_score = min(100, (working_years / seniority_thresholds['working_cap']) * 100)
-
-    # 1.3 司龄计算
-    company_years = 0
-    if entry_date:
-        try:
-            entry = datetime.strptime(entry_date, '%Y-%m-%d')
-            company_years = (now - entry).days / 365.25
-        except:
-            pass
-    company_score = min(100, (company_years / seniority_thresholds['company_cap']) * 100)
-
-    # 1.4 取证年限计算
-    cert_years = 0
-    if certification_date:
-        try:
-            cert = datetime.strptime(certification_date, '%Y-%m-%d')
-            cert_years = (now - cert).days / 365.25
-        except:
-            pass
-    cert_score = min(100, (cert_years / seniority_thresholds['cert_cap']) * 100)
-
-    # 1.5 单独驾驶年限计算
-    solo_years = 0
-    if solo_driving_date:
-        try:
-            solo = datetime.strptime(solo_driving_date, '%Y-%m-%d')
-            solo_years = (now - solo).days / 365.25
-        except:
-            pass
-    solo_score = min(100, (solo_years / seniority_thresholds['solo_cap']) * 100)
-
-    # 计算资历加权分数
-    seniority_score = (
-        age_score * seniority_weights['age'] +
-        working_score * seniority_weights['working_years'] +
-        company_score * seniority_weights['company_years'] +
-        cert_score * seniority_weights['cert_years'] +
-        solo_score * seniority_weights['solo_years']
+    # 1.1-1.5 年龄、工龄、司龄、取证年限、单独驾驶年限（日期为空或无效时按0年计）
+    today_ordinal = datetime.now().toordinal()
+    age_years, working_years, company_years, cert_years, solo_years = (
+        0 if math.isnan(days) else days / 365.25
+        for days in (
+            _days_since(value, today_ordinal)
+            for value in (birth_date, work_start_date, entry_date, certification_date, solo_driving_date)
+        )
     )
 
+    # 计算资历加权分数（各项封顶100分，按 STABILITY_SENIORITY_FIELDS 顺序累加）
+    seniority_score = 0
+    for years, (weight_key, cap_key) in zip(
+        (age_years, working_years, company_years, cert_years, solo_years), STABILITY_SENIORITY_FIELDS
+    ):
+        seniority_score += min(100, (years / seniority_thresholds[cap_key]) * 100) * seniority_weights[weight_key]
+
     # ==================== 维度2：表现稳定性评分（40%） ====================
     volatility_score = 100  # 默认满分（无波动数据时）
     volatility_coefficient = 0
@@ -1026,12 +1385,11 @@ def calculate_stability_score(
         for dimension in ['performance', 'safety', 'training']:
             scores = historical_scores.get(dimension, [])
             if scores and len(scores) >= 2:
-                std_dev = float(np.std(scores))
-                std_devs.append(std_dev)
+                std_devs.append(welford_std(scores))
 
         if std_devs:
             # 综合波动系数：使用平均标准差
-            volatility_coefficient = float(np.mean(std_devs))
+            volatility_coefficient = sum(std_devs) / len(std_devs)
 
             # 根据波动系数计算分数
             low_threshold = stability_config['volatility_penalty']['low_threshold']
@@ -1114,34 +1472,189 @@ def calculate_stability_score(
     }
 
 
-def _parse_date_string(value: Optional[str]) -> Optional[date]:
-    """解析日期字符串为date对象"""
-    if value is None or value == "":
-        return None
-    if isinstance(value, datetime):
-        return value.date()
-    if isinstance(value, date):
-        return value
-    raw = str(value).strip()
-    if not raw:
-        return None
-    fmts = [
-        "%Y-%m-%d",
-        "%Y/%m/%d",
-        "%Y.%m.%d",
-        "%Y%m%d",
-        "%Y-%m",
-        "%Y/%m",
-        "%Y.%m",
-        "%Y%m",
-    ]
-    for fmt in fmts:
-        try:
-            dt = datetime.strptime(raw, fmt)
-            if fmt in {"%Y-%m", "%Y/%m", "%Y.%m", "%Y%m"}:
-                dt = dt.replace(day=1)
-            return dt.date()
-        except ValueError:
+def calculate_stability_scores_batch(
+    employee_dates: List[tuple],
+    historical_scores_list: Optional[List[Optional[Dict[str, List[float]]]]] = None,
+    config: dict = None
+) -> Dict:
+    """
+    职业稳定性综合评分（批量） - 一次为多名员工评分
+
+    各员工的五个日期先解析为距今天数，组成 (N, 5) 矩阵后按列整批计算资历分和波动惩罚；
+    结果与逐个调用 calculate_stability_score 一致
+
+    Args:
+        employee_dates: 每名员工的 (birth_date, work_start_date, entry_date,
+                        certification_date, solo_driving_date) 元组，长度为 N
+        historical_scores_list: 每名员工过去一年的分数历史（格式同 calculate_stability_score），
+                                长度为 N，无历史数据的员工为 None
+        config: 算法配置（可选，默认从数据库读取）
+
+    Returns:
+        {
+            'stability_score': 最终稳定性分数数组,
+            'seniority_score': 资历维度分数数组,
+            'volatility_score': 稳定性维度分数数组,
+            'volatility': 综合波动系数数组,
+            'status_color': 状态颜色列表,
+            'alert_tag': 警示标签列表,
+            'tier': 评级列表
+        }
+    """
+    if config is None:
+        config = AlgorithmConfigService.get_active_config()
+
+    stability_config = config.get('stability', DEFAULT_STABILITY_CONFIG)
+    seniority_weights = stability_config['seniority_weights']
+    seniority_thresholds = stability_config['seniority_thresholds']
+    volatility_penalty = stability_config['volatility_penalty']
+    low_threshold = volatility_penalty['low_threshold']
+    high_threshold = volatility_penalty['high_threshold']
+    max_penalty = volatility_penalty['max_penalty']
+    dimension_weights = stability_config['dimension_weights']
+
+    n = len(employee_dates)
+    if historical_scores_list is None:
+        historical_scores_list = [None] * n
+
+    # ==================== 维度1：资历评分 ====================
+    # 缺失或无法解析的日期按 0 年计
+    today_ordinal = datetime.now().toordinal()
+    days = np.array(
+        [[_days_since(value, today_ordinal) for value in dates] for dates in employee_dates],
+        dtype=float
+    ).reshape(n, len(STABILITY_SENIORITY_FIELDS))
+    years = np.nan_to_num(days / 365.25)
+
+    # 逐列按原顺序加权累加，保证与单人计算的浮点结果一致
+    seniority_score = np.zeros(n)
+    for col, (weight_key, cap_key) in enumerate(STABILITY_SENIORITY_FIELDS):
+        column_score = np.minimum(100, (years[:, col] / seniority_thresholds[cap_key]) * 100)
+        seniority_score = seniority_score + column_score * seniority_weights[weight_key]
+
+    # ==================== 维度2：表现稳定性评分 ====================
+    # 各维度标准差的均值；has_volatility 标记至少一个维度有2个月以上的分数
+    volatility, has_volatility = volatility_batch([
+        [historical_scores.get(dimension) or [] for dimension in ('performance', 'safety', 'training')]
+        if historical_scores else []
+        for historical_scores in historical_scores_list
+    ])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        penalty = max_penalty * ((volatility - low_threshold) / (high_threshold - low_threshold))
+    volatility_score = np.select(
+        [~has_volatility | (volatility <= low_threshold), volatility >= high_threshold],
+        [100.0, 100 * (1 - max_penalty)],
+        100 * (1 - penalty),
+    )
+
+    # ==================== 综合评分 ====================
+    final_score = (
+        seniority_score * dimension_weights['seniority'] +
+        volatility_score * dimension_weights['volatility']
+    )
+
+    # ==================== 分级和状态判定 ====================
+    status_colors = []
+    alert_tags = []
+    tiers = []
+    company_years = years[:, 2].tolist()
+    cert_years = years[:, 3].tolist()
+    for company, cert, coefficient, final in zip(company_years, cert_years, volatility.tolist(), final_score.tolist()):
+        if company >= 5 and cert >= 5:
+            seniority_tier = "资深员工"
+        elif company >= 2 and cert >= 2:
+            seniority_tier = "经验员工"
+        elif cert >= 1:
+            seniority_tier = "新手期"
+        else:
+            seniority_tier = "新员工"
+
+        if coefficient == 0:
+            volatility_tier = "无历史数据"
+        elif coefficient <= low_threshold:
+            volatility_tier = "表现稳定"
+        elif coefficient <= high_threshold:
+            volatility_tier = "波动适中"
+        else:
+            volatility_tier = "高波动风险"
+
+        if final >= 85:
+            status_color, alert_tag = 'GREEN', '✅ 稳定可靠'
+        elif final >= 70:
+            status_color, alert_tag = 'GREEN', '✅ 基本稳定'
+        elif final >= 50:
+            status_color, alert_tag = 'ORANGE', '⚠️ 稳定性一般'
+        else:
+            status_color, alert_tag = 'RED', '⛔ 不稳定'
+        status_colors.append(status_color)
+        alert_tags.append(alert_tag)
+        tiers.append(f"{seniority_tier}·{volatility_tier}")
+
+    return {
+        'stability_score': np.array([round(value, 1) for value in final_score.tolist()], dtype=float),
+        'seniority_score': np.array([round(value, 1) for value in seniority_score.tolist()], dtype=float),
+        'volatility_score': np.array([round(value, 1) for value in volatility_score.tolist()], dtype=float),
+        'volatility': np.array([round(value, 2) for value in volatility.tolist()], dtype=float),
+        'status_color': status_colors,
+        'alert_tag': alert_tags,
+        'tier': tiers
+    }
+
+
+def _normalize_header(value) -> str:
+    """导入表头归一化：全角转半角并去除首尾空白"""
+    if value is None:
+        return ""
+    return unicodedata.normalize("NFKC", str(value)).strip()
+
+
+def _fast_date_variant(raw: str) -> Optional[date]:
+    """
+    快速解析 YYYY/MM/DD、YYYY.MM.DD、YYYYMMDD、YYYY/MM、YYYY.MM（年月格式取当月1号）
+
+    按固定位置切片转整数；格式不符或日期无效时返回 None，由调用方回退到 strptime。
+    6位纯数字不走快速路径：strptime 会先按 %Y%m%d 把 202012 解析为 2020-01-02
+    """
+    if not raw.isascii():
+        return None
+    length = len(raw)
+    try:
+        if length == 10 and raw[4] in "/." and raw[7] == raw[4]:
+            digits = raw[:4] + raw[5:7] + raw[8:]
+        elif length == 7 and raw[4] in "/.":
+            digits = raw[:4] + raw[5:]
+        elif length == 8:
+            digits = raw
+        else:
+            return None
+        if digits.isdigit():
+            return date(int(digits[:4]), int(digits[4:6]), int(digits[6:]) if len(digits) == 8 else 1)
+    except ValueError:
+        pass
+    return None
+
+
+def _parse_date_string(value: Optional[str]) -> Optional[date]:
+    """解析日期字符串为date对象"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    raw = str(value).strip()
+    if not raw:
+        return None
+    parsed = _fast_date(raw) or _fast_date_variant(raw)
+    if parsed:
+        return parsed
+    # 只尝试与首个分隔符匹配的格式（分隔符不同的格式不可能解析成功）
+    separator = next((ch for ch in raw if not ch.isdigit()), "")
+    for fmt in DATE_FORMATS_BY_SEPARATOR.get(separator, ()):
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
             continue
     return None
 
@@ -1152,81 +1665,125 @@ def _normalize_date_to_str(value: Optional[str]) -> Optional[str]:
     return parsed.strftime("%Y-%m-%d") if parsed else None
 
 
-def _calculate_age(birth_date: Optional[str]) -> Optional[int]:
-    """计算年龄"""
+def _calculate_age(birth_date: Optional[str], today: Optional[date] = None) -> Optional[int]:
+    """计算年龄（today 由调用方传入时复用，避免重复取当前日期）"""
     parsed = _parse_date_string(birth_date)
     if not parsed:
         return None
-    today = date.today()
+    if today is None:
+        today = date.today()
     years = today.year - parsed.year
     if (today.month, today.day) < (parsed.month, parsed.day):
         years -= 1
     return max(years, 0)
 
 
-def _calculate_years_since(date_str: Optional[str]) -> Optional[float]:
-    """计算从指定日期到今天的年数"""
+def _calculate_years_since(date_str: Optional[str], today: Optional[date] = None) -> Optional[float]:
+    """计算从指定日期到今天的年数（today 由调用方传入时复用）"""
     parsed = _parse_date_string(date_str)
     if not parsed:
         return None
-    today = date.today()
+    if today is None:
+        today = date.today()
     if parsed > today:
         return 0.0
     years = (today - parsed).days / 365.25
     return round(years, 1)
 
 
-def _serialize_person(row: sqlite3.Row) -> Dict:
-    """序列化人员数据，添加计算字段"""
+def _serialize_person(row: sqlite3.Row, today: Optional[date] = None) -> Dict:
+    """序列化人员数据，添加计算字段（所有年限共用同一个 today）"""
+    if today is None:
+        today = date.today()
     data = dict(row)
-    data["age"] = _calculate_age(data.get("birth_date"))
-    data["working_years"] = _calculate_years_since(data.get("work_start_date"))
-    data["tenure_years"] = _calculate_years_since(data.get("entry_date"))
+    data["age"] = _calculate_age(data.get("birth_date"), today)
+    data["working_years"] = _calculate_years_since(data.get("work_start_date"), today)
+    data["tenure_years"] = _calculate_years_since(data.get("entry_date"), today)
     return data
 
 
+def _serialize_personnel_rows(rows: List[sqlite3.Row]) -> List[Dict]:
+    """
+    批量序列化人员数据（结果与逐行 _serialize_person + calculate_years_from_date 一致）
+
+    每个不同的日期字符串只解析一次，年龄和各类年限按整列计算
+    """
+    result = [dict(zip(PERSONNEL_ROW_KEYS, row)) for row in rows]
+    if not result:
+        return result
+
+    today = date.today()
+    today_ordinal = today.toordinal()
+    parsed_cache = {}
+
+    def parse_column(field):
+        """返回 (日期序数, YYYYMMDD 整数)，无法解析的位置为 -1"""
+        ordinals = np.full(len(result), -1, dtype=np.int64)
+        ymd_keys = np.full(len(result), -1, dtype=np.int64)
+        for i, data in enumerate(result):
+            value = data.get(field)
+            parsed = parsed_cache.get(value)
+            if parsed is None:
+                parsed = parsed_cache[value] = _parse_date_string(value) or False
+            if parsed:
+                ordinals[i] = parsed.toordinal()
+                ymd_keys[i] = parsed.year * 10000 + parsed.month * 100 + parsed.day
+        return ordinals, ymd_keys
+
+    # 年龄：YYYYMMDD 相减后整除 10000 即为周岁
+    _, birth_keys = parse_column("birth_date")
+    today_key = today.year * 10000 + today.month * 100 + today.day
+    ages = np.maximum((today_key - birth_keys) // 10000, 0)
+    for data, key, age in zip(result, birth_keys.tolist(), ages.tolist()):
+        data["age"] = age if key >= 0 else None
+
+    # 工龄、司龄：晚于今天的日期按0年计
+    for field, target in (("work_start_date", "working_years"), ("entry_date", "tenure_years")):
+        ordinals, _ = parse_column(field)
+        days = today_ordinal - ordinals
+        years = np.where(days < 0, 0.0, days / 365.25)
+        for data, ordinal, value in zip(result, ordinals.tolist(), years.tolist()):
+            data[target] = round(value, 1) if ordinal >= 0 else None
+
+    # 取证、单独驾驶年限：标准 YYYY-MM-DD 走快速路径，其他格式交给 calculate_years_from_date
+    for field, target in (("certification_date", "certification_years"), ("solo_driving_date", "solo_driving_years")):
+        for data in result:
+            value = data.get(field)
+            if not value:
+                data[target] = None
+                continue
+            days = _days_since(value, today_ordinal)
+            data[target] = calculate_years_from_date(value) if math.isnan(days) else round(days / 365.25, 1)
+
+    return result
+
+
 def _build_personnel_charts(rows: List[Dict]) -> Dict:
     """构建人员统计图表数据"""
-    # 年龄分布
+    # 年龄分布（年龄为整数，side='left' 使边界年龄落入较低的一档）
     age_labels = ["25岁及以下", "26-35岁", "36-45岁", "46岁及以上"]
-    age_counts = [0, 0, 0, 0]
-    for row in rows:
-        age = row.get("age")
-        if age is None:
-            continue
-        if age <= 25:
-            age_counts[0] += 1
-        elif 26 <= age <= 35:
-            age_counts[1] += 1
-        elif 36 <= age <= 45:
-            age_counts[2] += 1
-        else:
-            age_counts[3] += 1
+    ages = np.fromiter(
+        (age for age in (row.get("age") for row in rows) if age is not None), dtype=np.int64
+    )
+    age_counts = np.bincount(
+        np.searchsorted(AGE_BUCKET_BOUNDS, ages, side="left"), minlength=len(age_labels)
+    ).tolist()
 
     # 学历分布
     education_counter = Counter(
         row.get("education") or "未填写" for row in rows
     )
-    education_labels = list(education_counter.keys())
-    education_counts = [education_counter[label] for label in education_labels]
+    education_labels = list(education_counter)
+    education_counts = list(education_counter.values())
 
-    # 工龄分布
+    # 工龄分布（左闭右开区间）
     tenure_labels = ["1年以下", "1-3年", "3-5年", "5-10年", "10年以上"]
-    tenure_counts = [0, 0, 0, 0, 0]
-    for row in rows:
-        tenure = row.get("tenure_years")
-        if tenure is None:
-            continue
-        if tenure < 1:
-            tenure_counts[0] += 1
-        elif 1 <= tenure < 3:
-            tenure_counts[1] += 1
-        elif 3 <= tenure < 5:
-            tenure_counts[2] += 1
-        elif 5 <= tenure < 10:
-            tenure_counts[3] += 1
-        else:
-            tenure_counts[4] += 1
+    tenures = np.fromiter(
+        (tenure for tenure in (row.get("tenure_years") for row in rows) if tenure is not None), dtype=float
+    )
+    tenure_counts = np.bincount(
+        np.searchsorted(TENURE_BUCKET_BOUNDS, tenures, side="right"), minlength=len(tenure_labels)
+    ).tolist()
 
     return {
         "age": {"labels": age_labels, "values": age_counts},
@@ -1237,10 +1794,17 @@ def _build_personnel_charts(rows: List[Dict]) -> Dict:
 
 # ==================== 数据库访问函数 ====================
 
+def _current_role():
+    """当前用户角色（同一请求内缓存在 g 上，只读取一次 session）"""
+    role = g.get('_role')
+    if role is None:
+        role = g._role = session.get('role', 'user')
+    return role
+
+
 def list_personnel():
     """列出所有可访问的人员"""
-    from flask import session
-    user_role = session.get('role', 'user')
+    user_role = _current_role()
 
     conn = get_db()
     cur = conn.cursor()
@@ -1286,24 +1850,7 @@ def list_personnel():
                 accessible_dept_ids,
             )
 
-    rows = cur.fetchall()
-    result = []
-    for row in rows:
-        person_dict = _serialize_person(row)
-        # 添加计算字段
-        if person_dict.get('certification_date'):
-            person_dict['certification_years'] = calculate_years_from_date(person_dict['certification_date'])
-        else:
-            person_dict['certification_years'] = None
-
-        if person_dict.get('solo_driving_date'):
-            person_dict['solo_driving_years'] = calculate_years_from_date(person_dict['solo_driving_date'])
-        else:
-            person_dict['solo_driving_years'] = None
-
-        result.append(person_dict)
-
-    return result
+    return _serialize_personnel_rows(cur.fetchall())
 
 
 def get_personnel(emp_no: str) -> Optional[Dict]:
@@ -1311,8 +1858,7 @@ def get_personnel(emp_no: str) -> Optional[Dict]:
     uid = require_user_id()
 
     # 🔒 权限检查: 非管理员需要验证是否有权访问该员工
-    from flask import session
-    user_role = session.get('role', 'user')
+    user_role = _current_role()
     if user_role != 'admin':
         if not validate_employee_access(emp_no):
             return None
@@ -1366,65 +1912,85 @@ def _sanitize_person_payload(data: Dict[str, Optional[str]]) -> Dict[str, Option
     return sanitized
 
 
-def upsert_personnel(data: Dict[str, Optional[str]]) -> bool:
-    """插入或更新人员信息"""
+def _personnel_upsert_params(data: Dict[str, Optional[str]]) -> Optional[list]:
+    """
+    清理并校验一条人员数据，返回 PERSONNEL_UPSERT_SQL 的参数（created_by 位置留空由调用方填入）
+
+    工号、姓名、部门缺失或部门ID无效时返回None
+    """
     payload = _sanitize_person_payload(data)
     emp_no = payload.get("emp_no")
     name = payload.get("name")
     department_id = payload.get("department_id")
 
     if not emp_no or not name:
-        return False
+        return None
 
-    # department_id是必填项，如果没有提供则返回False
+    # department_id是必填项，如果没有提供则返回None
     if department_id is None or department_id == "":
-        return False
+        return None
 
     # 转换department_id为整数
     try:
         department_id = int(department_id)
     except (ValueError, TypeError):
+        return None
+
+    return [emp_no, name, None, department_id] + [payload.get(col) for col in PERSONNEL_UPSERT_EXTRA_COLUMNS]
+
+
+def upsert_personnel(data: Dict[str, Optional[str]]) -> bool:
+    """插入或更新人员信息"""
+    values = _personnel_upsert_params(data)
+    if values is None:
         return False
 
-    uid = require_user_id()
+    values[2] = require_user_id()
     conn = get_db()
     cur = conn.cursor()
-
-    # 注意: UNIQUE约束是emp_no（全局唯一），数据以department_id为基准隔离
-    columns = ["emp_no", "name", "created_by", "department_id"] + [col for col in PERSONNEL_DB_COLUMNS if col != "department_id"]
-    values = [emp_no, name, uid, department_id] + [payload.get(col) for col in PERSONNEL_DB_COLUMNS if col != "department_id"]
-    update_clause = ", ".join(
-        f"{col}=excluded.{col}" for col in ["name", "department_id"] + [col for col in PERSONNEL_DB_COLUMNS if col != "department_id"]
-    )
-    cur.execute(
-        f"""
-        INSERT INTO employees ({", ".join(columns)})
-        VALUES ({", ".join("?" for _ in columns)})
-        ON CONFLICT(emp_no) DO UPDATE SET {update_clause}
-        """,
-        values,
-    )
+    cur.execute(PERSONNEL_UPSERT_SQL, values)
     conn.commit()
     return True
 
 
 def bulk_import_personnel(records: List[Dict[str, Optional[str]]]) -> int:
-    """批量导入人员信息"""
-    imported = 0
-    for record in records:
-        if upsert_personnel(record):
-            imported += 1
-    return imported
+    """
+    批量导入人员信息
+
+    先在内存中清理校验全部记录，再用一次 executemany 在同一事务中写入并只提交一次；
+    写入失败时整批回滚
+
+    Returns:
+        成功导入/更新的记录数（未通过校验的记录不计入）
+    """
+    rows = [values for values in map(_personnel_upsert_params, records) if values is not None]
+    if not rows:
+        return 0
+
+    uid = require_user_id()
+    for values in rows:
+        values[2] = uid
+
+    conn = get_db()
+    cur = conn.cursor()
+    try:
+        cur.executemany(PERSONNEL_UPSERT_SQL, rows)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    # SQLite 对 upsert 的 rowcount 统计不可靠，直接按写入的记录数返回
+    return len(rows)
 
 
 def update_personnel_field(emp_no: str, field: str, value: Optional[str]) -> bool:
     """更新人员的单个字段"""
-    if field not in {"name", *PERSONNEL_DB_COLUMNS}:
+    sql = PERSONNEL_UPDATE_FIELD_SQL.get(field)
+    if sql is None:
         return False
 
     # 🔒 权限检查: 非管理员需要验证是否有权修改该员工
-    from flask import session
-    user_role = session.get('role', 'user')
+    user_role = _current_role()
     if user_role != 'admin':
         if not validate_employee_access(emp_no):
             return False
@@ -1433,14 +1999,7 @@ def update_personnel_field(emp_no: str, field: str, value: Optional[str]) -> boo
     uid = require_user_id()
     conn = get_db()
     cur = conn.cursor()
-    cur.execute(
-        f"""
-        UPDATE employees
-        SET {field} = ?
-        WHERE emp_no=?
-        """,
-        (payload.get(field), emp_no),
-    )
+    cur.execute(sql, (payload.get(field), emp_no))
     conn.commit()
     affected = cur.rowcount > 0
     return affected
@@ -1451,8 +2010,7 @@ def delete_employee(emp_no):
     uid = require_user_id()
 
     # 🔒 权限检查: 非管理员需要验证是否有权删除该员工
-    from flask import session
-    user_role = session.get('role', 'user')
+    user_role = _current_role()
     if user_role != 'admin':
         if not validate_employee_access(emp_no):
             return False
@@ -1472,8 +2030,7 @@ def index():
     """人员管理首页"""
     if request.method == 'POST':
         # 🔒 权限检查: 创建/更新员工需要管理员权限
-        from flask import session
-        user_role = session.get('role', 'user')
+        user_role = _current_role()
         if user_role not in ['admin', 'manager']:
             flash("您没有权限执行此操作，需要部门管理员或系统管理员权限", "danger")
             return redirect(url_for("personnel.index"))
@@ -1509,9 +2066,9 @@ def index():
 @login_required
 def template():
     """下载人员导入模板"""
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.title = "人员导入模板"
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("人员导入模板")
+    sheet.freeze_panes = "A2"
 
     headers = [field["label"] for field in PERSONNEL_FIELD_SCHEME]
     sheet.append(headers)
@@ -1533,8 +2090,6 @@ def template():
     }
     sheet.append([examples.get(field["name"], "") for field in PERSONNEL_FIELD_SCHEME])
 
-    sheet.freeze_panes = "A2"
-
     buffer = BytesIO()
     workbook.save(buffer)
     buffer.seek(0)
@@ -1560,68 +2115,70 @@ def import_data():
         flash("目前仅支持上传 .xlsx 文件。", "warning")
         return redirect(url_for("personnel.index"))
     try:
-        workbook = load_workbook(file_obj, data_only=True)
+        # 只读模式流式读取行数据，不在内存中构建全部单元格对象
+        workbook = load_workbook(file_obj, read_only=True, data_only=True)
         sheet = workbook.active
     except Exception as exc:  # noqa: BLE001
         flash(f"无法读取 Excel 文件：{exc}", "danger")
         return redirect(url_for("personnel.index"))
 
-    header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), None)
-    if not header_row:
-        flash("Excel 文件为空。", "warning")
-        return redirect(url_for("personnel.index"))
+    # 只读模式会保持文件句柄打开，任何退出路径都要关闭工作簿
+    try:
+        header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), None)
+        if not header_row:
+            flash("Excel 文件为空。", "warning")
+            return redirect(url_for("personnel.index"))
 
-    headers = [str(cell).strip() if cell is not None else "" for cell in header_row]
-    field_map = [PERSONNEL_IMPORT_HEADER_MAP.get(header) for header in headers]
+        field_map = [IMPORT_HEADER_FIELDS.get(_normalize_header(cell)) for cell in header_row]
 
-    if "emp_no" not in field_map or "name" not in field_map:
-        flash('Excel 首行必须包含"工号"与"姓名"列。', "warning")
-        return redirect(url_for("personnel.index"))
+        if "emp_no" not in field_map or "name" not in field_map:
+            flash('Excel 首行必须包含"工号"与"姓名"列。', "warning")
+            return redirect(url_for("personnel.index"))
 
-    # 获取部门映射，用于处理Excel中的部门信息
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT id, name FROM departments")
-    dept_name_map = {row['name']: row['id'] for row in cur.fetchall()}
+        # 获取部门映射，用于处理Excel中的部门信息
+        dept_name_map = get_department_name_map()
 
-    # 获取当前用户可访问的部门ID列表（用于权限验证）
-    accessible_dept_ids = get_accessible_department_ids()
+        # 获取当前用户可访问的部门ID列表（用于权限验证）
+        accessible_dept_ids = get_accessible_department_ids()
 
-    records: List[Dict[str, Optional[str]]] = []
-    skipped_no_dept = 0
-    skipped_no_permission = 0
+        records: List[Dict[str, Optional[str]]] = []
+        skipped_no_dept = 0
+        skipped_no_permission = 0
 
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        if not row or all(cell is None or str(cell).strip() == "" for cell in row):
-            continue
-        record: Dict[str, Optional[str]] = {}
-        for idx, cell in enumerate(row):
-            field = field_map[idx] if idx < len(field_map) else None
-            if not field:
+        # 表头只解析一次：记录需要读取的列下标及对应字段
+        active_columns = [(idx, field) for idx, field in enumerate(field_map) if field]
+
+        for row in sheet.iter_rows(min_row=2, values_only=True):
+            if not row or all(cell is None or str(cell).strip() == "" for cell in row):
                 continue
-            record[field] = cell
-            
-        # 处理部门ID：支持名称匹配
-        raw_dept = record.get('department_id')
-        final_dept_id = None
-
-        if raw_dept:
-            raw_dept_str = str(raw_dept).strip()
-            if raw_dept_str.isdigit():
-                final_dept_id = int(raw_dept_str)
-            elif raw_dept_str in dept_name_map:
-                final_dept_id = dept_name_map[raw_dept_str]
-
-        if not final_dept_id:
-            # 未填写部门或部门无效
-            skipped_no_dept += 1
-        elif final_dept_id not in accessible_dept_ids:
-            # 部门存在但无权限导入到该部门
-            skipped_no_permission += 1
-        else:
-            # 部门有效且有权限
-            record['department_id'] = str(final_dept_id)
-            records.append(record)
+            row_len = len(row)
+            record: Dict[str, Optional[str]] = {
+                field: row[idx] for idx, field in active_columns if idx < row_len
+            }
+
+            # 处理部门ID：支持名称匹配
+            raw_dept = record.get('department_id')
+            final_dept_id = None
+
+            if raw_dept:
+                raw_dept_str = str(raw_dept).strip()
+                if raw_dept_str.isdigit():
+                    final_dept_id = int(raw_dept_str)
+                elif raw_dept_str in dept_name_map:
+                    final_dept_id = dept_name_map[raw_dept_str]
+
+            if not final_dept_id:
+                # 未填写部门或部门无效
+                skipped_no_dept += 1
+            elif final_dept_id not in accessible_dept_ids:
+                # 部门存在但无权限导入到该部门
+                skipped_no_permission += 1
+            else:
+                # 部门有效且有权限
+                record['department_id'] = str(final_dept_id)
+                records.append(record)
+    finally:
+        workbook.close()
 
     if not records:
         msg_parts = ["未导入任何数据。"]
@@ -1739,27 +2296,33 @@ def batch_delete():
         return redirect(url_for("personnel.index"))
 
     uid = require_user_id()
-    from flask import session
-    user_role = session.get('role', 'user')
+    user_role = _current_role()
+    emp_nos = [emp_no.strip() for emp_no in emp_nos if emp_no.strip()]
 
     conn = get_db()
     cur = conn.cursor()
 
-    deleted_count = 0
-    skipped_count = 0
-    for emp_no in emp_nos:
-        emp_no = emp_no.strip()
-        if emp_no:
-            # 🔒 权限检查: 非管理员需要验证是否有权删除每个员工
-            if user_role != 'admin':
-                if not validate_employee_access(emp_no):
-                    skipped_count += 1
-                    continue
-
-            cur.execute("DELETE FROM employees WHERE emp_no=?", (emp_no,))
-            if cur.rowcount > 0:
-                deleted_count += 1
+    allowed = set(emp_nos)
+    if user_role != 'admin' and allowed:
+        # 🔒 权限检查: 非管理员只能删除可访问部门的员工（一次查询取回所有员工的部门）
+        accessible_dept_ids = set(get_accessible_department_ids())
+        allowed = {
+            emp_no
+            for emp_no, dept_id in _fetch_rows_in(
+                cur, "SELECT emp_no, department_id FROM employees WHERE emp_no IN ({placeholders})", list(allowed)
+            )
+            if dept_id in accessible_dept_ids
+        }
+    # 重复提交的工号只删除一次，其余按无权删除计入跳过数（与逐个删除时一致）
+    skipped_count = len(emp_nos) - len(allowed) if user_role != 'admin' else 0
 
+    deleted_count = 0
+    # 按 SQL_IN_BATCH_SIZE 分批删除，避免超出 SQLite 绑定参数上限；各批在同一事务内，最后统一提交
+    delete_nos = list(allowed)
+    for i in range(0, len(delete_nos), SQL_IN_BATCH_SIZE):
+        batch = delete_nos[i:i + SQL_IN_BATCH_SIZE]
+        cur.execute(f"DELETE FROM employees WHERE emp_no IN ({','.join('?' * len(batch))})", batch)
+        deleted_count += cur.rowcount
     conn.commit()
 
     if deleted_count > 0:
@@ -1839,20 +2402,17 @@ def api_analytics_data():
     # 除了政治面貌统计，其他都只统计司机
     driver_rows = [row for row in rows if is_driver(row)]
 
-    # 1. 安全风险等级分布 - 按入司后单独驾驶年限分级
-    risk_levels = {"新手(<1年)": 0, "成长(1-3年)": 0, "熟练(3-5年)": 0, "资深(≥5年)": 0, "未知": 0}
-    for row in driver_rows:
-        solo_years = row.get("solo_driving_years")
-        if solo_years is None:
-            risk_levels["未知"] += 1
-        elif solo_years < 1:
-            risk_levels["新手(<1年)"] += 1
-        elif 1 <= solo_years < 3:
-            risk_levels["成长(1-3年)"] += 1
-        elif 3 <= solo_years < 5:
-            risk_levels["熟练(3-5年)"] += 1
-        else:
-            risk_levels["资深(≥5年)"] += 1
+    # 1. 安全风险等级分布 - 按入司后单独驾驶年限分级（左闭右开区间，年限缺失计入"未知"）
+    solo_years = np.fromiter(
+        (np.nan if row.get("solo_driving_years") is None else row["solo_driving_years"] for row in driver_rows),
+        dtype=float, count=len(driver_rows)
+    )
+    known_solo_years = solo_years[~np.isnan(solo_years)]
+    risk_counts = np.bincount(
+        np.searchsorted(RISK_LEVEL_BOUNDS, known_solo_years, side="right"), minlength=len(RISK_LEVEL_LABELS)
+    ).tolist()
+    risk_levels = dict(zip(RISK_LEVEL_LABELS, risk_counts))
+    risk_levels["未知"] = len(driver_rows) - len(known_solo_years)
 
     # 2. 部门战力雷达图 - 各部门的平均司龄、驾龄、取证年限（只统计司机）
     # 获取当前用户可访问的部门列表
@@ -1889,68 +2449,74 @@ def api_analytics_data():
             # 检查用户部门是否是底层部门
             if user_dept_id in dept_info and dept_info[user_dept_id]['has_children'] == 0:
                 # 用户是底层部门，只显示自己部门
-                display_dept_ids = [user_dept_id]
+                display_dept_ids = {user_dept_id}
             else:
                 # 用户是上级部门，显示所有可访问的底层部门
-                display_dept_ids = [dept_id for dept_id, info in dept_info.items() if info['has_children'] == 0]
+                display_dept_ids = {dept_id for dept_id, info in dept_info.items() if info['has_children'] == 0}
         else:
             # 管理员或无部门用户，显示所有底层部门
-            display_dept_ids = [dept_id for dept_id, info in dept_info.items() if info['has_children'] == 0]
-
-        # 按部门统计司机数据
-        dept_stats = {}
-        for row in driver_rows:
-            dept_id = row.get("department_id")
-            if dept_id not in display_dept_ids:
-                continue
-
-            if dept_id not in dept_stats:
-                dept_stats[dept_id] = {
-                    "name": dept_info.get(dept_id, {}).get('name', '未知部门'),
-                    "tenure_years": [],
-                    "solo_driving_years": [],
-                    "certification_years": []
-                }
-
-            if row.get("tenure_years") is not None:
-                dept_stats[dept_id]["tenure_years"].append(row["tenure_years"])
-            if row.get("solo_driving_years") is not None:
-                dept_stats[dept_id]["solo_driving_years"].append(row["solo_driving_years"])
-            if row.get("certification_years") is not None:
-                dept_stats[dept_id]["certification_years"].append(row["certification_years"])
+            display_dept_ids = {dept_id for dept_id, info in dept_info.items() if info['has_children'] == 0}
+
+        # 按部门统计司机数据：部门按首次出现顺序排列，各项年限按部门分组求和（bincount 按行顺序累加）
+        shown_rows = [row for row in driver_rows if row.get("department_id") in display_dept_ids]
+        team_dept_ids = list(dict.fromkeys(row["department_id"] for row in shown_rows))
+        dept_slot = {dept_id: i for i, dept_id in enumerate(team_dept_ids)}
+        dept_idx = np.fromiter(
+            (dept_slot[row["department_id"]] for row in shown_rows), dtype=np.intp, count=len(shown_rows)
+        )
+        member_counts = np.bincount(dept_idx, minlength=len(team_dept_ids)).tolist()
 
-        team_power = []
-        for dept_id, stats in dept_stats.items():
-            avg_tenure = sum(stats["tenure_years"]) / len(stats["tenure_years"]) if stats["tenure_years"] else 0
-            avg_solo = sum(stats["solo_driving_years"]) / len(stats["solo_driving_years"]) if stats["solo_driving_years"] else 0
-            avg_cert = sum(stats["certification_years"]) / len(stats["certification_years"]) if stats["certification_years"] else 0
+        def dept_averages(field):
+            """各部门该年限字段的平均值（缺失值不计入，部门无数据时为 0）"""
+            values = np.fromiter(
+                (np.nan if row.get(field) is None else row[field] for row in shown_rows),
+                dtype=float, count=len(shown_rows)
+            )
+            known = ~np.isnan(values)
+            sums = np.bincount(dept_idx[known], weights=values[known], minlength=len(team_dept_ids)).tolist()
+            counts = np.bincount(dept_idx[known], minlength=len(team_dept_ids)).tolist()
+            return [total / count if count else 0 for total, count in zip(sums, counts)]
 
-            team_power.append({
-                "team": stats["name"],
+        team_power = [
+            {
+                "team": dept_info.get(dept_id, {}).get('name', '未知部门'),
                 "avg_tenure": round(avg_tenure, 1),
                 "avg_solo": round(avg_solo, 1),
                 "avg_cert": round(avg_cert, 1),
-                "member_count": len([r for r in driver_rows if r.get("department_id") == dept_id])
-            })
+                "member_count": member_count
+            }
+            for dept_id, avg_tenure, avg_solo, avg_cert, member_count in zip(
+                team_dept_ids,
+                dept_averages("tenure_years"),
+                dept_averages("solo_driving_years"),
+                dept_averages("certification_years"),
+                member_counts
+            )
+        ]
 
     # 3. 经验溢出分析 - 散点图数据（只统计司机）
-    experience_scatter = []
-    for row in driver_rows:
-        cert_years = row.get("certification_years")
-        solo_years = row.get("solo_driving_years")
-        if cert_years is not None and solo_years is not None:
-            experience_scatter.append({
-                "name": row.get("name"),
-                "emp_no": row.get("emp_no"),
-                "cert_years": round(cert_years, 1),
-                "solo_years": round(solo_years, 1),
-                # 分类：准师傅(取证久但单驾短)、资深师傅(两项都高)、新手
-                "category": _categorize_experience(cert_years, solo_years)
-            })
+    experience_rows = [
+        row for row in driver_rows
+        if row.get("certification_years") is not None and row.get("solo_driving_years") is not None
+    ]
+    # 分类：准师傅(取证久但单驾短)、资深师傅(两项都高)、新手（整列一次分类）
+    experience_categories = _categorize_experience(
+        np.array([row["certification_years"] for row in experience_rows], dtype=float),
+        np.array([row["solo_driving_years"] for row in experience_rows], dtype=float)
+    ).tolist()
+    experience_scatter = [
+        {
+            "name": row.get("name"),
+            "emp_no": row.get("emp_no"),
+            "cert_years": round(row["certification_years"], 1),
+            "solo_years": round(row["solo_driving_years"], 1),
+            "category": category
+        }
+        for row, category in zip(experience_rows, experience_categories)
+    ]
 
     # 4. 排班压力预警 - 籍贯分布（只统计司机）+ 政治面貌统计（统计所有人）
     hometown_stats = {}
-    political_stats = {"中共党员": 0, "中共预备党员": 0, "共青团员": 0, "群众": 0, "其它": 0}
 
     # 籍贯统计只统计司机
     for row in driver_rows:
@@ -1960,27 +2526,30 @@ def api_analytics_data():
         hometown_stats[location] = hometown_stats.get(location, 0) + 1
 
     # 政治面貌统计所有人员
-    for row in rows:
-        political = row.get("political_status") or "未填写"
-        if political in political_stats:
-            political_stats[political] += 1
-        else:
-            political_stats["其它"] += 1
+    political_counts = Counter(row.get("political_status") for row in rows)
+    political_stats = {label: political_counts[label] for label in POLITICAL_STATUS_LABELS}
+    political_stats["其它"] = len(rows) - sum(political_stats.values())
 
     # 5. 职业稳定性分析 - 司龄 vs 工龄散点图（只统计司机）
-    stability_scatter = []
-    for row in driver_rows:
-        tenure = row.get("tenure_years")
-        working = row.get("working_years")
-        if tenure is not None and working is not None:
-            stability_scatter.append({
-                "name": row.get("name"),
-                "emp_no": row.get("emp_no"),
-                "tenure": round(tenure, 1),
-                "working": round(working, 1),
-                # 分类：应届入职、社招新员工、社招老员工
-                "category": _categorize_stability(tenure, working)
-            })
+    stability_rows = [
+        row for row in driver_rows
+        if row.get("tenure_years") is not None and row.get("working_years") is not None
+    ]
+    # 分类：应届入职、社招新员工、社招老员工（整列一次分类）
+    stability_categories = _categorize_stability(
+        np.array([row["tenure_years"] for row in stability_rows], dtype=float),
+        np.array([row["working_years"] for row in stability_rows], dtype=float)
+    ).tolist()
+    stability_scatter = [
+        {
+            "name": row.get("name"),
+            "emp_no": row.get("emp_no"),
+            "tenure": round(row["tenure_years"], 1),
+            "working": round(row["working_years"], 1),
+            "category": category
+        }
+        for row, category in zip(stability_rows, stability_categories)
+    ]
 
     return jsonify({
         "risk_distribution": risk_levels,
@@ -1994,39 +2563,39 @@ def api_analytics_data():
     })
 
 
-def _categorize_experience(cert_years: float, solo_years: float) -> str:
-    """分类经验等级"""
-    if cert_years >= 5 and solo_years < 3:
-        return "准师傅"  # 取证很久但单驾时间较短
-    elif cert_years >= 5 and solo_years >= 5:
-        return "资深师傅"  # 两项指标都高
-    elif cert_years < 2:
-        return "新手"
-    else:
-        return "普通"
+def _categorize_experience(cert_years: np.ndarray, solo_years: np.ndarray) -> np.ndarray:
+    """分类经验等级（按列批量分类，条件按顺序取第一个满足的）"""
+    return np.select(
+        [
+            (cert_years >= 5) & (solo_years < 3),   # 准师傅：取证很久但单驾时间较短
+            (cert_years >= 5) & (solo_years >= 5),  # 资深师傅：两项指标都高
+            cert_years < 2,                         # 新手
+        ],
+        ["准师傅", "资深师傅", "新手"],
+        default="普通"
+    )
 
 
-def _categorize_stability(tenure: float, working: float) -> str:
-    """分类职业稳定性
+def _categorize_stability(tenure: np.ndarray, working: np.ndarray) -> np.ndarray:
+    """分类职业稳定性（按列批量分类）
 
     Args:
-        tenure: 司龄（在本单位工作年限）
-        working: 工龄（总工作年限）
+        tenure: 司龄（在本单位工作年限）数组
+        working: 工龄（总工作年限）数组
 
     Returns:
-        分类标签：应届入职、社招(新)、社招(老)
+        分类标签数组：应届入职、社招(新)、社招(老)
     """
     work_exp_diff = working - tenure  # 入职前的工作经验
 
-    if work_exp_diff < 1:
-        # 工龄和司龄相近，基本是应届生或毕业后很快入职
-        return "应届入职"
-    elif tenure < 3:
-        # 有工作经验，但在本单位时间不长
-        return "社招(新)"
-    else:
-        # 有工作经验，且在本单位时间较长
-        return "社招(老)"
+    return np.select(
+        [
+            work_exp_diff < 1,  # 工龄和司龄相近，基本是应届生或毕业后很快入职
+            tenure < 3,         # 有工作经验，但在本单位时间不长
+        ],
+        ["应届入职", "社招(新)"],
+        default="社招(老)"  # 有工作经验，且在本单位时间较长
+    )
 
 
 def _extract_location(hometown: str) -> str:
@@ -2045,67 +2614,35 @@ def _extract_location(hometown: str) -> str:
 
     hometown = hometown.strip()
 
-    # 河南省内的地级市和县
-    henan_cities = [
-        "郑州", "开封", "洛阳", "平顶山", "安阳", "鹤壁",
-        "新乡", "焦作", "濮阳", "许昌", "漯河", "三门峡",
-        "南阳", "商丘", "信阳", "周口", "驻马店", "济源"
-    ]
+    # 河南省内（写明"河南"，或包含河南的市/县名），提取市/县名
+    # 优先匹配县级市/县（更具体）；市/县的匹配结果同时用于判断是否为河南省内，不再单独扫描一遍
+    county = _first_listed_name(HENAN_COUNTY_MATCHER, hometown)
+    if county:
+        return f"河南·{county}"
 
-    # 常见县级市/县（可根据实际情况扩展）
-    henan_counties = [
-        "巩义", "荥阳", "新密", "新郑", "登封", "中牟",
-        "兰考", "杞县", "通许", "尉氏", "偃师", "孟津",
-        "新安", "栾川", "嵩县", "汝阳", "宜阳", "洛宁",
-        "伊川", "汝州", "舞钢", "林州", "卫辉", "辉县",
-        "沁阳", "孟州", "禹州", "长葛", "义马", "灵宝",
-        "永城", "项城", "邓州", "固始", "鹿邑", "新蔡"
-    ]
+    # 再匹配地级市
+    city = _first_listed_name(HENAN_CITY_MATCHER, hometown)
+    if city:
+        return f"河南·{city}"
 
-    # 检查是否为河南省内
-    is_henan = False
     if "河南" in hometown:
-        is_henan = True
-    else:
-        # 如果没有明确写"河南"，但包含河南的市/县名，也认为是河南
-        for city in henan_cities + henan_counties:
-            if city in hometown:
-                is_henan = True
-                break
-
-    if is_henan:
-        # 河南省内，提取市/县名
-        # 优先匹配县级市/县（更具体）
-        for county in henan_counties:
-            if county in hometown:
-                return f"河南·{county}"
-
-        # 再匹配地级市
-        for city in henan_cities:
-            if city in hometown:
-                return f"河南·{city}"
-
         # 如果只写了"河南"，返回"河南·未详"
         return "河南·未详"
 
-    else:
-        # 非河南省，提取省份
-        provinces = [
-            "北京", "天津", "上海", "重庆",
-            "河北", "山西", "辽宁", "吉林", "黑龙江",
-            "江苏", "浙江", "安徽", "福建", "江西", "山东",
-            "湖北", "湖南", "广东", "海南",
-            "四川", "贵州", "云南", "陕西", "甘肃",
-            "青海", "台湾", "内蒙古", "广西", "西藏",
-            "宁夏", "新疆", "香港", "澳门"
-        ]
+    # 非河南省，提取省份
+    province = _first_listed_name(PROVINCE_MATCHER, hometown)
+    if province:
+        return f"省外·{province}"
+
+    # 如果无法识别，返回"省外·其他"
+    return "省外·其他"
 
-        for province in provinces:
-            if hometown.startswith(province) or province in hometown:
-                return f"省外·{province}"
 
-        # 如果无法识别，返回"省外·其他"
-        return "省外·其他"
+def _first_listed_name(matcher, text: str) -> Optional[str]:
+    """返回 text 中出现的地名里在原列表中最靠前的一个（与按列表顺序逐个 in 检查结果一致）"""
+    pattern, rank = matcher
+    found = pattern.findall(text)
+    return min(found, key=rank.__getitem__) if found else None
 
 
 # ==================== 个人综合能力画像 API ====================
@@ -2121,8 +2658,6 @@ def capability_profile():
 @login_required
 def api_key_personnel_config():
     """API: 获取关键人员配置参数（供前端动态显示使用）"""
-    from services.algorithm_config_service import AlgorithmConfigService
-
     try:
         algo_config = AlgorithmConfigService.get_active_config()
         key_personnel_config = algo_config.get('key_personnel', {})
@@ -2145,13 +2680,264 @@ def api_key_personnel_config():
         })
 
 
+# 单条语句绑定参数上限（旧版 SQLite 为 999），IN 列表按此分批查询
+SQL_IN_BATCH_SIZE = 500
+
+
+def _fetch_rows_in(cur, query: str, keys: List, params: List = ()):
+    """
+    对 keys 分批执行含 IN ({placeholders}) 的查询，逐行产出结果
+
+    query 中 {placeholders} 位于其余参数之前，params 为每批都追加的参数；
+    直接迭代游标，不把整批结果物化为列表（调用方需在下一次使用该游标前消费完）
+    """
+    for i in range(0, len(keys), SQL_IN_BATCH_SIZE):
+        batch = keys[i:i + SQL_IN_BATCH_SIZE]
+        cur.execute(query.format(placeholders=','.join('?' * len(batch))), [*batch, *params])
+        yield from cur
+
+
+def _month_strings(start_dt: datetime, end_dt: datetime) -> List[str]:
+    """
+    start_dt 所在月到 end_dt 所在月（含）逐月的 'YYYY-MM' 列表，start_dt 晚于 end_dt 时为空
+
+    按 (年, 月) 整数递增，不做日期运算
+    """
+    if start_dt > end_dt:
+        return []
+    year, month = start_dt.year, start_dt.month
+    last = (end_dt.year, end_dt.month)
+    months = []
+    while (year, month) <= last:
+        months.append(f"{year:04d}-{month:02d}")
+        month += 1
+        if month == 13:
+            year, month = year + 1, 1
+    return months
+
+
+@lru_cache(maxsize=1024)
+def _month_start(month_str: str) -> datetime:
+    """
+    'YYYY-MM' 当月1号零点，等价于 datetime.strptime(month_str + '-01', '%Y-%m-%d')
+
+    标准格式走 _fast_date（date.fromisoformat）快速路径，其余（如 '2025-1'）回退到 strptime，非法时同样抛 ValueError；
+    同一请求内反复解析相同的筛选月份，按原文缓存
+    """
+    parsed = _fast_date(month_str) if len(month_str) == 7 else None
+    if parsed:
+        return datetime(parsed.year, parsed.month, 1)
+    return datetime.strptime(month_str + '-01', '%Y-%m-%d')
+
+
+@lru_cache(maxsize=4096)
+def _parse_ymd(value: str) -> datetime:
+    """
+    'YYYY-MM-DD' 当天零点，等价于 datetime.strptime(value, '%Y-%m-%d')
+
+    入职日期在员工之间大量重复，按原文缓存；标准格式走 _fast_date（date.fromisoformat）快速路径
+    """
+    parsed = _fast_date(value) if len(value) == 10 else None
+    if parsed:
+        return datetime(parsed.year, parsed.month, parsed.day)
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def _ym_parts(month_str: str) -> Tuple[int, int]:
+    """'YYYY-MM' 拆成 (年, 月)，供 year = ? AND month = ? 等值查询走 (emp_no, year, month) 唯一索引"""
+    year, month = month_str.split('-')
+    return int(year), int(month)
+
+
+def _students_fetch_range(start_date: Optional[str], end_date: Optional[str]):
+    """
+    人员列表评分用到的记录月份范围（筛选窗口、上月对比、长周期及稳定性月份列表的并集）
+
+    Returns:
+        (from_ym, to_ym)，None 表示该侧不设限
+    """
+    now = datetime.now()
+    lows, highs = [start_date], [end_date]
+    if start_date:
+        try:
+            start_dt = _month_start(start_date)
+            lows.append((start_dt - timedelta(days=1)).strftime('%Y-%m'))
+        except ValueError:
+            pass
+    if start_date and end_date:
+        try:
+            highs.append(_month_start(end_date).strftime('%Y-%m'))
+        except ValueError:
+            pass
+    else:
+        # 未同时指定起止月份时，长周期/稳定性取过去12个月
+        lows.append((now - timedelta(days=365)).strftime('%Y-%m'))
+        highs.append(now.strftime('%Y-%m'))
+    from_ym = min(lows) if start_date else None
+    to_ym = max(highs) if end_date else None
+    return from_ym, to_ym
+
+
+# 人员列表评分的批量预取语句：月份范围总是以参数绑定（不设限的一侧用哨兵值），
+# 同一批次大小下语句文本固定，可复用连接上的预编译语句缓存
+# 绩效分一律在 SQL 中 CAST 为 REAL，Python 侧直接使用，无需逐行 float()
+STUDENT_TRAINING_SQL = """
+    SELECT emp_no, strftime('%Y-%m', training_date),
+           score, is_qualified, is_disqualified, training_date
+    FROM training_records
+    WHERE emp_no IN ({placeholders})
+      AND strftime('%Y-%m', training_date) BETWEEN ? AND ?
+    ORDER BY id
+"""
+STUDENT_SAFETY_SQL = """
+    SELECT inspected_person, strftime('%Y-%m', inspection_date), assessment, inspection_date
+    FROM safety_inspection_records
+    WHERE inspected_person IN ({placeholders})
+      AND strftime('%Y-%m', inspection_date) BETWEEN ? AND ?
+    ORDER BY id
+"""
+STUDENT_PERFORMANCE_SQL = """
+    SELECT emp_no, (year || '-' || printf('%02d', month)), CAST(score AS REAL), grade
+    FROM performance_records
+    WHERE emp_no IN ({placeholders})
+      AND (year || '-' || printf('%02d', month)) BETWEEN ? AND ?
+    ORDER BY year, month
+"""
+# 综合档案单月（上月对比）查询，固定语句文本以复用 sqlite3 的语句缓存
+PROFILE_MONTH_PERFORMANCE_SQL = """
+    SELECT CAST(score AS REAL), grade FROM performance_records
+    WHERE emp_no = ? AND year = ? AND month = ?
+"""
+PROFILE_MONTH_SAFETY_SQL = """
+    SELECT assessment
+    FROM safety_inspection_records
+    WHERE inspected_person = ? AND strftime('%Y-%m', inspection_date) = ?
+"""
+PROFILE_MONTH_TRAINING_SQL = """
+    SELECT score, is_qualified, is_disqualified, training_date FROM training_records
+    WHERE emp_no = ? AND strftime('%Y-%m', training_date) = ?
+"""
+MONTH_RANGE_MIN = "0000-00"
+MONTH_RANGE_MAX = "9999-99"
+
+
+def _prefetch_student_records(cur, emp_nos: List[str], emp_names: List[str], from_ym, to_ym):
+    """
+    一次取回所有员工在月份范围内的培训、安全、绩效记录，按 (员工, 月份) 分桶
+
+    每个桶内保持表的插入顺序，与逐人逐月查询的结果一致；日期无法解析（月份为 NULL）的记录不取回
+
+    Returns:
+        (training, safety, performance)：
+        training[emp_no][ym] = [(score, is_qualified, is_disqualified, training_date), ...]
+        safety[name][ym] = [(assessment, inspection_date), ...]
+        performance[emp_no][ym] = (score, grade)，按年、月升序
+    """
+    month_range = [from_ym or MONTH_RANGE_MIN, to_ym or MONTH_RANGE_MAX]
+    # 结果行只做元组解包，用独立游标返回普通元组，省去 sqlite3.Row 的逐行开销
+    cur = cur.connection.cursor()
+    cur.row_factory = None
+
+    training = {}
+    for emp_no, ym, *record in _fetch_rows_in(cur, STUDENT_TRAINING_SQL, emp_nos, month_range):
+        training.setdefault(emp_no, {}).setdefault(ym, []).append(tuple(record))
+
+    safety = {}
+    names = list(dict.fromkeys(name for name in emp_names if name is not None))
+    for name, ym, assessment, inspection_date in _fetch_rows_in(cur, STUDENT_SAFETY_SQL, names, month_range):
+        safety.setdefault(name, {}).setdefault(ym, []).append((assessment, inspection_date))
+
+    performance = {}
+    for emp_no, ym, score, grade in _fetch_rows_in(cur, STUDENT_PERFORMANCE_SQL, emp_nos, month_range):
+        performance.setdefault(emp_no, {})[ym] = (score, grade)
+
+    return training, safety, performance
+
+
+def _prefetch_employee_months(cur, emp_no: str, emp_name: str, month_list: List[str]):
+    """
+    单名员工在 month_list 范围内的培训、安全、绩效记录，按月份分桶（综合档案逐月评分用）
+
+    Returns:
+        (training, safety, performance)：结构同 _prefetch_student_records 中单名员工的部分，
+        月份列表为空时均为空字典
+    """
+    if not month_list:
+        return {}, {}, {}
+    training, safety, performance = _prefetch_student_records(
+        cur, [emp_no], [emp_name], month_list[0], month_list[-1]
+    )
+    return training.get(emp_no, {}), safety.get(emp_name, {}), performance.get(emp_no, {})
+
+
+def _monthly_three_dim_scores(cur, emp_no: str, emp_name: str, month_list: List[str],
+                              cert_years: Optional[float], algo_config: dict) -> Dict[str, tuple]:
+    """
+    逐月计算单名员工的绩效、安全、培训分（综合档案的长周期学习能力与稳定性共用，每月只算一次）
+
+    整个月份范围的记录一次取回；安全分只对有扣分的月份按单月批量计算
+
+    Returns:
+        {month_str: (绩效分, 安全分, 培训分)}，按 month_list 顺序；
+        绩效/培训无记录、安全无扣分的月份对应分数为 None
+    """
+    training_by_month, safety_by_month, perf_by_month = _prefetch_employee_months(cur, emp_no, emp_name, month_list)
+    if not (training_by_month or safety_by_month or perf_by_month):
+        # 范围内没有任何记录（如新入职员工），各月三维分均为 None，无需逐月计算
+        return dict.fromkeys(month_list, (None, None, None))
+
+    perf_scores = []
+    training_scores = []
+    violation_months = []
+    violation_lists = []
+    for month_str in month_list:
+        month_perf_row = perf_by_month.get(month_str)
+        if month_perf_row:
+            perf_scores.append(calculate_performance_score_monthly(
+                month_perf_row[1] if month_perf_row[1] else 'B+',
+                month_perf_row[0] or 95,
+                algo_config
+            )['radar_value'])
+        else:
+            perf_scores.append(None)
+
+        # 按检查日期排序后提取扣分值
+        violations = []
+        for safety_row in sorted(safety_by_month.get(month_str, ()), key=lambda r: r[1]):
+            score = extract_score_from_assessment(safety_row[0])
+            if score > 0:
+                violations.append(float(score))
+        if violations:
+            violation_months.append(month_str)
+            violation_lists.append(violations)
+
+        month_training_rows = training_columns(training_by_month.get(month_str, []))
+        if month_training_rows:
+            training_scores.append(calculate_training_score_with_penalty(
+                month_training_rows,
+                30,  # 单月30天
+                cert_years,
+                algo_config
+            )['radar_score'])
+        else:
+            training_scores.append(None)
+
+    safety_scores = {}
+    if violation_lists:
+        safety_scores = dict(zip(
+            violation_months,
+            calculate_safety_scores_batch(violation_lists, 1, algo_config)['final_score'].tolist()
+        ))
+    return {
+        month_str: (perf_score, safety_scores.get(month_str), training_score)
+        for month_str, perf_score, training_score in zip(month_list, perf_scores, training_scores)
+    }
+
+
 @personnel_bp.route('/api/students-list')
 @login_required
 def api_students_list():
     """API: 获取人员列表及综合评分（带权限过滤和关键人员标记）"""
-    from datetime import datetime
-    from blueprints.safety import extract_score_from_assessment
-
     conn = get_db()
     cur = conn.cursor()
 
@@ -2171,111 +2957,134 @@ def api_students_list():
     current_month = datetime.now().strftime('%Y-%m')
 
     # 读取算法配置
-    from services.algorithm_config_service import AlgorithmConfigService
     algo_config = AlgorithmConfigService.get_active_config()
     score_weights = algo_config['comprehensive']['score_weights']
     key_personnel_config = algo_config['key_personnel']
-
-    # 兼容 sqlite3.Row 和 dict 两种类型的辅助函数
-    def safe_get(obj, key, default=None):
-        if isinstance(obj, dict):
-            return obj.get(key, default)
-        else:
-            try:
-                return obj[key] if obj[key] is not None else default
-            except (KeyError, IndexError):
-                return default
-
-    # 使用现有的 list_personnel() 函数获取权限过滤后的人员列表
+    # 权重与关键人员阈值在循环外取出一次
+    w_perf = score_weights.get('performance', 0.35)
+    w_safety = score_weights.get('safety', 0.30)
+    w_train = score_weights.get('training', 0.20)
+    w_stability = score_weights['stability']
+    w_learning = score_weights['learning']
+    comprehensive_threshold = key_personnel_config['comprehensive_threshold']
+    monthly_violation_threshold = key_personnel_config['monthly_violation_threshold']
+
+    # 使用现有的 list_personnel() 函数获取权限过滤后的人员列表（每行均为 dict，直接用 .get 取值）
     rows = list_personnel()
 
     # 应用部门和岗位筛选
     if department_filter:
-        rows = [r for r in rows if safe_get(r, 'department_name') == department_filter]
+        rows = [r for r in rows if r.get('department_name') == department_filter]
 
     if position_filter:
         position_filter_lower = position_filter.lower()
-        rows = [r for r in rows if position_filter_lower in (safe_get(r, 'position') or '').lower()]
+        rows = [r for r in rows if position_filter_lower in (r.get('position') or '').lower()]
+
+    # 批量预取所有员工的培训、安全、绩效记录，循环内只做字典查找
+    # （部门名称 list_personnel() 已经 JOIN 带出，无需再查 departments）
+    training_by_month, safety_by_month, perf_by_month = _prefetch_student_records(
+        cur,
+        [r.get('emp_no') for r in rows],
+        [r.get('name') for r in rows],
+        *_students_fetch_range(start_date, end_date),
+    )
+
+    def in_window(ym):
+        """月份是否落在筛选窗口内（与 SQL 中 strftime 比较一致，无法解析的日期不计入）"""
+        if start_date and (ym is None or ym < start_date):
+            return False
+        if end_date and (ym is None or ym > end_date):
+            return False
+        return True
+
+    # 长周期学习能力与稳定性的月份列表只取决于筛选条件，循环外构建一次
+    # （无法解析时为 None，循环内按原逻辑走各自的降级分支）
+    try:
+        if start_date and end_date:
+            period_start = _month_start(start_date)
+            period_end = _month_start(end_date)
+        else:
+            # 如果没有筛选，使用过去12个月
+            period_end = datetime.now()
+            period_start = period_end - timedelta(days=365)
+        learning_months = stability_months = _month_strings(period_start, period_end)
+    except ValueError:
+        learning_months = stability_months = None
+
+    # 统计周期天数（培训年化用）、月数（安全月均频次用）及是否月度模式同样只取决于筛选条件
+    is_monthly = (start_date == end_date) if start_date and end_date else True
+    if start_date and end_date and start_date == end_date:
+        duration_days = 30
+    elif start_date and end_date:
+        try:
+            start_dt = _month_start(start_date)
+            end_dt = _month_start(end_date)
+            end_year, end_month = int(end_date.split('-')[0]), int(end_date.split('-')[1])
+            last_day = calendar.monthrange(end_year, end_month)[1]
+            end_dt = end_dt.replace(day=last_day)
+            duration_days = max(1, (end_dt - start_dt).days + 1)
+        except (ValueError, IndexError):
+            duration_days = 30
+    else:
+        duration_days = 30
+
+    # 未指定开始月份时为 None，循环内按员工入职日期计算
+    period_months_active = None
+    if start_date:
+        try:
+            start = _month_start(start_date)
+            if end_date:
+                # 如果指定了日期范围，计算该范围的月数
+                end = _month_start(end_date)
+                period_months_active = max(1, int((end - start).days / 30) + 1)
+            else:
+                # 只指定了开始日期，从开始日期到现在
+                period_months_active = max(1, int((datetime.now() - start).days / 30) + 1)
+        except ValueError:
+            period_months_active = 1
+
+    # 某月没有任何记录时的三维综合分
+    idle_month_comprehensive = 0 * w_perf + 0 * w_safety + 0 * w_train
 
     students = []
+    # 每名员工的各维度分数：[绩效, 安全, 培训, 稳定性, 学习能力, 月均违规次数]
+    dimension_scores = []
+    # 待批量计算长周期学习能力的员工：(students 下标, 月度综合分列表)
+    pending_learning = []
+    # 待批量计算稳定性的员工：(students 下标, 五个日期, 历史分数)
+    pending_stability = []
     for row in rows:
-        emp_no = safe_get(row, 'emp_no')
-        emp_name = safe_get(row, 'name')
-        dept_id = safe_get(row, 'department_id')
+        emp_no = row.get('emp_no')
+        emp_name = row.get('name')
+        dept_id = row.get('department_id')
+
+        entry_date = row.get('entry_date')
 
         # 计算取证年限（用于培训和稳定性算法）
-        cert_date = safe_get(row, 'certification_date')
+        cert_date = row.get('certification_date')
         cert_years = calculate_years_from_date(cert_date) if cert_date else None
 
         # 获取部门名称
-        if dept_id:
-            cur.execute("SELECT name FROM departments WHERE id = ?", (dept_id,))
-            dept_row = cur.fetchone()
-            dept_name = dept_row[0] if dept_row else None
-        else:
-            dept_name = None
-
-        # 1. 培训能力（使用高级评分算法，应用日期筛选）
-        training_query = """
-            SELECT score, is_qualified, is_disqualified, training_date
-            FROM training_records
-            WHERE emp_no = ?
-        """
-        training_params = [emp_no]
-
-        if start_date:
-            training_query += " AND strftime('%Y-%m', training_date) >= ?"
-            training_params.append(start_date)
+        dept_name = row.get('department_name') if dept_id else None
 
-        if end_date:
-            training_query += " AND strftime('%Y-%m', training_date) <= ?"
-            training_params.append(end_date)
+        # 该员工按月分桶的记录
+        emp_training = training_by_month.get(emp_no, {})
+        emp_safety = safety_by_month.get(emp_name, {})
+        emp_perf = perf_by_month.get(emp_no, {})
+        has_records = bool(emp_training or emp_safety or emp_perf)
 
-        training_query += " ORDER BY training_date ASC"
-        cur.execute(training_query, training_params)
-        training_records_list = cur.fetchall()
-
-        # 计算统计周期天数
-        if start_date and end_date and start_date == end_date:
-            duration_days = 30
-        elif start_date and end_date:
-            try:
-                start_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-                end_dt = datetime.strptime(end_date + '-01', '%Y-%m-%d')
-                import calendar
-                end_year, end_month = int(end_date.split('-')[0]), int(end_date.split('-')[1])
-                last_day = calendar.monthrange(end_year, end_month)[1]
-                end_dt = end_dt.replace(day=last_day)
-                duration_days = max(1, (end_dt - start_dt).days + 1)
-            except:
-                duration_days = 30
-        else:
-            duration_days = 30
+        # 1. 培训能力（使用高级评分算法，应用日期筛选）
+        training_rows = [r for ym, month_rows in emp_training.items() if in_window(ym) for r in month_rows]
+        training_rows.sort(key=lambda r: r[3])  # 按培训日期升序
+        training_records_list = training_columns(training_rows)
 
         # 使用新的评分算法
         training_result = calculate_training_score_with_penalty(training_records_list, duration_days, cert_years, algo_config)
         training_score = training_result['radar_score']
 
-        # 2. 安全意识（使用双轨评分模型）
-        # 构建日期筛选条件
-        safety_query = """
-            SELECT assessment, inspection_date
-            FROM safety_inspection_records
-            WHERE inspected_person = ?
-        """
-        safety_params = [emp_name]
-
-        if start_date:
-            safety_query += " AND strftime('%Y-%m', inspection_date) >= ?"
-            safety_params.append(start_date)
-
-        if end_date:
-            safety_query += " AND strftime('%Y-%m', inspection_date) <= ?"
-            safety_params.append(end_date)
-
-        safety_query += " ORDER BY inspection_date ASC"
-        cur.execute(safety_query, safety_params)
-        safety_rows = cur.fetchall()
+        # 2. 安全意识（使用双轨评分模型，应用日期筛选）
+        safety_rows = [r for ym, month_rows in emp_safety.items() if in_window(ym) for r in month_rows]
+        safety_rows.sort(key=lambda r: r[1])  # 按检查日期升序
 
         # 收集所有违规扣分
         violations_list = []
@@ -2285,30 +3094,16 @@ def api_students_list():
             if score > 0:
                 violations_list.append(float(score))
 
-        # 计算统计周期月数
-        months_active = 1
-        if start_date and end_date:
-            # 如果指定了日期范围，计算该范围的月数
-            try:
-                start = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-                end = datetime.strptime(end_date + '-01', '%Y-%m-%d')
-                months_active = max(1, int((end - start).days / 30) + 1)
-            except:
-                months_active = 1
-        elif start_date:
-            # 只指定了开始日期，从开始日期到现在
-            try:
-                start = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-                months_active = max(1, int((datetime.now() - start).days / 30) + 1)
-            except:
-                months_active = 1
-        elif entry_date:
-            # 没有日期筛选，使用入职以来的月数
-            try:
-                entry = datetime.strptime(entry_date, '%Y-%m-%d')
-                months_active = max(1, int((datetime.now() - entry).days / 30))
-            except:
-                months_active = 1
+        # 计算统计周期月数（未指定开始月份时使用该员工入职以来的月数）
+        months_active = period_months_active
+        if months_active is None:
+            months_active = 1
+            if entry_date:
+                try:
+                    entry = _parse_ymd(entry_date)
+                    months_active = max(1, int((datetime.now() - entry).days / 30))
+                except ValueError:
+                    months_active = 1
 
         # 使用双轨评分模型
         safety_result = calculate_safety_score_dual_track(violations_list, months_active, algo_config)
@@ -2317,88 +3112,92 @@ def api_students_list():
         safety_alert_tag = safety_result['alert_tag']
 
         # 3. 工作绩效（使用双算法系统，应用日期筛选）
-        is_monthly = (start_date == end_date) if start_date and end_date else True
-
-        perf_query = """
-            SELECT score, grade, year, month
-            FROM performance_records
-            WHERE emp_no = ?
-        """
-        perf_params = [emp_no]
 
-        if start_date:
-            perf_query += " AND (year || '-' || printf('%02d', month)) >= ?"
-            perf_params.append(start_date)
+        # emp_perf 已按年、月升序，键即 SQL 拼好的 YYYY-MM
+        perf_months = [ym for ym in emp_perf if in_window(ym)]
 
-        if end_date:
-            perf_query += " AND (year || '-' || printf('%02d', month)) <= ?"
-            perf_params.append(end_date)
-
-        perf_query += " ORDER BY year, month"
-        cur.execute(perf_query, perf_params)
-        perf_rows = cur.fetchall()
-
-        if perf_rows:
-            if is_monthly and len(perf_rows) == 1:
+        if perf_months:
+            if is_monthly and len(perf_months) == 1:
                 # 月度快照算法
-                score, grade, year, month = perf_rows[0]
-                raw_score = float(score) if score else 95
+                score, grade = emp_perf[perf_months[0]]
+                raw_score = score or 95
                 grade = grade if grade else 'B+'
                 perf_result = calculate_performance_score_monthly(grade, raw_score, algo_config)
                 performance_score = perf_result['radar_value']
             else:
                 # 周期加权算法（带时间衰减）
-                grade_list = [row[1] if row[1] else 'B+' for row in perf_rows]
-                grade_dates = [f"{row[2]}-{row[3]:02d}" for row in perf_rows]  # 构建日期列表
-                perf_result = calculate_performance_score_period(grade_list, grade_dates, algo_config)
+                grade_list = [emp_perf[ym][1] or 'B+' for ym in perf_months]
+                perf_result = calculate_performance_score_period(grade_list, perf_months, algo_config)
                 performance_score = perf_result['radar_value']
         else:
             # 没有绩效数据
             performance_score = 0
 
+        # 长周期学习能力与稳定性共用的逐月绩效、培训分，每月只计算一次（None 表示该月无记录）；
+        # 计算出错时两处各自走降级分支
+        monthly_scores = []
+        monthly_scores_error = None
+        if stability_months is not None and has_records:
+            try:
+                for month_str in stability_months:
+                    month_perf_row = emp_perf.get(month_str)
+                    if month_perf_row:
+                        month_perf_score = calculate_performance_score_monthly(
+                            month_perf_row[1] if month_perf_row[1] else 'B+',
+                            month_perf_row[0] or 95,
+                            algo_config
+                        )['radar_value']
+                    else:
+                        month_perf_score = None
+
+                    month_training_rows = training_columns(emp_training.get(month_str, []))
+                    if month_training_rows:
+                        month_training_score = calculate_training_score_with_penalty(
+                            month_training_rows,
+                            30,  # 单月30天
+                            cert_years,
+                            algo_config
+                        )['radar_score']
+                    else:
+                        month_training_score = None
+
+                    monthly_scores.append((month_str, month_perf_score, month_training_score))
+            except Exception as e:
+                monthly_scores_error = e
+
         # 4. 学习能力评估（基于综合分的位置+动能算法）
         # 计算当前周期的综合三维分
         current_comprehensive = (
-            performance_score * score_weights.get('performance', 0.35) +
-            safety_score * score_weights.get('safety', 0.30) +
-            training_score * score_weights.get('training', 0.20)
+            performance_score * w_perf +
+            safety_score * w_safety +
+            training_score * w_train
         )
 
         # 计算上一周期的综合三维分
-        is_monthly = (start_date == end_date) if start_date and end_date else True
         previous_comprehensive = 0
         learning_result = None
 
         if is_monthly and start_date:
             # 月度模式：计算上月同期数据
             try:
-                current_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
+                current_dt = _month_start(start_date)
                 prev_dt = current_dt.replace(day=1) - timedelta(days=1)
                 prev_date = prev_dt.strftime('%Y-%m')
 
-                # 查询上月绩效
-                cur.execute("""
-                    SELECT score, grade FROM performance_records
-                    WHERE emp_no = ? AND (year || '-' || printf('%02d', month)) = ?
-                """, [emp_no, prev_date])
-                prev_perf_row = cur.fetchone()
+                # 上月绩效
+                prev_perf_row = emp_perf.get(prev_date)
                 if prev_perf_row:
                     prev_perf_score = calculate_performance_score_monthly(
                         prev_perf_row[1] if prev_perf_row[1] else 'B+',
-                        float(prev_perf_row[0]) if prev_perf_row[0] else 95,
+                        prev_perf_row[0] or 95,
                         algo_config
                     )['radar_value']
                 else:
                     prev_perf_score = 0
 
-                # 查询上月安全 (FIXED)
-                cur.execute("""
-                    SELECT assessment
-                    FROM safety_inspection_records
-                    WHERE inspected_person = ? AND strftime('%Y-%m', inspection_date) = ?
-                """, [emp_name, prev_date])
+                # 上月安全 (FIXED)
                 prev_violations = []
-                for safety_row in cur.fetchall():
+                for safety_row in emp_safety.get(prev_date, ()):
                     score = extract_score_from_assessment(safety_row[0])
                     if score > 0:
                         prev_violations.append(float(score))
@@ -2406,20 +3205,16 @@ def api_students_list():
                 prev_safety_score = prev_safety_result['final_score']
 
 
-                # 查询上月培训
-                cur.execute("""
-                    SELECT score, is_qualified, is_disqualified, training_date FROM training_records
-                    WHERE emp_no = ? AND strftime('%Y-%m', training_date) = ?
-                """, [emp_no, prev_date])
-                prev_training_rows = cur.fetchall()
+                # 上月培训
+                prev_training_rows = training_columns(emp_training.get(prev_date, []))
                 prev_training_result = calculate_training_score_with_penalty(prev_training_rows, duration_days=30, cert_years=cert_years, config=algo_config)
                 prev_training_score = prev_training_result['radar_score']  # 修复：使用正确的键名
 
                 # 计算上月综合分
                 previous_comprehensive = (
-                    prev_perf_score * score_weights.get('performance', 0.35) +
-                    prev_safety_score * score_weights.get('safety', 0.30) +
-                    prev_training_score * score_weights.get('training', 0.20)
+                    prev_perf_score * w_perf +
+                    prev_safety_score * w_safety +
+                    prev_training_score * w_train
                 )
 
                 # 使用月度算法
@@ -2430,103 +3225,53 @@ def api_students_list():
         else:
             # 长周期模式：查询过去N个月的综合分列表（与右侧API一致）
             try:
-                # 获取起止月份
-                if start_date and end_date:
-                    start_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-                    end_dt = datetime.strptime(end_date + '-01', '%Y-%m-%d')
+                if learning_months is None:
+                    raise ValueError(f"无法解析筛选月份: {start_date} ~ {end_date}")
+                if monthly_scores_error is not None:
+                    raise monthly_scores_error
+
+                # 逐月计算三维综合分（无任何记录的员工每月综合分都相同，直接填充）
+                if not has_records:
+                    score_list = [idle_month_comprehensive] * len(learning_months)
                 else:
-                    end_dt = datetime.now()
-                    start_dt = end_dt - timedelta(days=365)
-
-                # 构建月份列表
-                month_list = []
-                current_month = start_dt
-                while current_month <= end_dt:
-                    month_list.append(current_month.strftime('%Y-%m'))
-                    # 移动到下个月
-                    current_month = (current_month.replace(day=1) + timedelta(days=32)).replace(day=1)
-
-                # 循环查询每月三维分
-                score_list = []
-                for month_str in month_list:
-                    # 查询该月绩效
-                    cur.execute("""
-                        SELECT score, grade FROM performance_records
-                        WHERE emp_no = ? AND (year || '-' || printf('%02d', month)) = ?
-                    """, [emp_no, month_str])
-                    month_perf = cur.fetchone()
-                    if month_perf:
-                        month_perf_score = calculate_performance_score_monthly(
-                            month_perf[1] if month_perf[1] else 'B+',
-                            float(month_perf[0]) if month_perf[0] else 95,
-                            algo_config
-                        )['radar_value']
-                    else:
-                        month_perf_score = 0
-
-                    # 查询该月安全
-                    cur.execute("""
-                        SELECT assessment FROM safety_inspection_records
-                        WHERE inspected_person = ? AND strftime('%Y-%m', inspection_date) = ?
-                    """, [emp_name, month_str])
-                    month_safety_rows = cur.fetchall()
-                    if month_safety_rows:
-                        month_violations = []
-                        for safety_row in month_safety_rows:  # 修复：避免覆盖外层row变量
-                            score = extract_score_from_assessment(safety_row[0])
-                            if score > 0:
-                                month_violations.append(float(score))
-                        month_safety_result = calculate_safety_score_dual_track(month_violations, 1, algo_config)
-                        month_safety_score = month_safety_result['final_score']
-                    else:
-                        month_safety_score = 0
-
-                    # 查询该月培训
-                    cur.execute("""
-                        SELECT score, is_qualified, is_disqualified, training_date FROM training_records
-                        WHERE emp_no = ? AND strftime('%Y-%m', training_date) = ?
-                    """, [emp_no, month_str])
-                    month_training_rows = cur.fetchall()
-                    if month_training_rows:
-                        month_training_result = calculate_training_score_with_penalty(
-                            month_training_rows,
-                            30,  # 单月30天
-                            cert_years,
-                            algo_config
+                    score_list = []
+                    for month_str, month_perf_score, month_training_score in monthly_scores:
+                        # 该月安全
+                        month_safety_rows = emp_safety.get(month_str)
+                        if month_safety_rows:
+                            month_violations = []
+                            for safety_row in month_safety_rows:  # 修复：避免覆盖外层row变量
+                                score = extract_score_from_assessment(safety_row[0])
+                                if score > 0:
+                                    month_violations.append(float(score))
+                            month_safety_result = calculate_safety_score_dual_track(month_violations, 1, algo_config)
+                            month_safety_score = month_safety_result['final_score']
+                        else:
+                            month_safety_score = 0
+
+                        # 计算该月综合分（使用配置权重，无绩效/培训记录的月份计0分）
+                        month_comprehensive = (
+                            (0 if month_perf_score is None else month_perf_score) * w_perf +
+                            month_safety_score * w_safety +
+                            (0 if month_training_score is None else month_training_score) * w_train
                         )
-                        month_training_score = month_training_result['radar_score']
-                    else:
-                        month_training_score = 0
-
-                    # 计算该月综合分（使用配置权重）
-                    month_comprehensive = (
-                        month_perf_score * score_weights.get('performance', 0.35) +
-                        month_safety_score * score_weights.get('safety', 0.30) +
-                        month_training_score * score_weights.get('training', 0.20)
-                    )
-                    score_list.append(month_comprehensive)
+                        score_list.append(month_comprehensive)
 
-                # 使用长周期算法
+                # 使用长周期算法（循环结束后对所有员工批量回归）
                 if len(score_list) >= 2:
-                    print(f"DEBUG [api_students_list-员工{emp_no}]: 使用长周期算法，score_list长度={len(score_list)}, current_comprehensive={current_comprehensive:.1f}")
-                    learning_result = calculate_learning_ability_longterm(
-                        score_list,
-                        algo_config,
-                        current_three_dim_score=current_comprehensive
-                    )
-                    print(f"DEBUG [api_students_list-员工{emp_no}]: 学习能力分数={learning_result['learning_score']}")
+                    logger.debug("[api_students_list-员工%s]: 使用长周期算法，score_list长度=%d, current_comprehensive=%.1f",
+                                 emp_no, len(score_list), current_comprehensive)
+                    pending_learning.append((len(students), score_list))
                 else:
                     # 数据不足，使用月度算法
-                    print(f"DEBUG [api_students_list-员工{emp_no}]: 数据不足(len={len(score_list)})，降级到月度算法")
+                    logger.debug("[api_students_list-员工%s]: 数据不足(len=%d)，降级到月度算法", emp_no, len(score_list))
                     learning_result = calculate_learning_ability_monthly(
                         current_comprehensive,
                         current_comprehensive
                     )
-            except Exception as e:
+            except Exception:
                 # 异常情况：使用当前分
-                print(f"ERROR [api_students_list-员工{emp_no}]: 学习能力计算异常 - {type(e).__name__}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[api_students_list-员工%s]: 学习能力计算异常", emp_no)
                 learning_result = calculate_learning_ability_monthly(
                     current_comprehensive,
                     current_comprehensive
@@ -2539,63 +3284,34 @@ def api_students_list():
             learning_score = 0
 
         # 5. 稳定性（使用完整算法：资历60% + 表现稳定性40%）
-        entry_date = safe_get(row, 'entry_date')
-        birth_date = safe_get(row, 'birth_date')
-        work_start_date = safe_get(row, 'work_start_date')
-        cert_date = safe_get(row, 'certification_date')
-        solo_date = safe_get(row, 'solo_driving_date')
+        birth_date = row.get('birth_date')
+        work_start_date = row.get('work_start_date')
+        cert_date = row.get('certification_date')
+        solo_date = row.get('solo_driving_date')
 
         try:
-            # 重新定义日期范围以避免作用域问题
-            if start_date and end_date:
-                start_dt_stability = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-                end_dt_stability = datetime.strptime(end_date + '-01', '%Y-%m-%d')
-            else:
-                # 如果没有筛选，使用过去12个月
-                end_dt_stability = datetime.now()
-                start_dt_stability = end_dt_stability - timedelta(days=365)
-
-            # 构建月份列表
-            month_list = []
-            current_month = start_dt_stability.replace(day=1)
-            while current_month <= end_dt_stability:
-                month_list.append(current_month.strftime('%Y-%m'))
-                # 移动到下个月
-                if current_month.month == 12:
-                    current_month = current_month.replace(year=current_month.year + 1, month=1)
-                else:
-                    current_month = current_month.replace(month=current_month.month + 1)
+            if stability_months is None:
+                raise ValueError(f"无法解析筛选月份: {start_date} ~ {end_date}")
+
+            if monthly_scores_error is not None:
+                raise monthly_scores_error
 
-            # 查询每个月的三维分数
+            # 逐月汇总三维分数
             historical_scores = {
                 'performance': [],
                 'safety': [],
                 'training': []
             }
+            # 有违规记录的月份的扣分列表，循环结束后批量计算安全分（单月）
+            month_violation_lists = []
 
-            for month_str in month_list:
-                # 查询该月绩效分
-                cur.execute("""
-                    SELECT score, grade FROM performance_records
-                    WHERE emp_no = ? AND (year || '-' || printf('%02d', month)) = ?
-                """, [emp_no, month_str])
-                month_perf_row = cur.fetchone()
-                if month_perf_row:
-                    month_perf_score = calculate_performance_score_monthly(
-                        month_perf_row[1] if month_perf_row[1] else 'B+',
-                        float(month_perf_row[0]) if month_perf_row[0] else 95,
-                        algo_config
-                    )['radar_value']
+            for month_str, month_perf_score, month_training_score in monthly_scores:
+                # 该月绩效分
+                if month_perf_score is not None:
                     historical_scores['performance'].append(month_perf_score)
 
-                # 查询该月安全分
-                cur.execute("""
-                    SELECT assessment, inspection_date
-                    FROM safety_inspection_records
-                    WHERE inspected_person = ? AND strftime('%Y-%m', inspection_date) = ?
-                    ORDER BY inspection_date
-                """, [emp_name, month_str])
-                month_safety_rows = cur.fetchall()
+                # 该月安全分（按检查日期排序）
+                month_safety_rows = sorted(emp_safety.get(month_str, ()), key=lambda r: r[1])
                 if month_safety_rows:
                     violations = []
                     for safety_row in month_safety_rows:  # 修复：避免覆盖外层row变量
@@ -2604,93 +3320,115 @@ def api_students_list():
                             violations.append(float(score))
 
                     if violations:
-                        month_safety_result = calculate_safety_score_dual_track(
-                            violations,
-                            1,
-                            algo_config
-                        )
-                        historical_scores['safety'].append(month_safety_result['final_score'])
-
-                # 查询该月培训分
-                cur.execute("""
-                    SELECT score, is_qualified, is_disqualified, training_date FROM training_records
-                    WHERE emp_no = ? AND strftime('%Y-%m', training_date) = ?
-                """, [emp_no, month_str])
-                month_training_rows = cur.fetchall()
-                if month_training_rows:
-                    month_training_result = calculate_training_score_with_penalty(
-                        month_training_rows,
-                        30,
-                        cert_years,
-                        algo_config
-                    )
-                    historical_scores['training'].append(month_training_result['radar_score'])
+                        month_violation_lists.append(violations)
+
+                # 该月培训分
+                if month_training_score is not None:
+                    historical_scores['training'].append(month_training_score)
+
+            if month_violation_lists:
+                historical_scores['safety'] = calculate_safety_scores_batch(
+                    month_violation_lists, 1, algo_config
+                )['final_score'].tolist()
 
             # 调用综合稳定性算法
-            print(f"DEBUG [api_students_list-员工{emp_no}]: 稳定性算法参数:")
-            print(f"  - birth_date={birth_date}, work_start_date={work_start_date}")
-            print(f"  - entry_date={entry_date}, cert_date={cert_date}, solo_date={solo_date}")
-            print(f"  - historical_scores: perf={len(historical_scores['performance'])}条, safety={len(historical_scores['safety'])}条, training={len(historical_scores['training'])}条")
-            stability_result = calculate_stability_score(
-                birth_date=birth_date,
-                work_start_date=work_start_date,
-                entry_date=entry_date,
-                certification_date=cert_date,
-                solo_driving_date=solo_date,
-                historical_scores=historical_scores if any(historical_scores.values()) else None,
-                config=algo_config
-            )
-            stability_score = stability_result['stability_score']
-            print(f"DEBUG [api_students_list-员工{emp_no}]: 稳定性分数={stability_score:.1f}（综合算法）")
-            print(f"  - 资历分={stability_result['seniority_score']:.1f}, 波动分={stability_result['volatility_score']:.1f}")
-            print(f"  - 波动系数={stability_result['metrics']['volatility']:.2f}")
-        except Exception as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[api_students_list-员工%s]: 稳定性算法参数: birth_date=%s, work_start_date=%s, "
+                    "entry_date=%s, cert_date=%s, solo_date=%s, historical_scores: perf=%d条, safety=%d条, training=%d条",
+                    emp_no, birth_date, work_start_date, entry_date, cert_date, solo_date,
+                    len(historical_scores['performance']), len(historical_scores['safety']),
+                    len(historical_scores['training'])
+                )
+            # 稳定性分数在循环结束后对所有员工批量计算
+            pending_stability.append((
+                len(students),
+                (birth_date, work_start_date, entry_date, cert_date, solo_date),
+                historical_scores if (
+                    historical_scores['performance'] or historical_scores['safety'] or historical_scores['training']
+                ) else None
+            ))
+            stability_score = 0
+        except Exception:
             # 异常情况：使用简单计算作为降级方案
-            print(f"ERROR [api_students_list-员工{emp_no}]: 稳定性算法异常 - {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[api_students_list-员工%s]: 稳定性算法异常", emp_no)
             if entry_date:
                 try:
-                    entry = datetime.strptime(entry_date, '%Y-%m-%d')
+                    entry = _parse_ymd(entry_date)
                     years = (datetime.now() - entry).days / 365
                     stability_score = min(100, years * 33.3)
-                    print(f"DEBUG [api_students_list-员工{emp_no}]: 降级到简单算法，稳定性={stability_score:.1f}（入职{years:.1f}年）")
+                    logger.debug("[api_students_list-员工%s]: 降级到简单算法，稳定性=%.1f（入职%.1f年）",
+                                 emp_no, stability_score, years)
                 except:
                     stability_score = 50
-                    print(f"DEBUG [api_students_list-员工{emp_no}]: 降级失败，使用默认值50")
+                    logger.debug("[api_students_list-员工%s]: 降级失败，使用默认值50", emp_no)
             else:
                 stability_score = 50
-                print(f"DEBUG [api_students_list-员工{emp_no}]: 无入职日期，使用默认值50")
+                logger.debug("[api_students_list-员工%s]: 无入职日期，使用默认值50", emp_no)
 
-        # 综合评分（加权平均 - 使用配置权重）
-        comprehensive_score = round(
-            performance_score * score_weights['performance'] +
-            safety_score * score_weights['safety'] +
-            training_score * score_weights['training'] +
-            stability_score * score_weights['stability'] +
-            learning_score * score_weights['learning'],
-            1
-        )
-
-        # 判断是否为关键人员（基于筛选日期范围）（使用配置阈值）
-        # 复用已计算的违规数据和月数，避免重复查询
-        import math
+        # 月均违规次数（复用已计算的违规数据和月数，避免重复查询）
         violation_count = len(violations_list)
         avg_freq = math.ceil(violation_count / months_active) if months_active > 0 else 0
 
-        is_key_personnel = (comprehensive_score < key_personnel_config['comprehensive_threshold']) or (avg_freq >= key_personnel_config['monthly_violation_threshold'])
-
+        dimension_scores.append([performance_score, safety_score, training_score, stability_score, learning_score, avg_freq])
         students.append({
             'emp_no': emp_no,
             'name': emp_name,
             'department_name': dept_name,
-            'position': safe_get(row, 'position'),
-            'comprehensive_score': comprehensive_score,
-            'is_key_personnel': bool(is_key_personnel),  # 显式转换为JSON兼容的布尔值
+            'position': row.get('position'),
+            'comprehensive_score': None,
+            'is_key_personnel': False,
             'safety_status_color': safety_status_color,
             'safety_alert_tag': safety_alert_tag
         })
 
+    # 综合稳定性：所有员工的日期和历史分数一次性批量评分
+    if pending_stability:
+        stability_results = calculate_stability_scores_batch(
+            [dates for _, dates, _ in pending_stability],
+            [historical_scores for _, _, historical_scores in pending_stability],
+            algo_config
+        )
+        for (idx, _, _), stability_score, seniority_score, volatility_score, volatility in zip(
+            pending_stability,
+            stability_results['stability_score'].tolist(),
+            stability_results['seniority_score'].tolist(),
+            stability_results['volatility_score'].tolist(),
+            stability_results['volatility'].tolist()
+        ):
+            logger.debug("[api_students_list-员工%s]: 稳定性分数=%.1f（综合算法）, 资历分=%.1f, 波动分=%.1f, 波动系数=%.2f",
+                         students[idx]['emp_no'], stability_score, seniority_score, volatility_score, volatility)
+            dimension_scores[idx][3] = stability_score
+
+    # 长周期学习能力：所有员工的月度综合分拼成矩阵，一次性批量回归
+    if pending_learning:
+        width = max(len(score_list) for _, score_list in pending_learning)
+        score_matrix = [
+            score_list + [float('nan')] * (width - len(score_list))
+            for _, score_list in pending_learning
+        ]
+        learning_results = calculate_learning_ability_longterm_batch(score_matrix, algo_config)
+        for (idx, _), learning_result in zip(pending_learning, learning_results):
+            logger.debug("[api_students_list-员工%s]: 学习能力分数=%s", students[idx]['emp_no'], learning_result['learning_score'])
+            dimension_scores[idx][4] = learning_result['learning_score']
+
+    for student, (performance_score, safety_score, training_score, stability_score, learning_score, avg_freq) in zip(students, dimension_scores):
+        # 综合评分（加权平均 - 使用配置权重）
+        comprehensive_score = round(
+            performance_score * w_perf +
+            safety_score * w_safety +
+            training_score * w_train +
+            stability_score * w_stability +
+            learning_score * w_learning,
+            1
+        )
+
+        # 判断是否为关键人员（基于筛选日期范围）（使用配置阈值）
+        is_key_personnel = (comprehensive_score < comprehensive_threshold) or (avg_freq >= monthly_violation_threshold)
+
+        student['comprehensive_score'] = comprehensive_score
+        student['is_key_personnel'] = bool(is_key_personnel)  # 显式转换为JSON兼容的布尔值
+
     # 按综合分升序排序
     students.sort(key=lambda x: x['comprehensive_score'])
 
@@ -2701,13 +3439,13 @@ def api_students_list():
 @login_required
 def api_comprehensive_profile(emp_no):
     """API: 获取个人综合能力画像（人员+培训+安全+绩效）"""
-    from datetime import datetime, timedelta
-    from blueprints.safety import extract_score_from_assessment
-
     # 读取算法配置
-    from services.algorithm_config_service import AlgorithmConfigService
     algo_config = AlgorithmConfigService.get_active_config()
     score_weights = algo_config['comprehensive']['score_weights']
+    # 三维综合分权重在月份循环外取出一次
+    w_perf = score_weights.get('performance', 0.35)
+    w_safety = score_weights.get('safety', 0.30)
+    w_train = score_weights.get('training', 0.20)
 
     conn = get_db()
     cur = conn.cursor()
@@ -2742,17 +3480,14 @@ def api_comprehensive_profile(emp_no):
     start_date = request.args.get('start_date')  # 格式：YYYY-MM
     end_date = request.args.get('end_date')      # 格式：YYYY-MM
 
-    # DEBUG: 打印接收到的日期参数
-    print(f"DEBUG [comprehensive-profile]: 原始参数 - start_date='{start_date}', end_date='{end_date}'")
-    print(f"DEBUG [comprehensive-profile]: 参数类型 - start_date type={type(start_date)}, end_date type={type(end_date)}")
-    print(f"DEBUG [comprehensive-profile]: 参数布尔值 - bool(start_date)={bool(start_date)}, bool(end_date)={bool(end_date)}")
+    logger.debug("[comprehensive-profile]: 原始参数 - start_date=%r, end_date=%r", start_date, end_date)
 
     # 如果没有指定日期，默认使用当月
     if not start_date and not end_date:
         current_month = datetime.now().strftime('%Y-%m')
         start_date = current_month
         end_date = current_month
-        print(f"DEBUG [comprehensive-profile]: 无日期参数，使用默认当月: {current_month}")
+        logger.debug("[comprehensive-profile]: 无日期参数，使用默认当月: %s", current_month)
 
     # 2. 培训能力分析（使用高级评分算法 - 包含毒性惩罚和动态年化）
     training_query = """
@@ -2776,7 +3511,7 @@ def api_comprehensive_profile(emp_no):
 
     training_query += " ORDER BY training_date ASC"
     cur.execute(training_query, training_params)
-    training_records = cur.fetchall()
+    training_records = training_columns(cur.fetchall())
 
     # 计算统计周期天数
     if start_date and end_date and start_date == end_date:
@@ -2785,10 +3520,9 @@ def api_comprehensive_profile(emp_no):
     elif start_date and end_date:
         # 多月统计，计算实际天数
         try:
-            start_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date + '-01', '%Y-%m-%d')
+            start_dt = _month_start(start_date)
+            end_dt = _month_start(end_date)
             # 计算到月末
-            import calendar
             end_year, end_month = int(end_date.split('-')[0]), int(end_date.split('-')[1])
             last_day = calendar.monthrange(end_year, end_month)[1]
             end_dt = end_dt.replace(day=last_day)
@@ -2810,65 +3544,62 @@ def api_comprehensive_profile(emp_no):
     training_fail_count = training_result['stats']['fail_count']
 
     # 3. 安全能力分析（使用双轨评分模型，应用日期筛选）
-    safety_query = """
-        SELECT
-            inspection_date,
-            assessment,
-            inspected_person,
-            rectifier
-        FROM safety_inspection_records
-        WHERE (inspected_person = ? OR rectifier = ?)
-    """
-    safety_params = [emp_name, emp_name]
+    safety_filter = ""
+    safety_filter_params = []
 
     if start_date:
-        safety_query += " AND strftime('%Y-%m', inspection_date) >= ?"
-        safety_params.append(start_date)
+        safety_filter += " AND strftime('%Y-%m', inspection_date) >= ?"
+        safety_filter_params.append(start_date)
 
     if end_date:
-        safety_query += " AND strftime('%Y-%m', inspection_date) <= ?"
-        safety_params.append(end_date)
+        safety_filter += " AND strftime('%Y-%m', inspection_date) <= ?"
+        safety_filter_params.append(end_date)
 
-    safety_query += " ORDER BY inspection_date ASC"
-    cur.execute(safety_query, safety_params)
+    # 作为被检查人的记录：只取考核情况用于提取扣分
+    cur.execute(f"""
+        SELECT assessment
+        FROM safety_inspection_records
+        WHERE inspected_person = ?{safety_filter}
+        ORDER BY inspection_date ASC
+    """, [emp_name, *safety_filter_params])
+    inspected_assessments = [row[0] for row in cur]
+
+    # 作为整改人的记录只需计数，交给 SQLite 统计
+    cur.execute(f"""
+        SELECT COUNT(*)
+        FROM safety_inspection_records
+        WHERE rectifier = ?{safety_filter}
+    """, [emp_name, *safety_filter_params])
+    safety_as_rectifier = cur.fetchone()[0]
+    safety_as_inspector = len(inspected_assessments)
 
     violations_list = []
-    safety_as_inspector = 0
-    safety_as_rectifier = 0
-
-    for row in cur.fetchall():
-        date, assessment, inspected, rectifier = row
+    for assessment in inspected_assessments:
         score = extract_score_from_assessment(assessment)
-
-        if inspected == emp_name and score > 0:
+        if score > 0:
             violations_list.append(float(score))
 
-        if inspected == emp_name:
-            safety_as_inspector += 1
-        if rectifier == emp_name:
-            safety_as_rectifier += 1
-
     # 计算统计周期月数（使用筛选日期范围的月数）
     months_active = 1
     if start_date and end_date:
         # 如果指定了日期范围，计算该范围的月数
         try:
-            start_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date + '-01', '%Y-%m-%d')
+            start_dt = _month_start(start_date)
+            end_dt = _month_start(end_date)
             months_active = max(1, int((end_dt - start_dt).days / 30) + 1)
         except:
             months_active = 1
     elif start_date:
         # 只指定了开始日期，从开始日期到现在
         try:
-            start_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
+            start_dt = _month_start(start_date)
             months_active = max(1, int((datetime.now() - start_dt).days / 30) + 1)
         except:
             months_active = 1
     elif entry_date:
         # 没有日期筛选，使用入职以来的月数
         try:
-            entry = datetime.strptime(entry_date, '%Y-%m-%d')
+            entry = _parse_ymd(entry_date)
             months_active = max(1, int((datetime.now() - entry).days / 30))
         except:
             months_active = 1
@@ -2884,11 +3615,11 @@ def api_comprehensive_profile(emp_no):
     # 4. 绩效能力分析（使用双算法系统）
     # 判断是月度还是周期（使用前面已经设置的 start_date 和 end_date）
     is_monthly = (start_date == end_date) if start_date and end_date else True
-    print(f"DEBUG [comprehensive-profile]: is_monthly={is_monthly}, start_date={start_date}, end_date={end_date}")
+    logger.debug("[comprehensive-profile]: is_monthly=%s, start_date=%s, end_date=%s", is_monthly, start_date, end_date)
 
     # 构建绩效查询
     perf_query = """
-        SELECT score, grade, year, month
+        SELECT CAST(score AS REAL), grade, (year || '-' || printf('%02d', month)) AS ym
         FROM performance_records
         WHERE emp_no = ?
     """
@@ -2909,8 +3640,8 @@ def api_comprehensive_profile(emp_no):
     if perf_rows:
         if is_monthly and len(perf_rows) == 1:
             # 月度快照算法
-            score, grade, year, month = perf_rows[0]
-            raw_score = float(score) if score else 95
+            score, grade, _ym = perf_rows[0]
+            raw_score = score or 95
             grade = grade if grade else 'B+'
             perf_result = calculate_performance_score_monthly(grade, raw_score, algo_config)
             performance_score = perf_result['radar_value']
@@ -2921,7 +3652,7 @@ def api_comprehensive_profile(emp_no):
         else:
             # 周期加权算法（带时间衰减）
             grade_list = [row[1] if row[1] else 'B+' for row in perf_rows]
-            grade_dates = [f"{row[2]}-{row[3]:02d}" for row in perf_rows]  # 构建日期列表
+            grade_dates = [row[2] for row in perf_rows]  # SQL 中已拼好 YYYY-MM
             perf_result = calculate_performance_score_period(grade_list, grade_dates, algo_config)
             performance_score = perf_result['radar_value']
             performance_status_color = perf_result['status_color']
@@ -2938,53 +3669,63 @@ def api_comprehensive_profile(emp_no):
         performance_display_label = '暂无数据'
         performance_mode = 'MONTHLY'
 
+    # 长周期学习能力与稳定性共用的月份范围及逐月三维分，每月只查询、计算一次；
+    # 出错时两处各自走降级分支
+    monthly_scores = None
+    monthly_scores_error = None
+    try:
+        if start_date and end_date:
+            period_start = _month_start(start_date)
+            period_end = _month_start(end_date)
+        else:
+            # 如果没有筛选，使用过去12个月
+            period_end = datetime.now()
+            period_start = period_end - timedelta(days=365)
+        # 从起始月逐月到结束月
+        monthly_scores = _monthly_three_dim_scores(
+            cur, emp_no, emp_name, _month_strings(period_start, period_end), cert_years, algo_config
+        )
+    except Exception as e:
+        monthly_scores_error = e
+
     # 5. 学习能力评估（基于综合分的位置+动能算法）
     # 计算当前周期的综合三维分（绩效+安全+培训加权平均）
     current_comprehensive = (
-        performance_score * score_weights.get('performance', 0.35) +
-        safety_score * score_weights.get('safety', 0.30) +
-        training_score * score_weights.get('training', 0.20)
+        performance_score * w_perf +
+        safety_score * w_safety +
+        training_score * w_train
     )
 
     # 计算上一周期的综合三维分
     previous_comprehensive = 0
     learning_result = None
 
-    # DEBUG: 打印学习能力计算模式
-    print(f"DEBUG [学习能力]: is_monthly={is_monthly}, start_date='{start_date}', end_date='{end_date}'")
-    print(f"DEBUG [学习能力]: 条件判断 - (is_monthly and start_date) = {is_monthly and start_date}")
+    logger.debug("[comprehensive-profile-员工%s]: 学习能力使用%s模式", emp_no, '月度' if is_monthly and start_date else '长周期')
 
     if is_monthly and start_date:
         # 月度模式：计算上月同期数据
         try:
-            current_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
+            current_dt = _month_start(start_date)
             prev_dt = current_dt.replace(day=1) - timedelta(days=1)
             prev_date = prev_dt.strftime('%Y-%m')
 
             # 查询上月绩效
-            cur.execute("""
-                SELECT score, grade FROM performance_records
-                WHERE emp_no = ? AND (year || '-' || printf('%02d', month)) = ?
-            """, [emp_no, prev_date])
+            cur.execute(PROFILE_MONTH_PERFORMANCE_SQL, [emp_no, *_ym_parts(prev_date)])
             prev_perf_row = cur.fetchone()
             if prev_perf_row:
                 prev_perf_score = calculate_performance_score_monthly(
                     prev_perf_row[1] if prev_perf_row[1] else 'B+',
-                    float(prev_perf_row[0]) if prev_perf_row[0] else 95,
+                    prev_perf_row[0] or 95,
                     algo_config
                 )['radar_value']
             else:
                 prev_perf_score = 0
 
             # 查询上月安全 (FIXED)
-            cur.execute("""
-                SELECT assessment
-                FROM safety_inspection_records
-                WHERE inspected_person = ? AND strftime('%Y-%m', inspection_date) = ?
-            """, [emp_name, prev_date])
+            cur.execute(PROFILE_MONTH_SAFETY_SQL, [emp_name, prev_date])
 
             prev_violations = []
-            for row in cur.fetchall():
+            for row in cur:
                 score = extract_score_from_assessment(row[0])
                 if score > 0:
                     prev_violations.append(float(score))
@@ -2994,11 +3735,8 @@ def api_comprehensive_profile(emp_no):
             prev_safety_score = prev_safety_result['final_score']
 
             # 查询上月培训
-            cur.execute("""
-                SELECT score, is_qualified, is_disqualified, training_date FROM training_records
-                WHERE emp_no = ? AND strftime('%Y-%m', training_date) = ?
-            """, [emp_no, prev_date])
-            prev_training_rows = cur.fetchall()
+            cur.execute(PROFILE_MONTH_TRAINING_SQL, [emp_no, prev_date])
+            prev_training_rows = training_columns(cur.fetchall())
             # 月度模式，周期30天
             prev_training_result = calculate_training_score_with_penalty(prev_training_rows, duration_days=30, cert_years=cert_years, config=algo_config)
             prev_training_score = prev_training_result['radar_score']  # 修复：使用正确的键名
@@ -3006,9 +3744,9 @@ def api_comprehensive_profile(emp_no):
 
             # 计算上月综合分
             previous_comprehensive = (
-                prev_perf_score * score_weights.get('performance', 0.35) +
-                prev_safety_score * score_weights.get('safety', 0.30) +
-                prev_training_score * score_weights.get('training', 0.20)
+                prev_perf_score * w_perf +
+                prev_safety_score * w_safety +
+                prev_training_score * w_train
             )
 
             # 使用月度算法
@@ -3019,123 +3757,37 @@ def api_comprehensive_profile(emp_no):
     else:
         # 长周期模式：查询过去12个月的综合分列表
         try:
-            # 获取起止月份
-            if start_date and end_date:
-                start_dt = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-                end_dt = datetime.strptime(end_date + '-01', '%Y-%m-%d')
-            else:
-                end_dt = datetime.now()
-                start_dt = end_dt - timedelta(days=365)
-
-            # 构建月份列表
-            month_list = []
-            current_month = start_dt
-            while current_month <= end_dt:
-                month_list.append(current_month.strftime('%Y-%m'))
-                current_month = current_month + timedelta(days=32)
-                current_month = current_month.replace(day=1)
-
-            print(f"DEBUG: 构建了 {len(month_list)} 个月份: {month_list}")
-
-            # 查询每个月的三维分数并计算综合分
-            score_list = []
-            for month_str in month_list:
-                print(f"DEBUG: 处理月份 {month_str}")
-                # 绩效
-                cur.execute("""
-                    SELECT score, grade FROM performance_records
-                    WHERE emp_no = ? AND (year || '-' || printf('%02d', month)) = ?
-                """, [emp_no, month_str])
-                month_perf_row = cur.fetchone()
-                if month_perf_row:
-                    month_perf_score = calculate_performance_score_monthly(
-                        month_perf_row[1] if month_perf_row[1] else 'B+',
-                        float(month_perf_row[0]) if month_perf_row[0] else 95,
-                        algo_config
-                    )['radar_value']
-                    print(f"  - 绩效: {month_perf_score} (grade={month_perf_row[1]}, score={month_perf_row[0]})")
-                else:
-                    month_perf_score = 0
-                    print(f"  - 绩效: 无数据")
-
-                # 安全
-                cur.execute("""
-                    SELECT assessment, inspection_date
-                    FROM safety_inspection_records
-                    WHERE inspected_person = ? AND strftime('%Y-%m', inspection_date) = ?
-                    ORDER BY inspection_date
-                """, [emp_name, month_str])
-                month_safety_rows = cur.fetchall()
-                if month_safety_rows:
-                    # 提取扣分数值
-                    violations = []
-                    for row in month_safety_rows:
-                        score = extract_score_from_assessment(row[0])
-                        if score > 0:
-                            violations.append(float(score))
+            if monthly_scores_error is not None:
+                raise monthly_scores_error
 
-                    if violations:
-                        month_safety_result = calculate_safety_score_dual_track(
-                            violations,
-                            1,
-                            algo_config
-                        )
-                        month_safety_score = month_safety_result['final_score']
-                        print(f"  - 安全: {month_safety_score} ({len(violations)}条违规)")
-                    else:
-                        month_safety_score = 0
-                        print(f"  - 安全: 0 (有记录但无扣分)")
-                else:
-                    month_safety_score = 0
-                    print(f"  - 安全: 无数据")
-
-                # 培训
-                cur.execute("""
-                    SELECT score, is_qualified, is_disqualified, training_date FROM training_records
-                    WHERE emp_no = ? AND strftime('%Y-%m', training_date) = ?
-                """, [emp_no, month_str])
-                month_training_rows = cur.fetchall()
-                if month_training_rows:
-                    month_training_result = calculate_training_score_with_penalty(
-                        month_training_rows,
-                        30,  # 单月30天
-                        cert_years,
-                        algo_config
-                    )
-                    month_training_score = month_training_result['radar_score']  # 修复：使用正确的键名
-                    print(f"  - 培训: {month_training_score} ({len(month_training_rows)}条记录)")
-                else:
-                    month_training_score = 0
-                    print(f"  - 培训: 无数据")
-
-                # 计算该月综合分（使用配置权重）
-                month_comprehensive = (
-                    month_perf_score * score_weights.get('performance', 0.35) +
-                    month_safety_score * score_weights.get('safety', 0.30) +
-                    month_training_score * score_weights.get('training', 0.20)
-                )
-                print(f"  → 综合分: {month_comprehensive:.2f}")
-                score_list.append(month_comprehensive)
+            # 逐月三维分数矩阵（每行为 绩效/安全/培训，该维度无数据或无扣分的月份计0分），
+            # 整列按配置权重加权得到各月综合分
+            month_scores = np.nan_to_num(
+                np.array(list(monthly_scores.values()), dtype=float).reshape(-1, 3), nan=0.0
+            )
+            score_list = (
+                month_scores[:, 0] * w_perf +
+                month_scores[:, 1] * w_safety +
+                month_scores[:, 2] * w_train
+            ).tolist()
+            logger.debug("[comprehensive-profile-员工%s]: 月份=%s, 各月综合分=%s", emp_no, list(monthly_scores), score_list)
 
             # 使用长周期算法
-            print(f"DEBUG: score_list 长度 = {len(score_list)}, 内容前3项 = {score_list[:3]}")
             if len(score_list) >= 2:
-                print(f"DEBUG: 使用长周期算法，score_list 完整内容 = {score_list}")
+                logger.debug("[comprehensive-profile-员工%s]: 使用长周期算法，score_list=%s", emp_no, score_list)
                 learning_result = calculate_learning_ability_longterm(
                     score_list,
                     algo_config,
                     current_three_dim_score=current_comprehensive  # 传入当前三维综合分
                 )
-                print(f"DEBUG: 长周期算法返回 = {learning_result}")
+                logger.debug("[comprehensive-profile-员工%s]: 长周期算法返回 %s", emp_no, learning_result)
             else:
                 # 数据不足，使用月度算法
-                print(f"DEBUG: 数据不足 (len={len(score_list)})，使用月度算法")
+                logger.debug("[comprehensive-profile-员工%s]: 数据不足(len=%d)，使用月度算法", emp_no, len(score_list))
                 learning_result = calculate_learning_ability_monthly(current_comprehensive, current_comprehensive)
-        except Exception as e:
+        except Exception:
             # 异常情况：使用当前分
-            print(f"ERROR: 学习能力计算异常 - {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[comprehensive-profile-员工%s]: 学习能力计算异常", emp_no)
             learning_result = calculate_learning_ability_monthly(current_comprehensive, current_comprehensive)
 
     # 提取学习能力分值和详情
@@ -3155,116 +3807,54 @@ def api_comprehensive_profile(emp_no):
         learning_slope = 0
 
     # 6. 稳定性评估（综合算法：资历60% + 表现稳定性40%）
-    # 查询用户筛选日期范围内的历史分数用于波动度计算
+    # 使用用户筛选日期范围内的历史分数计算波动度
     try:
-        from datetime import datetime, timedelta
-        import calendar
+        if monthly_scores_error is not None:
+            raise monthly_scores_error
 
-        # 构建用户筛选日期范围的月份列表（与左侧API一致）
-        if start_date and end_date:
-            start_dt_stability = datetime.strptime(start_date + '-01', '%Y-%m-%d')
-            end_dt_stability = datetime.strptime(end_date + '-01', '%Y-%m-%d')
-        else:
-            # 如果没有筛选，使用过去12个月
-            end_dt_stability = datetime.now()
-            start_dt_stability = end_dt_stability - timedelta(days=365)
-
-        month_list = []
-        current_month = start_dt_stability.replace(day=1)
-        while current_month <= end_dt_stability:
-            month_list.append(current_month.strftime('%Y-%m'))
-            # 移动到下个月
-            if current_month.month == 12:
-                current_month = current_month.replace(year=current_month.year + 1, month=1)
-            else:
-                current_month = current_month.replace(month=current_month.month + 1)
-
-        # 查询每个月的三维分数
+        # 逐月汇总三维分数（只统计有记录的月份，安全只统计有扣分的月份）
         historical_scores = {
             'performance': [],
             'safety': [],
             'training': []
         }
-
-        for month_str in month_list:
-            # 查询该月绩效分
-            cur.execute("""
-                SELECT score, grade FROM performance_records
-                WHERE emp_no = ? AND (year || '-' || printf('%02d', month)) = ?
-            """, [emp_no, month_str])
-            month_perf_row = cur.fetchone()
-            if month_perf_row:
-                month_perf_score = calculate_performance_score_monthly(
-                    month_perf_row[1] if month_perf_row[1] else 'B+',
-                    float(month_perf_row[0]) if month_perf_row[0] else 95,
-                    algo_config
-                )['radar_value']
+        for month_perf_score, month_safety_score, month_training_score in monthly_scores.values():
+            if month_perf_score is not None:
                 historical_scores['performance'].append(month_perf_score)
-
-            # 查询该月安全分
-            cur.execute("""
-                SELECT assessment, inspection_date
-                FROM safety_inspection_records
-                WHERE inspected_person = ? AND strftime('%Y-%m', inspection_date) = ?
-                ORDER BY inspection_date
-            """, [emp_name, month_str])
-            month_safety_rows = cur.fetchall()
-            if month_safety_rows:
-                # 提取扣分值
-                violations = []
-                for row in month_safety_rows:
-                    score = extract_score_from_assessment(row[0])
-                    if score > 0:
-                        violations.append(float(score))
-
-                if violations:
-                    month_safety_result = calculate_safety_score_dual_track(
-                        violations,
-                        1,  # 单月
-                        algo_config
-                    )
-                    historical_scores['safety'].append(month_safety_result['final_score'])
-
-            # 查询该月培训分
-            cur.execute("""
-                SELECT score, is_qualified, is_disqualified, training_date FROM training_records
-                WHERE emp_no = ? AND strftime('%Y-%m', training_date) = ?
-            """, [emp_no, month_str])
-            month_training_rows = cur.fetchall()
-            if month_training_rows:
-                month_training_result = calculate_training_score_with_penalty(
-                    month_training_rows,
-                    30,  # 单月30天
-                    cert_years,
-                    algo_config
-                )
-                historical_scores['training'].append(month_training_result['radar_score'])
+            if month_safety_score is not None:
+                historical_scores['safety'].append(month_safety_score)
+            if month_training_score is not None:
+                historical_scores['training'].append(month_training_score)
 
         # 调用综合稳定性算法
-        print(f"DEBUG [comprehensive-profile-员工{emp_no}]: 稳定性算法参数:")
-        print(f"  - birth_date={birth_date}, work_start_date={work_start_date}")
-        print(f"  - entry_date={entry_date}, cert_date={cert_date}, solo_date={solo_date}")
-        print(f"  - historical_scores: perf={len(historical_scores['performance'])}条, safety={len(historical_scores['safety'])}条, training={len(historical_scores['training'])}条")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[comprehensive-profile-员工%s]: 稳定性算法参数: birth_date=%s, work_start_date=%s, "
+                "entry_date=%s, cert_date=%s, solo_date=%s, historical_scores: perf=%d条, safety=%d条, training=%d条",
+                emp_no, birth_date, work_start_date, entry_date, cert_date, solo_date,
+                len(historical_scores['performance']), len(historical_scores['safety']),
+                len(historical_scores['training'])
+            )
         stability_result = calculate_stability_score(
             birth_date=birth_date,
             work_start_date=work_start_date,
             entry_date=entry_date,
             certification_date=cert_date,
             solo_driving_date=solo_date,
-            historical_scores=historical_scores if any(historical_scores.values()) else None,
+            historical_scores=historical_scores if (
+                historical_scores['performance'] or historical_scores['safety'] or historical_scores['training']
+            ) else None,
             config=algo_config
         )
         stability_score = stability_result['stability_score']
-        print(f"DEBUG [comprehensive-profile-员工{emp_no}]: 稳定性分数={stability_score:.1f}（综合算法）")
+        logger.debug("[comprehensive-profile-员工%s]: 稳定性分数=%.1f（综合算法）", emp_no, stability_score)
 
-    except Exception as e:
+    except Exception:
         # 异常情况：使用简单计算作为降级方案
-        print(f"稳定性算法异常: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[comprehensive-profile-员工%s]: 稳定性算法异常", emp_no)
         if entry_date:
             try:
-                entry = datetime.strptime(entry_date, '%Y-%m-%d')
+                entry = _parse_ymd(entry_date)
                 years = (datetime.now() - entry).days / 365
                 stability_score = min(100, years * 33.3)
             except:
@@ -3291,11 +3881,12 @@ def api_comprehensive_profile(emp_no):
             'entry_date': entry_date
         },
         'scores': {
-            'comprehensive': round(comprehensive_score, 1),
+            # 综合、安全、绩效、学习能力分在计算时已保留1位小数；培训、稳定性分有未取整的降级/默认值，仍需取整
+            'comprehensive': comprehensive_score,
             'training': round(training_score, 1),
-            'safety': round(safety_score, 1),
-            'performance': round(performance_score, 1),
-            'learning': round(learning_score, 1),
+            'safety': safety_score,
+            'performance': performance_score,
+            'learning': learning_score,
             'stability': round(stability_score, 1)
         },
         'personnel_details': {
@@ -3341,12 +3932,12 @@ def api_comprehensive_profile(emp_no):
             'mode': performance_mode
         },
         'learning_details': {
-            'learning_score': round(learning_score, 1),
+            'learning_score': learning_score,
             'status_color': learning_status_color,
             'alert_tag': learning_alert_tag,
             'tier': learning_tier,
-            'delta': round(learning_delta, 1) if learning_delta else 0,
-            'slope': round(learning_slope, 3) if learning_slope else 0,
+            'delta': learning_delta or 0,
+            'slope': learning_slope or 0,
             'current_comprehensive': round(current_comprehensive, 1),
             'previous_comprehensive': round(previous_comprehensive, 1) if previous_comprehensive else 0
         }
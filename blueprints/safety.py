@@ -8,6 +8,7 @@
 import os
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, jsonify, session
 from openpyxl import Workbook, load_workbook
@@ -1043,29 +1044,32 @@ def batch_delete_records():
 
 # ==================== 安全数据分析 API ====================
 
-import re
+# 正面评价关键词（不计扣分）
+POSITIVE_ASSESSMENT_KEYWORDS = ('继续发扬', '正常', '良好', '优秀', '表扬')
+# 直接扣钱的关键词（扣100元等，不计为违规扣分）
+MONEY_ASSESSMENT_KEYWORDS = ('元', '钱', '¥', '￥', 'RMB', 'rmb')
+# 考核情况中的数字（支持小数）
+ASSESSMENT_NUMBER_RE = re.compile(r'\d+\.?\d*')
+
 
+@lru_cache(maxsize=4096)
 def extract_score_from_assessment(assessment):
-    """从考核情况中提取分值"""
+    """从考核情况中提取分值（纯函数，考核文本高度重复，按原文缓存结果）"""
     if not assessment:
         return 0
 
     # 过滤正面评价
-    positive_keywords = ['继续发扬', '正常', '良好', '优秀', '表扬']
-    for keyword in positive_keywords:
-        if keyword in assessment:
-            return 0
+    if any(keyword in assessment for keyword in POSITIVE_ASSESSMENT_KEYWORDS):
+        return 0
 
     # 过滤直接扣钱的情况（扣100元等）- 这些不应该被统计为违规扣分
-    money_keywords = ['元', '钱', '¥', '￥', 'RMB', 'rmb']
-    for keyword in money_keywords:
-        if keyword in assessment:
-            return 0
+    if any(keyword in assessment for keyword in MONEY_ASSESSMENT_KEYWORDS):
+        return 0
 
-    # 提取数字（支持小数）
-    numbers = re.findall(r'\d+\.?\d*', assessment)
+    # 提取数字，取最后一个
+    numbers = ASSESSMENT_NUMBER_RE.findall(assessment)
     if numbers:
-        return float(numbers[-1])  # 取最后一个数字
+        return float(numbers[-1])
 
     # 如果没有数字但不是正面评价，默认赋值1
     return 1
@@ -54,7 +54,8 @@ class DatabaseConfig:
     # Performance settings
     JOURNAL_MODE = "WAL"  # Write-Ahead Logging for better performance
     SYNCHRONOUS = "NORMAL"  # Balance between performance and safety
-    CACHE_SIZE = 2000  # Cache size in pages
+    CACHE_SIZE = -65536  # Page cache size; negative values are in KiB (64 MiB)
+    TEMP_STORE = "MEMORY"  # Keep temp tables and sort b-trees in memory
 
     # Connection settings
     TIMEOUT = 20.0  # Database lock timeout in seconds
@@ -29,6 +29,7 @@ def get_db():
         _local.connection.execute(f"PRAGMA journal_mode = {DatabaseConfig.JOURNAL_MODE}")
         _local.connection.execute(f"PRAGMA synchronous = {DatabaseConfig.SYNCHRONOUS}")
         _local.connection.execute(f"PRAGMA cache_size = {DatabaseConfig.CACHE_SIZE}")
+        _local.connection.execute(f"PRAGMA temp_store = {DatabaseConfig.TEMP_STORE}")
 
     return _local.connection
 
@@ -226,14 +227,17 @@ def init_database():
         "CREATE INDEX IF NOT EXISTS idx_employees_emp_no ON employees(emp_no)",
         "CREATE INDEX IF NOT EXISTS idx_performances_user_id_year_month ON performances(user_id, year, month)",
         "CREATE INDEX IF NOT EXISTS idx_performances_emp_no ON performances(emp_no)",
+        "CREATE INDEX IF NOT EXISTS idx_performance_year_month ON performance_records(year, month, emp_no)",
         "CREATE INDEX IF NOT EXISTS idx_training_records_user_id ON training_records(user_id)",
         "CREATE INDEX IF NOT EXISTS idx_training_records_emp_no ON training_records(emp_no)",
         "CREATE INDEX IF NOT EXISTS idx_training_records_date ON training_records(training_date)",
         "CREATE INDEX IF NOT EXISTS idx_training_records_disqualified ON training_records(is_disqualified)",
+        "CREATE INDEX IF NOT EXISTS idx_training_records_emp_month ON training_records(emp_no, strftime('%Y-%m', training_date))",
         "CREATE INDEX IF NOT EXISTS idx_safety_inspection_created_by ON safety_inspection_records(created_by)",
         "CREATE INDEX IF NOT EXISTS idx_safety_inspection_date ON safety_inspection_records(inspection_date)",
         "CREATE INDEX IF NOT EXISTS idx_safety_inspection_category ON safety_inspection_records(category)",
-        "CREATE INDEX IF NOT EXISTS idx_safety_inspection_team ON safety_inspection_records(responsible_team)"
+        "CREATE INDEX IF NOT EXISTS idx_safety_inspection_team ON safety_inspection_records(responsible_team)",
+        "CREATE INDEX IF NOT EXISTS idx_safety_inspection_person_month ON safety_inspection_records(inspected_person, strftime('%Y-%m', inspection_date))"
     ]
 
     for index_sql in indexes:
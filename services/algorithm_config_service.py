@@ -5,54 +5,75 @@
 提供算法配置的读取、更新、校验等功能
 """
 import json
-import time
-from typing import Dict, Tuple, Optional, List
+from functools import lru_cache
+from typing import Dict, Tuple, List
 from datetime import datetime
+from flask import g, has_request_context
 from models.database import get_db
 
 
+@lru_cache(maxsize=1)
+def _load_active_config(version: tuple) -> dict:
+    """
+    按版本读取并解析当前生效配置
+
+    version 不变时直接返回上次解析的结果，避免重复读取和解析配置 JSON
+
+    Args:
+        version: 配置版本标识 (updated_at, 最新变更日志ID)
+    """
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT config_data FROM algorithm_active_config WHERE id = 1
+    """)
+    row = cur.fetchone()
+
+    if not row:
+        raise ValueError("系统配置未初始化，请联系管理员")
+
+    return json.loads(row['config_data'])
+
+
 class AlgorithmConfigService:
     """算法配置服务 - 立即生效模式"""
 
-    # 配置缓存
-    _cache: Optional[dict] = None
-    _cache_time: float = 0
-    _cache_ttl: int = 300  # 5分钟缓存
-
     @classmethod
     def get_active_config(cls) -> dict:
         """
         获取当前生效配置（带缓存）
 
+        每次只查询配置版本（更新时间 + 最新变更日志ID），版本未变时复用已解析的配置；
+        其他进程修改配置后版本随之变化，因此无需等待缓存过期即可生效。
+        请求上下文中首次读取后保存在 flask.g 上，同一请求内的后续调用不再查询数据库
+
         Returns:
             dict: 当前生效的算法配置
 
         Raises:
             ValueError: 配置不存在或无效
         """
-        # 检查缓存
-        current_time = time.time()
-        if cls._cache is not None and (current_time - cls._cache_time) < cls._cache_ttl:
-            return cls._cache
+        in_request = has_request_context()
+        if in_request:
+            config = g.get('_algorithm_config')
+            if config is not None:
+                return config
 
-        # 从数据库读取
         conn = get_db()
         cur = conn.cursor()
         cur.execute("""
-            SELECT config_data FROM algorithm_active_config WHERE id = 1
+            SELECT updated_at, (SELECT MAX(id) FROM algorithm_config_logs) AS log_id
+            FROM algorithm_active_config WHERE id = 1
         """)
         row = cur.fetchone()
 
         if not row:
             raise ValueError("系统配置未初始化，请联系管理员")
 
-        config_data = json.loads(row['config_data'])
-
-        # 更新缓存
-        cls._cache = config_data
-        cls._cache_time = current_time
-
-        return config_data
+        config = _load_active_config((row['updated_at'], row['log_id']))
+        if in_request:
+            g._algorithm_config = config
+        return config
 
     @classmethod
     def apply_preset(cls, preset_key: str, user_id: int, reason: str, username: str = None, ip_address: str = None) -> Tuple[bool, str]:
@@ -460,5 +481,6 @@ class AlgorithmConfigService:
     @classmethod
     def clear_cache(cls):
         """清除配置缓存"""
-        cls._cache = None
-        cls._cache_time = 0
+        _load_active_config.cache_clear()
+        if has_request_context():
+            g.pop('_algorithm_config', None)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON provider
+Serializes API responses with orjson when it is installed, keeping Flask's
+default provider (stdlib json) as the fallback
+"""
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    # Sorted keys match the default provider's output; dates and dataclasses
+    # are handed to Flask's default hook so they keep their usual format
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider that encodes and decodes with orjson
+
+    Calls with extra json.dumps/json.loads keyword arguments, and values
+    orjson cannot encode (e.g. integers beyond 64 bits), go through the
+    stdlib implementation unchanged.
+    """
+
+    def _orjson_dumps(self, obj, option=0):
+        return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS | option)
+
+    def dumps(self, obj, **kwargs):
+        if not kwargs:
+            try:
+                return self._orjson_dumps(obj).decode("utf-8")
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Same argument handling as DefaultJSONProvider.response: one value,
+        # several positional values as a list, or keyword arguments as a dict
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        pretty = (self.compact is None and current_app.debug) or self.compact is False
+        try:
+            body = self._orjson_dumps(obj, orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            return super().response(obj)
+        return current_app.response_class(body + b"\n", mimetype=self.mimetype)
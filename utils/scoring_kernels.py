@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scoring kernels
+Tight numeric loops used by the personnel scoring algorithms, JIT-compiled
+with numba when it is installed and falling back to plain Python otherwise
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# ========== Training Aggregation ==========
+
+@dataclass(frozen=True)
+class TrainingColumns:
+    """
+    Training records as parallel columns (struct of arrays)
+
+    NULL scores and flags are stored as NaN so they never compare equal to
+    0 or 1, matching the row-wise checks on ``None``.
+    """
+    scores: np.ndarray
+    qualified: np.ndarray
+    disqualified: np.ndarray
+    dates: list
+
+    def __len__(self):
+        return len(self.dates)
+
+
+def training_columns(rows):
+    """
+    Split (score, is_qualified, is_disqualified, training_date) rows into columns
+
+    Args:
+        rows: Sequence of training record rows, e.g. ``cursor.fetchall()``
+
+    Returns:
+        TrainingColumns
+    """
+    if not rows:
+        empty = np.empty(0)
+        return TrainingColumns(empty, empty, empty, [])
+    scores, qualified, disqualified, dates = zip(*rows)
+    return TrainingColumns(
+        np.array(scores, dtype=float),
+        np.array(qualified, dtype=float),
+        np.array(disqualified, dtype=float),
+        list(dates),
+    )
+
+
+def _aggregate_training_py(training_records):
+    """Pure-Python aggregation over (score, is_qualified, is_disqualified, date) rows"""
+    fail_count = 0
+    total_score = 0
+    for score, is_qualified, is_disqualified, _training_date in training_records:
+        # Disqualified when is_disqualified=1 OR score=0 OR is_qualified=0
+        if is_disqualified == 1 or score == 0 or is_qualified == 0:
+            fail_count += 1
+        total_score += (score if score else 0)
+    return fail_count, total_score
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _aggregate_training_jit(scores, qualified, disqualified):
+        # NULL columns arrive as NaN, which never compares equal to 0 or 1
+        fail_count = 0
+        total_score = 0.0
+        for i in range(scores.shape[0]):
+            score = scores[i]
+            if disqualified[i] == 1.0 or score == 0.0 or qualified[i] == 0.0:
+                fail_count += 1
+            if score == score:
+                total_score += score
+        return fail_count, total_score
+
+    # Compile (or load from the on-disk cache) at import rather than on first request
+    _aggregate_training_jit(np.zeros(1), np.zeros(1), np.zeros(1))
+
+
+def aggregate_training(training_records):
+    """
+    Count failed operations and sum scores over training records
+
+    Args:
+        training_records: TrainingColumns, or a sequence of
+            (score, is_qualified, is_disqualified, training_date) rows
+
+    Returns:
+        (fail_count, total_score)
+    """
+    if not isinstance(training_records, TrainingColumns):
+        if not NUMBA_AVAILABLE:
+            return _aggregate_training_py(training_records)
+        training_records = training_columns(training_records)
+
+    scores = training_records.scores
+    if NUMBA_AVAILABLE:
+        fail_count, total_score = _aggregate_training_jit(
+            scores, training_records.qualified, training_records.disqualified
+        )
+        return int(fail_count), float(total_score)
+
+    failed = (training_records.disqualified == 1) | (scores == 0) | (training_records.qualified == 0)
+    # Accumulate in row order so the total matches the row-wise running sum exactly
+    total_score = float(np.cumsum(np.nan_to_num(scores))[-1]) if scores.size else 0
+    return int(np.count_nonzero(failed)), total_score
+
+
+# ========== Stability Volatility ==========
+
+def welford_std(values):
+    """Population standard deviation in a single Welford pass (0.0 for no values)"""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    return math.sqrt(m2 / n) if n else 0.0
+
+
+def _volatility_batch_py(track_lists):
+    """Pure-Python volatility over ragged per-employee score tracks"""
+    n = len(track_lists)
+    volatility = np.zeros(n)
+    has_volatility = np.zeros(n, dtype=bool)
+    for i, tracks in enumerate(track_lists):
+        std_devs = [welford_std(scores) for scores in tracks if len(scores) >= 2]
+        if std_devs:
+            volatility[i] = sum(std_devs) / len(std_devs)
+            has_volatility[i] = True
+    return volatility, has_volatility
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _volatility_batch_jit(scores, lengths):
+        # Same operation order as welford_std, so results are bit-identical;
+        # employees are independent, so the outer loop is spread across cores
+        n = scores.shape[0]
+        volatility = np.zeros(n)
+        has_volatility = np.zeros(n, dtype=np.bool_)
+        for i in prange(n):
+            total = 0.0
+            tracks = 0
+            for j in range(scores.shape[1]):
+                length = lengths[i, j]
+                if length < 2:
+                    continue
+                mean = 0.0
+                m2 = 0.0
+                for k in range(length):
+                    x = scores[i, j, k]
+                    delta = x - mean
+                    mean += delta / (k + 1)
+                    m2 += delta * (x - mean)
+                total += math.sqrt(m2 / length)
+                tracks += 1
+            if tracks:
+                volatility[i] = total / tracks
+                has_volatility[i] = True
+        return volatility, has_volatility
+
+    _volatility_batch_jit(np.zeros((1, 1, 2)), np.zeros((1, 1), dtype=np.int64))
+
+
+def volatility_batch(track_lists):
+    """
+    Mean per-track population standard deviation for many employees
+
+    Only tracks with at least two scores contribute; employees without any
+    such track get a volatility of 0 and ``has_volatility`` False.
+
+    Args:
+        track_lists: One sequence of score lists (e.g. performance, safety,
+            training) per employee
+
+    Returns:
+        (volatility, has_volatility) arrays of length N
+    """
+    if not NUMBA_AVAILABLE or not track_lists:
+        return _volatility_batch_py(track_lists)
+
+    n = len(track_lists)
+    width = max((len(tracks) for tracks in track_lists), default=0)
+    lengths = np.zeros((n, max(width, 1)), dtype=np.int64)
+    for i, tracks in enumerate(track_lists):
+        for j, scores in enumerate(tracks):
+            lengths[i, j] = len(scores)
+    scores = np.zeros((n, lengths.shape[1], max(int(lengths.max()), 1)))
+    for i, tracks in enumerate(track_lists):
+        for j, values in enumerate(tracks):
+            scores[i, j, :len(values)] = values
+    return _volatility_batch_jit(scores, lengths)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Minimal streaming XLSX writer
+Emits style-free tabular worksheets directly as XML, bypassing openpyxl
+"""
+import math
+import numbers
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+
+# ========== Workbook Skeleton ==========
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{title}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+# XML 1.0 forbids most control characters even when escaped
+_ILLEGAL_XML_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_INVALID_TITLE_CHARS_RE = re.compile(r"[\\/*?:\[\]]")
+
+
+def _column_letters(count):
+    """Return Excel column letters for the first ``count`` columns"""
+    letters = []
+    for idx in range(1, count + 1):
+        name = ""
+        while idx:
+            idx, rem = divmod(idx - 1, 26)
+            name = chr(65 + rem) + name
+        letters.append(name)
+    return letters
+
+
+def _render_row(row_no, values, letters):
+    """Render one <row> element; None, empty strings and NaN/inf produce no cell"""
+    parts = [f'<row r="{row_no}">']
+    append = parts.append
+    for col, value in enumerate(values):
+        if value is None or value == "":
+            continue
+        ref = f"{letters[col]}{row_no}"
+        if isinstance(value, bool):
+            append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, numbers.Integral):
+            append(f'<c r="{ref}"><v>{int(value)}</v></c>')
+        elif isinstance(value, numbers.Real):
+            # Normalise numpy scalars to plain floats; XML has no NaN/inf literal
+            value = float(value)
+            if math.isfinite(value):
+                append(f'<c r="{ref}"><v>{value!r}</v></c>')
+        else:
+            text = escape(_ILLEGAL_XML_CHARS_RE.sub("", str(value)))
+            append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    append('</row>')
+    return "".join(parts)
+
+
+def write_simple_xlsx(target, title, headers, rows):
+    """
+    Write a single-sheet, style-free workbook
+
+    Strings are emitted as inline strings so no shared-strings table is
+    needed; numbers use the default cell type.
+
+    Args:
+        target: File path or writable binary file object
+        title: Worksheet title (truncated to Excel's 31 character limit)
+        headers: Header row values
+        rows: Iterable of row value sequences
+    """
+    title = _INVALID_TITLE_CHARS_RE.sub("_", title)[:31] or "Sheet1"
+    letters = _column_letters(len(headers))
+
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+        zf.writestr("_rels/.rels", _ROOT_RELS_XML)
+        zf.writestr("xl/workbook.xml", _WORKBOOK_XML.format(title=escape(title, {'"': "&quot;"})))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+        zf.writestr("xl/styles.xml", _STYLES_XML)
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_HEAD.encode("utf-8"))
+            sheet.write(_render_row(1, headers, letters).encode("utf-8"))
+            for row_no, values in enumerate(rows, start=2):
+                if len(values) > len(letters):
+                    letters = _column_letters(len(values))
+                sheet.write(_render_row(row_no, values, letters).encode("utf-8"))
+            sheet.write(_SHEET_TAIL.encode("utf-8"))